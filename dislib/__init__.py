@@ -1,7 +1,12 @@
 import os
 
 from dislib.data.array import random_array, apply_along_axis, array, \
-    load_svmlight_file, load_txt_file, load_from_hecuba
+    load_svmlight_file, load_txt_file, load_from_hecuba, matmul, \
+    load_npy_file, load, zeros, ones, full, eye, identity, random_normal, \
+    random_sparse, concatenate, vstack, hstack, sort, argsort, quantile, \
+    unique, bincount, histogram, describe, load_from_storage, \
+    StorageBackend, HecubaStorage, FileSystemStorage
+from dislib.runtime import profile
 
 name = "dislib"
 version_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
@@ -25,4 +30,9 @@ else:
         __version__ = 'unknown'
 
 __all__ = ['load_txt_file', 'load_svmlight_file', 'random_array',
-           'apply_along_axis', 'array', 'load_from_hecuba']
+           'apply_along_axis', 'array', 'load_from_hecuba', 'matmul',
+           'load_npy_file', 'load', 'zeros', 'ones', 'full', 'eye', 'identity',
+           'random_normal', 'random_sparse', 'concatenate', 'vstack',
+           'hstack', 'sort', 'argsort', 'quantile', 'unique', 'bincount',
+           'histogram', 'describe', 'load_from_storage', 'StorageBackend',
+           'HecubaStorage', 'FileSystemStorage', 'profile']
@@ -0,0 +1,6 @@
+from dislib.benchmarks.base import run_benchmarks, compare, list_benchmarks, \
+    save_results, load_results
+from dislib.benchmarks.datasets import make_dataset, SCALES
+
+__all__ = ['run_benchmarks', 'compare', 'list_benchmarks', 'save_results',
+           'load_results', 'make_dataset', 'SCALES']
@@ -0,0 +1,93 @@
+import argparse
+import sys
+
+from dislib.benchmarks.base import run_benchmarks, compare, list_benchmarks, \
+    save_results, load_results, _matches
+from dislib.runtime import set_executor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m dislib.benchmarks",
+        description="Times dislib estimators and ds-array operations on "
+                    "synthetic datasets, and compares them with a baseline.")
+    parser.add_argument("names", nargs="*",
+                        help="benchmarks to run (or prefixes, e.g., kmeans). "
+                             "All if not given.")
+    parser.add_argument("-s", "--scale", default="small",
+                        help="number of samples, or tiny, small, medium or "
+                             "large (default: small)")
+    parser.add_argument("-b", "--n-blocks", type=int, default=8,
+                        help="number of row blocks (default: 8)")
+    parser.add_argument("-r", "--repeat", type=int, default=1,
+                        help="runs of each benchmark (default: 1)")
+    parser.add_argument("-o", "--output", help="save the results to a JSON "
+                                               "file")
+    parser.add_argument("--baseline", help="JSON file with the results to "
+                                           "compare with")
+    parser.add_argument("-t", "--threshold", type=float, default=0.1,
+                        help="maximum relative regression with respect to "
+                             "the baseline (default: 0.1)")
+    parser.add_argument("-e", "--executor", choices=["processes", "threads"],
+                        help="run the tasks with a local executor")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="do not measure the peak memory")
+    parser.add_argument("-l", "--list", action="store_true",
+                        help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(list_benchmarks()))
+        return 0
+
+    scale = int(args.scale) if args.scale.isdigit() else args.scale
+
+    if args.executor is not None:
+        set_executor(args.executor)
+
+    results = run_benchmarks(args.names or None, scale=scale,
+                             n_blocks=args.n_blocks, repeat=args.repeat,
+                             memory=not args.no_memory, verbose=True)
+
+    if args.output:
+        save_results(results, args.output)
+
+    errors = [n for n, r in results["results"].items() if "error" in r]
+
+    if errors:
+        print("\n%d benchmarks failed: %s" % (len(errors), ", ".join(errors)))
+
+    if args.baseline:
+        baseline = load_results(args.baseline)
+
+        # benchmarks that were not run are not missing
+        if args.names:
+            baseline["results"] = {name: result for name, result in
+                                   baseline["results"].items()
+                                   if _matches(name, args.names)}
+
+        try:
+            regressions = compare(results, baseline, args.threshold)
+        except ValueError as e:
+            print("\nCannot compare with %s: %s" % (args.baseline, e))
+            return 1
+
+        for reg in regressions:
+            if reg["metric"] == "error":
+                print("REGRESSION %s: ok in baseline, %s now" % (
+                    reg["name"], reg["value"] or "missing"))
+            else:
+                print("REGRESSION %s %s: %.4g -> %.4g (x%.2f)" % (
+                    reg["name"], reg["metric"], reg["baseline"],
+                    reg["value"], reg["ratio"]))
+
+        if regressions:
+            return 1
+
+        print("\nNo regressions with respect to %s" % args.baseline)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
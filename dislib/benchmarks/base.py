@@ -0,0 +1,481 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+from sklearn.datasets import dump_svmlight_file
+
+import dislib as ds
+from dislib.benchmarks.datasets import make_dataset, _n_samples
+from dislib.classification import CascadeSVM, RandomForestClassifier
+from dislib.cluster import DBSCAN, GaussianMixture, KMeans
+from dislib.data.array import Array
+from dislib.decomposition import PCA
+from dislib.neighbors import NearestNeighbors
+from dislib.preprocessing import StandardScaler
+from dislib.recommendation import ALS
+from dislib.regression import LinearRegression
+from dislib.runtime import compss_barrier, compss_wait_on, get_executor
+
+# Conditions of a run of the benchmarks that must match the baseline
+_CONDITIONS = ("n_samples", "n_blocks", "executor")
+
+
+def run_benchmarks(names=None, scale="small", n_blocks=8, repeat=1,
+                   memory=True, verbose=False):
+    """ Times dislib estimators and ds-array operations on synthetic
+    datasets.
+
+    Each benchmark is run repeat times, waiting for all its tasks to finish,
+    and the fastest run is reported. Datasets are generated with
+    :meth:`make_dataset <dislib.benchmarks.make_dataset>` before running
+    the benchmarks that use them.
+
+    Parameters
+    ----------
+    names : list of str, optional (default=None)
+        Names of the benchmarks to run (see :meth:`list_benchmarks
+        <dislib.benchmarks.list_benchmarks>`). Prefixes (e.g., 'kmeans')
+        select all the benchmarks starting with them. If None, all the
+        benchmarks are run.
+    scale : str or int, optional (default='small')
+        Number of samples of the datasets (see :meth:`make_dataset
+        <dislib.benchmarks.make_dataset>`).
+    n_blocks : int, optional (default=8)
+        Number of row blocks of the datasets.
+    repeat : int, optional (default=1)
+        Number of times that each benchmark is run.
+    memory : bool, optional (default=True)
+        Whether to measure the peak memory allocated by the driver in each
+        benchmark (with tracemalloc). Memory used by the workers is not
+        measured.
+    verbose : bool, optional (default=False)
+        Whether to print the results as they are computed.
+
+    Returns
+    -------
+    results : dict
+        Dict with the dislib version ('version'), the number of samples
+        ('n_samples') and of row blocks ('n_blocks') of the datasets, the
+        executor that ran the tasks ('executor', see :meth:`get_executor
+        <dislib.runtime.get_executor>`), and the result of each benchmark
+        ('results'). Results
+        contain the time in seconds ('time'), the throughput in samples and
+        bytes per second ('rows_per_s' and 'bytes_per_s'), and the peak
+        memory in bytes ('peak_memory'), or the error raised by the
+        benchmark ('error').
+    """
+    selected = _select(names)
+    datasets = {}
+    results = OrderedDict()
+    tracing = memory and not tracemalloc.is_tracing()
+
+    if tracing:
+        tracemalloc.start()
+
+    try:
+        for name, kind, setup in selected:
+            if kind not in datasets:
+                datasets[kind] = make_dataset(kind, scale, n_blocks)
+                compss_barrier()
+
+            x, y = datasets[kind]
+
+            try:
+                result = _measure(setup(x, y), x, repeat, memory)
+            except Exception as e:
+                result = {"error": "%s: %s" % (type(e).__name__, e)}
+
+            results[name] = result
+
+            if verbose:
+                print(_format(name, result))
+    finally:
+        if tracing:
+            tracemalloc.stop()
+
+    return {"version": ds.__version__, "n_samples": _n_samples(scale),
+            "n_blocks": n_blocks, "executor": _executor_name(),
+            "results": results}
+
+
+def compare(results, baseline, threshold=0.1):
+    """ Compares the results of :meth:`run_benchmarks
+    <dislib.benchmarks.run_benchmarks>` with a baseline.
+
+    Parameters
+    ----------
+    results : dict
+        Results of the benchmarks.
+    baseline : dict
+        Results of the same benchmarks used as reference (e.g., loaded with
+        :meth:`load_results <dislib.benchmarks.load_results>`).
+    threshold : float, optional (default=0.1)
+        Maximum relative increase of the time and peak memory of each
+        benchmark with respect to the baseline.
+
+    Raises
+    ------
+    ValueError
+        If the results and the baseline were not run with the same number
+        of samples, number of blocks and executor.
+
+    Returns
+    -------
+    regressions : list of dict
+        Name, metric ('time' or 'peak_memory'), value, baseline value and
+        ratio of each metric that exceeds the threshold. Benchmarks that
+        succeeded in the baseline, and that now fail or are missing from
+        the results, are also regressions, with metric 'error' and the
+        error as value (None if missing). Benchmarks that are not in the
+        baseline, or that failed in it, are ignored.
+    """
+    for key in _CONDITIONS:
+        if results.get(key) != baseline.get(key):
+            raise ValueError("Results and baseline were run with different "
+                             "%s (%s and %s)." % (key, results.get(key),
+                                                  baseline.get(key)))
+
+    regressions = []
+
+    for name, reference in baseline["results"].items():
+        result = results["results"].get(name, {"error": None})
+
+        if "error" in result and "error" not in reference:
+            regressions.append({"name": name, "metric": "error",
+                                "value": result["error"], "baseline": None,
+                                "ratio": None})
+
+    for name, result in results["results"].items():
+        reference = baseline["results"].get(name)
+
+        if reference is None or "error" in result or "error" in reference:
+            continue
+
+        for metric in ("time", "peak_memory"):
+            value, ref = result.get(metric), reference.get(metric)
+
+            if not value or not ref:
+                continue
+
+            ratio = value / ref
+
+            if ratio > 1 + threshold:
+                regressions.append({"name": name, "metric": metric,
+                                    "value": value, "baseline": ref,
+                                    "ratio": ratio})
+
+    return regressions
+
+
+def save_results(results, path):
+    """ Saves the results of :meth:`run_benchmarks
+    <dislib.benchmarks.run_benchmarks>` to a JSON file. """
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path):
+    """ Loads results saved with :meth:`save_results
+    <dislib.benchmarks.save_results>`. """
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def list_benchmarks():
+    """ Returns the names of the available benchmarks. """
+    return [name for name, _, _ in _BENCHMARKS]
+
+
+def _select(names):
+    if names is None:
+        return _BENCHMARKS
+
+    selected = [b for b in _BENCHMARKS if _matches(b[0], names)]
+
+    if not selected:
+        raise ValueError("No benchmarks match %s. Options are: %s" %
+                         (names, list_benchmarks()))
+
+    return selected
+
+
+def _executor_name():
+    executor = get_executor()
+    return "pycompss" if executor is None else type(executor).__name__
+
+
+def _matches(name, names):
+    """ Returns whether a benchmark is selected by names (or prefixes). """
+    return any(name == n or name.startswith(n + ".") for n in names)
+
+
+def _measure(run, x, repeat, memory):
+    best, peak = np.inf, None
+
+    for _ in range(repeat):
+        compss_barrier()
+
+        if memory:
+            _reset_peak()
+            start_mem = tracemalloc.get_traced_memory()[0]
+
+        start = time.time()
+        _sync(run())
+        compss_barrier()
+        elapsed = time.time() - start
+        best = min(best, elapsed)
+
+        if memory:
+            run_peak = tracemalloc.get_traced_memory()[1] - start_mem
+            peak = run_peak if peak is None else max(peak, run_peak)
+
+    n_bytes = x.nbytes
+    return {"time": best, "rows_per_s": x.shape[0] / best,
+            "bytes_per_s": n_bytes / best, "peak_memory": peak}
+
+
+def _reset_peak():
+    # tracemalloc.reset_peak is only available in Python 3.9+
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.stop()
+        tracemalloc.start()
+
+
+def _sync(result):
+    """ Launches the pending tasks of the ds-arrays in result. """
+    if isinstance(result, Array):
+        result._blocks
+    elif isinstance(result, (list, tuple)):
+        for item in result:
+            _sync(item)
+    elif isinstance(result, dict):
+        for item in result.values():
+            _sync(item)
+
+
+def _format(name, result):
+    if "error" in result:
+        return "%-28s ERROR %s" % (name, result["error"])
+
+    memory = result["peak_memory"]
+    memory = "-" if memory is None else "%.1f MB" % (memory / 2 ** 20)
+
+    return "%-28s %10.3f s %14.0f rows/s %10.1f MB/s %12s" % (
+        name, result["time"], result["rows_per_s"],
+        result["bytes_per_s"] / 2 ** 20, memory)
+
+
+def _fit(estimator, with_y=False):
+    def setup(x, y):
+        if with_y:
+            return lambda: estimator().fit(x, y)
+
+        return lambda: estimator().fit(x)
+
+    return setup
+
+
+def _predict(estimator, method="predict", with_y=False):
+    def setup(x, y):
+        est = estimator()
+
+        if with_y:
+            est.fit(x, y)
+        else:
+            est.fit(x)
+
+        compss_barrier()
+        return lambda: getattr(est, method)(x)
+
+    return setup
+
+
+def _array_op(op):
+    def setup(x, y):
+        return lambda: op(x)
+
+    return setup
+
+
+def _save_load(x, y):
+    path = tempfile.mkdtemp()
+    x.save(path)
+    run = _array_op(lambda _: ds.load(path))(x, y)
+
+    # the saved ds-array is removed with the benchmark
+    weakref.finalize(run, shutil.rmtree, path, True)
+    return run
+
+
+def _load_file(write, load):
+    """ Returns a setup function that writes the dataset to a temporary
+    file with write(data, path), and a benchmark that loads it with
+    load(path, x). """
+    def setup(x, y):
+        path = tempfile.mkdtemp()
+        file = write(x.collect(), path)
+        run = _array_op(lambda _: load(file, x))(x, y)
+
+        # the file is removed with the benchmark
+        weakref.finalize(run, shutil.rmtree, path, True)
+        return run
+
+    return setup
+
+
+def _write_txt(data, path):
+    file = os.path.join(path, "data.csv")
+    np.savetxt(file, data, delimiter=",")
+    return file
+
+
+def _write_npy(data, path):
+    file = os.path.join(path, "data.npy")
+    np.save(file, data)
+    return file
+
+
+def _write_svmlight(data, path):
+    file = os.path.join(path, "data.svm")
+    dump_svmlight_file(data, np.zeros(data.shape[0]), file)
+    return file
+
+
+def _load_txt(parallel):
+    return lambda file, x: ds.load_txt_file(file, x._reg_shape,
+                                            parallel=parallel)
+
+
+def _load_svmlight(parallel):
+    return lambda file, x: ds.load_svmlight_file(
+        file, x._reg_shape, x.shape[1], store_sparse=True, parallel=parallel)
+
+
+def _save(x, y):
+    def run():
+        path = tempfile.mkdtemp()
+
+        try:
+            x.save(path)
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+    return run
+
+
+def _csvm_fit(x, y):
+    # CascadeSVM only supports binary classification
+    labels = _labels_mod(y, 2)
+    return lambda: CascadeSVM(max_iter=2, random_state=0).fit(x, labels)
+
+
+def _csvm_predict(x, y):
+    csvm = CascadeSVM(max_iter=2, random_state=0).fit(x, _labels_mod(y, 2))
+    compss_barrier()
+    return lambda: csvm.predict(x)
+
+
+def _labels_mod(y, n):
+    labels = y.collect().reshape(-1, 1) % n
+    return ds.array(labels, block_size=y._reg_shape)
+
+
+def _als_fit(x, y):
+    return lambda: ALS(n_f=10, max_iter=5, random_state=0).fit(x)
+
+
+def _linear_fit(x, y):
+    target = x[:, 0:1]
+    return lambda: LinearRegression().fit(x[:, 1:], target)
+
+
+def _linear_predict(x, y):
+    reg = LinearRegression()
+    reg.fit(x[:, 1:], x[:, 0:1])
+    reg.coef_ = compss_wait_on(reg.coef_)
+    reg.intercept_ = compss_wait_on(reg.intercept_)
+    features = x[:, 1:]
+    return lambda: reg.predict(features)
+
+
+def _kmeans():
+    return KMeans(n_clusters=8, max_iter=5, random_state=0)
+
+
+def _gm():
+    return GaussianMixture(n_components=8, max_iter=5, random_state=0)
+
+
+def _rf():
+    return RandomForestClassifier(n_estimators=10, random_state=0)
+
+
+def _dbscan_fit(x, y):
+    return lambda: DBSCAN(eps=1, min_samples=5, n_regions=4,
+                          dimensions=[0, 1]).fit(x)
+
+
+# Name, dataset and setup function of each benchmark. Setup functions take
+# the samples and labels of the dataset and return a function that runs the
+# benchmark.
+_BENCHMARKS = [
+    ("array.sum", "dense", _array_op(lambda x: x.sum(axis=0))),
+    ("array.mean", "dense", _array_op(lambda x: x.mean(axis=1))),
+    ("array.elementwise", "dense", _array_op(lambda x: (x - 0.5) ** 2 * 3)),
+    ("array.transpose", "dense", _array_op(lambda x: x.transpose())),
+    ("array.rechunk", "dense",
+     _array_op(lambda x: x.rechunk((x._reg_shape[0] // 2 + 1, 10)))),
+    ("array.matmul", "dense",
+     _array_op(lambda x: ds.matmul(x.transpose(), x))),
+    ("array.slice", "dense",
+     _array_op(lambda x: x[x.shape[0] // 3:x.shape[0] // 2, 10:90])),
+    ("array.sort", "dense", _array_op(lambda x: ds.sort(x, column=0))),
+    ("array.quantile", "dense",
+     _array_op(lambda x: ds.quantile(x, [0.25, 0.5, 0.75]))),
+    ("array.describe", "dense", _array_op(ds.describe)),
+    ("array.collect", "dense", _array_op(lambda x: x.collect())),
+    ("array.save", "dense", _save),
+    ("array.load", "dense", _save_load),
+    ("io.txt", "dense", _load_file(_write_txt, _load_txt(False))),
+    ("io.txt_parallel", "dense", _load_file(_write_txt, _load_txt(True))),
+    ("io.npy", "dense",
+     _load_file(_write_npy,
+                lambda file, x: ds.load_npy_file(file, x._reg_shape))),
+    ("io.svmlight", "sparse",
+     _load_file(_write_svmlight, _load_svmlight(False))),
+    ("io.svmlight_parallel", "sparse",
+     _load_file(_write_svmlight, _load_svmlight(True))),
+    ("sparse.sum", "sparse", _array_op(lambda x: x.sum(axis=0))),
+    ("sparse.matmul", "sparse",
+     _array_op(lambda x: ds.matmul(x.transpose(), x))),
+    ("sparse.describe", "sparse", _array_op(ds.describe)),
+    ("sparse.save", "sparse", _save),
+    ("sparse.load", "sparse", _save_load),
+    ("scaler.fit", "dense", _fit(StandardScaler)),
+    ("scaler.transform", "dense", _predict(StandardScaler, "transform")),
+    ("pca.fit", "dense", _fit(PCA)),
+    ("pca.transform", "dense", _predict(PCA, "transform")),
+    ("linear_regression.fit", "dense", _linear_fit),
+    ("linear_regression.predict", "dense", _linear_predict),
+    ("kmeans.fit", "clustered", _fit(_kmeans)),
+    ("kmeans.predict", "clustered", _predict(_kmeans)),
+    ("gm.fit", "clustered", _fit(_gm)),
+    ("gm.predict", "clustered", _predict(_gm)),
+    ("dbscan.fit", "clustered", _dbscan_fit),
+    ("knn.fit", "clustered", _fit(NearestNeighbors)),
+    ("knn.kneighbors", "clustered",
+     _predict(NearestNeighbors, "kneighbors")),
+    ("csvm.fit", "clustered", _csvm_fit),
+    ("csvm.predict", "clustered", _csvm_predict),
+    ("rf.fit", "clustered", _fit(_rf, with_y=True)),
+    ("rf.predict", "clustered", _predict(_rf, with_y=True)),
+    ("als.fit", "recommendation", _als_fit),
+]
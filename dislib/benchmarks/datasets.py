@@ -0,0 +1,89 @@
+from math import ceil
+
+import numpy as np
+from scipy import sparse as sp
+from sklearn.datasets import make_blobs
+
+import dislib as ds
+
+# Number of samples of each named scale
+SCALES = {"tiny": 1000, "small": 10000, "medium": 100000, "large": 1000000}
+
+# Number of features of each kind of dataset
+_N_FEATURES = {"dense": 100, "sparse": 1000, "clustered": 10,
+               "recommendation": None}
+
+
+def make_dataset(kind, scale="small", n_blocks=8, random_state=0):
+    """ Generates a synthetic dataset as ds-arrays.
+
+    Parameters
+    ----------
+    kind : str
+        Kind of dataset:
+
+        - 'dense': uniformly distributed samples with 100 features.
+        - 'sparse': sparse samples with 1000 features and a density of 0.01.
+        - 'clustered': samples with 10 features grouped in 8 isotropic
+          gaussian blobs, and the blob of each sample as labels.
+        - 'recommendation': sparse matrix of ratings between 1 and 5 given
+          by each user (rows) to 1 of each 10 items (columns), with a
+          density of 0.01.
+    scale : str or int, optional (default='small')
+        Number of samples. Can be 'tiny' (1,000), 'small' (10,000), 'medium'
+        (100,000), 'large' (1,000,000), or an int.
+    n_blocks : int, optional (default=8)
+        Number of row blocks of the ds-arrays.
+    random_state : int, optional (default=0)
+        Seed of the random number generator.
+
+    Returns
+    -------
+    x : ds-array, shape=(n_samples, n_features)
+        Samples.
+    y : ds-array, shape=(n_samples, 1) or None
+        Labels of the 'clustered' dataset, and None for other kinds.
+    """
+    n_samples = _n_samples(scale)
+    random_state = np.random.RandomState(random_state)
+    y = None
+
+    if kind == "dense":
+        x = random_state.rand(n_samples, _N_FEATURES[kind])
+    elif kind == "sparse":
+        x = sp.random(n_samples, _N_FEATURES[kind], density=0.01,
+                      format="csr", random_state=random_state)
+    elif kind == "clustered":
+        x, y = make_blobs(n_samples, _N_FEATURES[kind], centers=8,
+                          random_state=random_state)
+        y = y.reshape(-1, 1)
+    elif kind == "recommendation":
+        n_items = max(n_samples // 10, 10)
+        x = sp.random(n_samples, n_items, density=0.01, format="csr",
+                      random_state=random_state,
+                      data_rvs=lambda n: random_state.randint(1, 6, n))
+    else:
+        raise ValueError("Unknown dataset '%s'. Options are: %s" %
+                         (kind, list(_N_FEATURES)))
+
+    bn = int(ceil(n_samples / n_blocks))
+    x = ds.array(x, block_size=(bn, x.shape[1]))
+
+    if y is not None:
+        y = ds.array(y, block_size=(bn, 1))
+
+    return x, y
+
+
+def _n_samples(scale):
+    if isinstance(scale, str):
+        if scale not in SCALES:
+            raise ValueError("Unknown scale '%s'. Options are: %s" %
+                             (scale, list(SCALES)))
+
+        return SCALES[scale]
+
+    if scale < 1:
+        raise ValueError("Scale must be a positive number of samples.")
+
+    return int(scale)
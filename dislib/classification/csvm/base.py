@@ -1,18 +1,20 @@
-from uuid import uuid4
+import functools
 
 import numpy as np
-from pycompss.api.api import compss_delete_object
-from pycompss.api.api import compss_wait_on
 from pycompss.api.parameter import COLLECTION_IN, Depth, Type
-from pycompss.api.task import task
 from scipy.sparse import hstack as hstack_sp
 from scipy.sparse import issparse
 from sklearn.base import BaseEstimator
 from sklearn.svm import SVC
 
 from dislib.data.array import Array
+from dislib.runtime import task, compss_wait_on, compss_delete_object, \
+    phase, ConvergenceController, Checkpointer
 from dislib.utils.base import _paired_partition
 
+# Attributes with the state of the model
+_MODEL = ("_svs", "_sv_labels", "_sv_ids", "_clf")
+
 
 class CascadeSVM(BaseEstimator):
     """ Cascade Support Vector classification.
@@ -55,6 +57,13 @@ class CascadeSVM(BaseEstimator):
         the RandomState instance used by np.random.
     verbose : boolean, optional (default=False)
         Whether to print progress information.
+    convergence_lag : int, optional (default=0)
+        Number of iterations submitted before waiting for the convergence
+        criterion of an iteration (see :class:`ConvergenceController
+        <dislib.runtime.convergence.ConvergenceController>`). Lags greater
+        than 0 avoid idle workers between iterations, at the cost of running
+        up to convergence_lag extra iterations that are discarded. Ignored if
+        check_convergence is False.
 
     Attributes
     ----------
@@ -89,7 +98,7 @@ class CascadeSVM(BaseEstimator):
 
     def __init__(self, cascade_arity=2, max_iter=5, tol=1e-3,
                  kernel="rbf", c=1, gamma='auto', check_convergence=True,
-                 random_state=None, verbose=False):
+                 random_state=None, verbose=False, convergence_lag=0):
 
         self.cascade_arity = cascade_arity
         self.max_iter = max_iter
@@ -100,8 +109,10 @@ class CascadeSVM(BaseEstimator):
         self.check_convergence = check_convergence
         self.random_state = random_state
         self.verbose = verbose
+        self.convergence_lag = convergence_lag
 
-    def fit(self, x, y):
+    def fit(self, x, y, checkpoint_dir=None, checkpoint_every=1,
+            resume=False):
         """ Fits a model using training data.
 
         Parameters
@@ -110,6 +121,17 @@ class CascadeSVM(BaseEstimator):
             Training samples.
         y : ds-array, shape=(n_samples, 1)
             Class labels of x.
+        checkpoint_dir : str, optional (default=None)
+            Directory where the support vectors, their labels and ids, and
+            the classifier are saved every checkpoint_every iterations (see
+            :class:`Checkpointer <dislib.runtime.checkpoint.Checkpointer>`).
+            It must be accessible from all the workers. If None, checkpoints
+            are not saved.
+        checkpoint_every : int, optional (default=1)
+            Number of iterations between checkpoints.
+        resume : bool, optional (default=False)
+            Whether to resume the fit from the last checkpoint in
+            checkpoint_dir.
 
         Returns
         -------
@@ -121,14 +143,55 @@ class CascadeSVM(BaseEstimator):
         self._set_kernel()
         self._hstack_f = hstack_sp if x._sparse else np.hstack
 
-        ids_list = [[_gen_ids(row._blocks)] for row in x._iterator(axis=0)]
+        checkpointer = Checkpointer(checkpoint_dir, checkpoint_every, resume)
+        checkpoint = checkpointer.load()
+
+        if checkpoint is not None:
+            self._set_model(checkpoint)
+            self._last_w = checkpoint["w"]
+            self.iterations = checkpoint["iteration"]
+            self.converged = checkpoint["converged"]
+
+            if self.converged:
+                return self
+
+        with phase(self, "init"):
+            ids_list = []
+            start = 0
+
+            for row in x._iterator(axis=0):
+                ids_list.append([_gen_ids(start, row.shape[0])])
+                start += row.shape[0]
+
+        controller = ConvergenceController(self.convergence_lag,
+                                           self._check_convergence,
+                                           self.iterations, self._get_model())
 
         while not self._check_finished():
-            self._do_iteration(x, y, ids_list)
+            with phase(self, "train"):
+                self._do_iteration(x, y, ids_list)
 
             if self.check_convergence:
-                self._check_convergence_and_update_w()
+                with phase(self, "convergence sync"):
+                    w = _compute_w(self._svs, self._sv_labels, self._clf,
+                                   self._hstack_f, self._kernel_f)
+                    checkpointer.save(self.iterations, w=w,
+                                      **self._get_model())
+                    self.converged = controller.add(w, self._get_model())
+
                 self._print_iteration()
+            else:
+                checkpointer.save(self.iterations, w=None,
+                                  **self._get_model())
+
+        if self.check_convergence:
+            self._set_model(controller.finish())
+            self.iterations = controller.iteration
+            self.converged = controller.converged
+            self._collect_clf()
+
+        checkpointer.save_final(self.iterations, self.converged,
+                                w=self._last_w, **self._get_model())
 
         return self
 
@@ -235,6 +298,7 @@ class CascadeSVM(BaseEstimator):
         self._clf = None
         self._svs = None
         self._sv_labels = None
+        self._sv_ids = None
 
     def _set_gamma(self, n_features):
         if self.gamma == "auto":
@@ -247,13 +311,17 @@ class CascadeSVM(BaseEstimator):
         c = self.c
         if kernel == "rbf":
             self._clf_params = {"kernel": kernel, "C": c, "gamma": self._gamma}
+            self._kernel_f = functools.partial(_rbf_kernel, gamma=self._gamma)
         else:
             self._clf_params = {"kernel": kernel, "C": c}
+            self._kernel_f = _linear_kernel
 
-        try:
-            self._kernel_f = getattr(self, CascadeSVM._name_to_kernel[kernel])
-        except AttributeError:
-            self._kernel_f = getattr(self, "_rbf_kernel")
+    def _get_model(self):
+        return {name: getattr(self, name) for name in _MODEL}
+
+    def _set_model(self, model):
+        for name in _MODEL:
+            setattr(self, name, model[name])
 
     def _collect_clf(self):
         self._svs, self._sv_labels, self._clf = compss_wait_on(self._svs,
@@ -314,76 +382,80 @@ class CascadeSVM(BaseEstimator):
     def _check_finished(self):
         return self.iterations >= self.max_iter or self.converged
 
-    def _lag_fast(self, vectors, labels, coef):
-        set_sl = set(labels.ravel())
-        assert len(set_sl) == 2, "Only binary problem can be handled"
-        new_sl = labels.copy()
-        new_sl[labels == 0] = -1
-
-        if issparse(coef):
-            coef = coef.toarray()
-
-        c1, c2 = np.meshgrid(coef, coef)
-        l1, l2 = np.meshgrid(new_sl, new_sl)
-        double_sum = c1 * c2 * l1 * l2 * self._kernel_f(vectors)
-        double_sum = double_sum.sum()
-        w = -0.5 * double_sum + coef.sum()
-
-        return w
-
-    def _check_convergence_and_update_w(self):
-        self._collect_clf()
-
-        vecs = self._hstack_f(self._svs)
-        w = self._lag_fast(vecs, self._sv_labels, self._clf.dual_coef_)
+    def _check_convergence(self, w, iteration):
         delta = 0
+        converged = False
 
         if self._last_w:
             delta = np.abs((w - self._last_w) / self._last_w)
-
-            if delta < self.tol:
-                self.converged = True
+            converged = delta < self.tol
 
         if self.verbose:
-            self._print_convergence(delta, w)
+            self._print_convergence(delta, w, converged)
 
         self._last_w = w
+        return converged
 
-    def _print_convergence(self, delta, w):
+    def _print_convergence(self, delta, w, converged):
         print("Computed W %s" % w)
         if self._last_w:
             print("Checking convergence...")
 
-            if self.converged:
+            if converged:
                 print("     Converged with delta: %s " % delta)
             else:
                 print("     No convergence with delta: %s " % delta)
 
-    def _rbf_kernel(self, x):
-        # Trick: || x - y || ausmultipliziert
-        sigmaq = -1 / (2 * self._gamma)
-        n = x.shape[0]
-        k = x.dot(x.T) / sigmaq
 
-        if issparse(k):
-            k = k.toarray()
+def _lagrangian(vectors, labels, coef, kernel_f):
+    set_sl = set(labels.ravel())
+    assert len(set_sl) == 2, "Only binary problem can be handled"
+    new_sl = labels.copy()
+    new_sl[labels == 0] = -1
+
+    if issparse(coef):
+        coef = coef.toarray()
+
+    c1, c2 = np.meshgrid(coef, coef)
+    l1, l2 = np.meshgrid(new_sl, new_sl)
+    double_sum = c1 * c2 * l1 * l2 * kernel_f(vectors)
+    double_sum = double_sum.sum()
+    w = -0.5 * double_sum + coef.sum()
+
+    return w
+
+
+def _rbf_kernel(x, gamma):
+    # Trick: || x - y || ausmultipliziert
+    sigmaq = -1 / (2 * gamma)
+    n = x.shape[0]
+    k = x.dot(x.T) / sigmaq
+
+    if issparse(k):
+        k = k.toarray()
+
+    d = np.diag(k).reshape((n, 1))
+    k = k - np.ones((n, 1)) * d.T / 2
+    k = k - d * np.ones((1, n)) / 2
+    k = np.exp(k)
+    return k
+
+
+def _linear_kernel(x):
+    return np.dot(x, x.T)
 
-        d = np.diag(k).reshape((n, 1))
-        k = k - np.ones((n, 1)) * d.T / 2
-        k = k - d * np.ones((1, n)) / 2
-        k = np.exp(k)
-        return k
 
-    @staticmethod
-    def _linear_kernel(x):
-        return np.dot(x, x.T)
+@task(returns=1)
+def _compute_w(svs, sv_labels, clf, hstack_f, kernel_f):
+    vectors = hstack_f(svs)
+    return _lagrangian(vectors, sv_labels, clf.dual_coef_, kernel_f)
 
 
-@task(blocks={Type: COLLECTION_IN, Depth: 2}, returns=1)
-def _gen_ids(blocks):
-    samples = Array._merge_blocks(blocks)
-    idx = [[uuid4().int] for _ in range(samples.shape[0])]
-    return np.array(idx)
+@task(returns=1)
+def _gen_ids(start, n_samples):
+    # ids are the indices of the samples, so that they are the same when a
+    # fit is resumed from a checkpoint
+    return np.arange(start, start + n_samples).reshape(-1, 1)
 
 
 @task(x_list={Type: COLLECTION_IN, Depth: 2},
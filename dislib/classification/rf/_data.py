@@ -4,9 +4,9 @@ import numpy as np
 from numpy.lib import format
 from pycompss.api.parameter import FILE_IN, FILE_INOUT, COLLECTION_IN, Depth, \
     Type
-from pycompss.api.task import task
 
 from dislib.data.array import Array
+from dislib.runtime import task
 
 
 class RfDataset(object):
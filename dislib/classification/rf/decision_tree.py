@@ -2,13 +2,12 @@ from sys import float_info
 
 import numpy as np
 from numpy.random.mtrand import RandomState
-from pycompss.api.api import compss_delete_object
 from pycompss.api.parameter import FILE_IN, Type, COLLECTION_IN, Depth
-from pycompss.api.task import task
 from sklearn.tree import DecisionTreeClassifier as SklearnDTClassifier
 
 from dislib.classification.rf.test_split import test_split
 from dislib.data.array import Array
+from dislib.runtime import task, compss_delete_object
 
 
 class DecisionTreeClassifier:
@@ -2,14 +2,13 @@ import math
 from collections import Counter
 
 import numpy as np
-from pycompss.api.api import compss_wait_on
 from pycompss.api.parameter import Type, COLLECTION_IN, Depth
-from pycompss.api.task import task
 from sklearn.base import BaseEstimator
 from sklearn.utils import check_random_state
 
 from dislib.classification.rf.decision_tree import DecisionTreeClassifier
 from dislib.data.array import Array
+from dislib.runtime import task, compss_wait_on
 from dislib.utils.base import _paired_partition
 from dislib.classification.rf._data import transform_to_rf_dataset
 
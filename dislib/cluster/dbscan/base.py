@@ -1,15 +1,14 @@
 import numpy as np
-from pycompss.api.api import compss_wait_on
 from pycompss.api.parameter import COLLECTION_IN, COLLECTION_INOUT, \
     Type, Depth
-from pycompss.api.task import task
 from scipy.sparse import issparse
 from scipy.sparse import vstack as vstack_sparse
 from sklearn.base import BaseEstimator
 from sklearn.utils import validation
 
 from dislib.cluster.dbscan.classes import Region
-from dislib.data.array import Array
+from dislib.data.array import Array, describe
+from dislib.runtime import task, compss_wait_on
 
 
 class DBSCAN(BaseEstimator):
@@ -195,8 +194,9 @@ class DBSCAN(BaseEstimator):
         return len(self._components)
 
     def _compute_region_widths(self, x):
-        mn = x.min().collect()
-        mx = x.max().collect()
+        stats = describe(x)
+        mn = stats["min"].collect()
+        mx = stats["max"].collect()
         return ((mx - mn) / self.n_regions).reshape(-1, )
 
 
@@ -235,11 +235,9 @@ def _arrange_samples(x, n_regions, dimensions=None):
 
     grid_shape = (n_regions,) * len(dimensions)
 
-    # min() and max() calls have synchronization points
-    mn = x.min()
-    mx = x.max()
-
-    bins = _generate_bins(mn._blocks, mx._blocks, dimensions, n_regions)
+    stats = describe(x)
+    bins = _generate_bins(stats["min"]._blocks, stats["max"]._blocks,
+                          dimensions, n_regions)
 
     total_regions = n_regions ** len(dimensions)
 
@@ -3,11 +3,12 @@ from collections import defaultdict
 from itertools import chain
 
 import numpy as np
-from pycompss.api.task import task
 from scipy.sparse import lil_matrix, vstack as vstack_sparse
 from scipy.sparse.csgraph import connected_components
 from sklearn.neighbors import NearestNeighbors
 
+from dislib.runtime import task
+
 
 class Region(object):
 
@@ -2,9 +2,7 @@ import warnings
 
 import numpy as np
 from numpy.random.mtrand import RandomState
-from pycompss.api.api import compss_wait_on, compss_delete_object
 from pycompss.api.parameter import Type, COLLECTION_IN, Depth
-from pycompss.api.task import task
 from scipy import linalg
 from scipy.sparse import issparse
 from sklearn.exceptions import ConvergenceWarning
@@ -15,6 +13,11 @@ from sklearn.utils.fixes import logsumexp
 
 from dislib.cluster import KMeans
 from dislib.data.array import Array
+from dislib.runtime import task, compss_delete_object, phase, \
+    ConvergenceController, Checkpointer
+
+# Attributes with the parameters of the model
+_PARAMETERS = ("weights_", "means_", "covariances_", "precisions_cholesky_")
 
 
 class GaussianMixture(BaseEstimator):
@@ -82,6 +85,13 @@ class GaussianMixture(BaseEstimator):
         Arity of the reductions.
     verbose: boolean, optional (default=False)
         Whether to print progress information.
+    convergence_lag : int, optional (default=0)
+        Number of iterations submitted before waiting for the convergence
+        criterion of an iteration (see :class:`ConvergenceController
+        <dislib.runtime.convergence.ConvergenceController>`). Lags greater
+        than 0 avoid idle workers between iterations, at the cost of running
+        up to convergence_lag extra iterations that are discarded. Ignored if
+        `check_convergence` is False.
 
     Attributes
     ----------
@@ -121,7 +131,7 @@ class GaussianMixture(BaseEstimator):
 
     Examples
     --------
-    >>> from pycompss.api.api import compss_wait_on
+    >>> from dislib.runtime import compss_wait_on
     >>> from dislib.cluster import GaussianMixture
     >>> import dislib as ds
     >>> x = ds.array([[1, 2], [1, 4], [1, 0], [4, 2], [4, 4], [4, 0]], (3, 2))
@@ -138,7 +148,7 @@ class GaussianMixture(BaseEstimator):
                  check_convergence=True, tol=1e-3, reg_covar=1e-6,
                  max_iter=100, init_params='kmeans', weights_init=None,
                  means_init=None, precisions_init=None, arity=50,
-                 verbose=False, random_state=None):
+                 verbose=False, random_state=None, convergence_lag=0):
 
         self.n_components = n_components
         self.check_convergence = check_convergence
@@ -153,8 +163,10 @@ class GaussianMixture(BaseEstimator):
         self.weights_init = weights_init
         self.means_init = means_init
         self.precisions_init = precisions_init
+        self.convergence_lag = convergence_lag
 
-    def fit(self, x, y=None):
+    def fit(self, x, y=None, checkpoint_dir=None, checkpoint_every=1,
+            resume=False):
         """Estimate model parameters with the EM algorithm.
 
         Iterates between E-steps and M-steps until convergence or until
@@ -167,6 +179,16 @@ class GaussianMixture(BaseEstimator):
             Data points.
         y : ignored
             Not used, present here for API consistency by convention.
+        checkpoint_dir : str, optional (default=None)
+            Directory where the model parameters and the lower bound are saved
+            every `checkpoint_every` iterations (see :class:`Checkpointer
+            <dislib.runtime.checkpoint.Checkpointer>`). It must be accessible
+            from all the workers. If None, checkpoints are not saved.
+        checkpoint_every : int, optional (default=1)
+            Number of iterations between checkpoints.
+        resume : bool, optional (default=False)
+            Whether to resume the fit from the last checkpoint in
+            `checkpoint_dir` instead of initializing the parameters.
 
         Warns
         -----
@@ -179,31 +201,59 @@ class GaussianMixture(BaseEstimator):
         self.converged_ = False
         self.n_iter = 0
 
-        random_state = validation.check_random_state(self.random_state)
+        checkpointer = Checkpointer(checkpoint_dir, checkpoint_every, resume)
+        checkpoint = checkpointer.load()
+
+        if checkpoint is None:
+            random_state = validation.check_random_state(self.random_state)
 
-        self._initialize_parameters(x, random_state)
-        self.lower_bound_ = -np.infty
+            with phase(self, "init"):
+                self._initialize_parameters(x, random_state)
+
+            self.lower_bound_ = -np.infty
+        else:
+            self._set_parameters(checkpoint)
+            self.lower_bound_ = checkpoint["lower_bound_"]
+            self.n_iter = checkpoint["iteration"]
+            self.converged_ = checkpoint["converged"]
+
+            if self.converged_:
+                return
+
+        start = self.n_iter
+        controller = ConvergenceController(self.convergence_lag,
+                                           self._check_lower_bound, start,
+                                           self._get_parameters())
         if self.verbose:
             print("GaussianMixture EM algorithm start")
-        for self.n_iter in range(1, self.max_iter + 1):
-            prev_lower_bound = self.lower_bound_
+        for self.n_iter in range(start + 1, self.max_iter + 1):
+            with phase(self, "E-step"):
+                lower_bound, resp = self._e_step(x)
+
+            with phase(self, "M-step"):
+                self._m_step(x, resp)
 
-            self.lower_bound_, resp = self._e_step(x)
-            self._m_step(x, resp)
             for resp_block in resp._blocks:
                 compss_delete_object(resp_block)
 
+            checkpointer.save(self.n_iter, lower_bound_=lower_bound,
+                              **self._get_parameters())
+
             if self.check_convergence:
-                self.lower_bound_ = compss_wait_on(self.lower_bound_)
-                diff = abs(self.lower_bound_ - prev_lower_bound)
+                with phase(self, "convergence sync"):
+                    if controller.add(lower_bound, self._get_parameters()):
+                        break
+            else:
+                self.lower_bound_ = lower_bound
 
-                if self.verbose:
-                    iter_msg_template = "Iteration %s - Convergence crit. = %s"
-                    print(iter_msg_template % (self.n_iter, diff))
+        if self.check_convergence:
+            self._set_parameters(controller.finish())
+            self.n_iter = controller.iteration
+            self.converged_ = controller.converged
 
-                if diff < self.tol:
-                    self.converged_ = True
-                    break
+        checkpointer.save_final(self.n_iter, self.converged_,
+                                lower_bound_=self.lower_bound_,
+                                **self._get_parameters())
 
         if self.check_convergence and not self.converged_:
             warnings.warn('The algorithm did not converge. '
@@ -257,6 +307,23 @@ class GaussianMixture(BaseEstimator):
         _, resp = self._e_step(x)
         return _resp_argmax(resp)
 
+    def _check_lower_bound(self, lower_bound, n_iter):
+        diff = abs(lower_bound - self.lower_bound_)
+        self.lower_bound_ = lower_bound
+
+        if self.verbose:
+            iter_msg_template = "Iteration %s - Convergence crit. = %s"
+            print(iter_msg_template % (n_iter, diff))
+
+        return diff < self.tol
+
+    def _get_parameters(self):
+        return {name: getattr(self, name) for name in _PARAMETERS}
+
+    def _set_parameters(self, params):
+        for name in _PARAMETERS:
+            setattr(self, name, params[name])
+
     def _e_step(self, x):
         """E step.
 
@@ -485,11 +552,16 @@ class GaussianMixture(BaseEstimator):
                 self.precisions_cholesky_ = np.array(
                     [linalg.cholesky(prec_init, lower=True)
                      for prec_init in self.precisions_init])
+                self.covariances_ = np.array(
+                    [linalg.inv(prec_init)
+                     for prec_init in self.precisions_init])
             elif self.covariance_type == 'tied':
                 self.precisions_cholesky_ = linalg.cholesky(
                     self.precisions_init, lower=True)
+                self.covariances_ = linalg.inv(self.precisions_init)
             else:
                 self.precisions_cholesky_ = self.precisions_init
+                self.covariances_ = 1 / self.precisions_init
         initialize_params = (self.weights_init is None or
                              self.means_init is None or
                              self.precisions_init is None)
@@ -1,7 +1,5 @@
 import numpy as np
-from pycompss.api.api import compss_wait_on
 from pycompss.api.parameter import COLLECTION_IN, Depth, Type
-from pycompss.api.task import task
 from scipy.sparse import csr_matrix
 from sklearn.base import BaseEstimator
 from sklearn.metrics import pairwise_distances
@@ -9,6 +7,8 @@ from sklearn.metrics.pairwise import paired_distances
 from sklearn.utils import check_random_state, validation
 
 from dislib.data.array import Array
+from dislib.runtime import task, compss_wait_on, phase, \
+    ConvergenceController, Checkpointer
 
 
 class KMeans(BaseEstimator):
@@ -37,6 +37,12 @@ class KMeans(BaseEstimator):
         for centroid initialization.
     verbose: boolean, optional (default=False)
         Whether to print progress information.
+    convergence_lag : int, optional (default=0)
+        Number of iterations submitted before waiting for the convergence
+        criterion of an iteration (see :class:`ConvergenceController
+        <dislib.runtime.convergence.ConvergenceController>`). Lags greater
+        than 0 avoid idle workers between iterations, at the cost of running
+        up to convergence_lag extra iterations that are discarded.
 
     Attributes
     ----------
@@ -62,7 +68,8 @@ class KMeans(BaseEstimator):
     """
 
     def __init__(self, n_clusters=8, init='random', max_iter=10, tol=1e-4,
-                 arity=50, random_state=None, verbose=False):
+                 arity=50, random_state=None, verbose=False,
+                 convergence_lag=0):
         self.n_clusters = n_clusters
         self.max_iter = max_iter
         self.tol = tol
@@ -70,8 +77,10 @@ class KMeans(BaseEstimator):
         self.arity = arity
         self.verbose = verbose
         self.init = init
+        self.convergence_lag = convergence_lag
 
-    def fit(self, x, y=None):
+    def fit(self, x, y=None, checkpoint_dir=None, checkpoint_every=1,
+            resume=False):
         """ Compute K-means clustering.
 
         Parameters
@@ -80,29 +89,62 @@ class KMeans(BaseEstimator):
             Samples to cluster.
         y : ignored
             Not used, present here for API consistency by convention.
+        checkpoint_dir : str, optional (default=None)
+            Directory where the centers are saved every checkpoint_every
+            iterations (see :class:`Checkpointer
+            <dislib.runtime.checkpoint.Checkpointer>`). It must be accessible
+            from all the workers. If None, checkpoints are not saved.
+        checkpoint_every : int, optional (default=1)
+            Number of iterations between checkpoints.
+        resume : bool, optional (default=False)
+            Whether to resume the fit from the last checkpoint in
+            checkpoint_dir instead of initializing the centers.
 
         Returns
         -------
         self : KMeans
         """
         self.random_state = check_random_state(self.random_state)
-        self._init_centers(x.shape[1], x._sparse)
+        checkpointer = Checkpointer(checkpoint_dir, checkpoint_every, resume)
+        checkpoint = checkpointer.load()
 
-        old_centers = None
-        iteration = 0
+        if checkpoint is None:
+            with phase(self, "init"):
+                self._init_centers(x.shape[1], x._sparse)
 
-        while not self._converged(old_centers, iteration):
-            old_centers = self.centers.copy()
+            start = 0
+        else:
+            self.centers = checkpoint["centers"]
+            self.n_iter = start = checkpoint["iteration"]
+
+            if checkpoint["converged"]:
+                return self
+
+        controller = ConvergenceController(self.convergence_lag,
+                                           self._converged, start,
+                                           self.centers)
+        centers = self.centers
+
+        # at least one iteration is performed
+        for iteration in range(start + 1, max(self.max_iter, 1) + 1):
             partials = []
 
-            for row in x._iterator(axis=0):
-                partial = _partial_sum(row._blocks, old_centers)
-                partials.append(partial)
+            with phase(self, "partial sums"):
+                for row in x._iterator(axis=0):
+                    partial = _partial_sum(row._blocks, centers)
+                    partials.append(partial)
+
+            with phase(self, "convergence sync"):
+                centers, diff = self._recompute_centers(partials, centers)
+                checkpointer.save(iteration, centers=centers)
 
-            self._recompute_centers(partials)
-            iteration += 1
+                if controller.add(diff, centers):
+                    break
 
-        self.n_iter = iteration
+        self.centers = compss_wait_on(controller.finish())
+        self.n_iter = controller.iteration
+        checkpointer.save_final(self.n_iter, controller.converged,
+                                centers=self.centers)
 
         return self
 
@@ -148,28 +190,19 @@ class KMeans(BaseEstimator):
                      reg_shape=(x._reg_shape[0], 1), shape=(x.shape[0], 1),
                      sparse=False)
 
-    def _converged(self, old_centers, iteration):
-        if old_centers is None:
-            return False
-
-        diff = np.sum(paired_distances(self.centers, old_centers))
-
+    def _converged(self, diff, iteration):
         if self.verbose:
             print("Iteration %s - Convergence crit. = %s" % (iteration, diff))
 
-        return diff < self.tol ** 2 or iteration >= self.max_iter
+        return diff < self.tol ** 2
 
-    def _recompute_centers(self, partials):
+    def _recompute_centers(self, partials, centers):
         while len(partials) > 1:
             partials_subset = partials[:self.arity]
             partials = partials[self.arity:]
             partials.append(_merge(*partials_subset))
 
-        partials = compss_wait_on(partials)
-
-        for idx, sum_ in enumerate(partials[0]):
-            if sum_[1] != 0:
-                self.centers[idx] = sum_[0] / sum_[1]
+        return _compute_centers(partials[0], centers)
 
     def _init_centers(self, n_features, sparse):
         if isinstance(self.init, np.ndarray) \
@@ -214,6 +247,18 @@ def _merge(*data):
     return accum
 
 
+@task(returns=2)
+def _compute_centers(partials, old_centers):
+    centers = old_centers.copy()
+
+    for idx, sum_ in enumerate(partials):
+        if sum_[1] != 0:
+            centers[idx] = sum_[0] / sum_[1]
+
+    diff = np.sum(paired_distances(centers, old_centers))
+    return centers, diff
+
+
 @task(blocks={Type: COLLECTION_IN, Depth: 2}, returns=np.array)
 def _predict(blocks, centers):
     arr = Array._merge_blocks(blocks)
@@ -1,5 +1,14 @@
 from dislib.data.array import array, random_array, apply_along_axis, \
-    load_txt_file, load_svmlight_file, load_from_hecuba
+    load_txt_file, load_svmlight_file, load_from_hecuba, matmul, \
+    load_npy_file, load, zeros, ones, full, eye, identity, random_normal, \
+    random_sparse, concatenate, vstack, hstack, sort, argsort, quantile, \
+    unique, bincount, histogram, describe, load_from_storage, \
+    StorageBackend, HecubaStorage, FileSystemStorage
 
 __all__ = ['load_txt_file', 'load_svmlight_file', 'array', 'random_array',
-           'apply_along_axis', 'load_from_hecuba']
+           'apply_along_axis', 'load_from_hecuba', 'matmul', 'load_npy_file',
+           'load', 'zeros', 'ones', 'full', 'eye', 'identity', 'random_normal',
+           'random_sparse', 'concatenate', 'vstack', 'hstack', 'sort',
+           'argsort', 'quantile', 'unique', 'bincount', 'histogram',
+           'describe', 'load_from_storage', 'StorageBackend',
+           'HecubaStorage', 'FileSystemStorage']
@@ -1,23 +1,52 @@
+import bz2
+import io
 import itertools
+import json
+import lzma
+import os
+import shutil
 import uuid
-from collections import defaultdict
+import zlib
+from bisect import bisect_right
+from collections import defaultdict, namedtuple, deque
 from math import ceil
+from numbers import Number
 
 import numpy as np
 import importlib
-from pycompss.api.api import compss_wait_on
 from pycompss.api.parameter import Type, COLLECTION_IN, Depth, COLLECTION_INOUT
-from pycompss.api.task import task
 from scipy import sparse as sp
 from scipy.sparse import issparse, csr_matrix
 from sklearn.utils import check_random_state
 
+from dislib.runtime import task, compss_wait_on, compss_barrier
+from dislib.runtime.tracing import timed
+
 if importlib.util.find_spec("hecuba"):
     try:
         from hecuba.hnumpy import StorageNumpy
     except Exception:
         pass
 
+# Codecs supported by Array.save. Each one must provide compress and
+# decompress functions.
+_CODECS = {"zlib": zlib, "bz2": bz2, "lzma": lzma}
+
+if importlib.util.find_spec("lz4"):
+    try:
+        import lz4.frame
+
+        _CODECS["lz4"] = lz4.frame
+    except Exception:
+        pass
+
+_METADATA_FILE = "metadata.json"
+_STATS = ("count", "mean", "var", "min", "max", "nnz")
+
+# Metadata of a single block of a ds-array
+_BlockMeta = namedtuple("_BlockMeta", ["rows", "cols", "nnz", "dtype",
+                                       "nbytes"])
+
 
 class Array(object):
     """ A distributed 2-dimensional array divided in blocks.
@@ -38,6 +67,15 @@ class Array(object):
         - ``A[i:j, k:m]`` : returns a set of elements (with ``i``, ``j``,
           ``k``, and ``m`` optional)
 
+    ds-arrays also support the element-wise arithmetic operators (``+``,
+    ``-``, ``*``, ``/``, ``**``, unary ``-`` and ``abs``) and NumPy ufuncs
+    (e.g., ``np.sqrt(A)``). Operands can be scalars, nd-arrays or other
+    ds-arrays, including row vectors of shape (1, n_features) and column
+    vectors of shape (n_samples, 1), which are broadcast following NumPy
+    rules. Operations are evaluated lazily, and chained expressions such as
+    ``(A - mean) / std`` run as a single task per block when the result is
+    used.
+
     Parameters
     ----------
     blocks : list
@@ -68,11 +106,21 @@ class Array(object):
         Total number of (horizontal, vertical) blocks.
     _sparse: boolean
         True if this array contains sparse data.
+    _expr : tuple or None
+        Pending element-wise expression that computes the blocks of this
+        array. Expressions are evaluated (with a single task per block) the
+        first time the blocks are accessed.
+    _block_meta : list or None
+        List of lists with the metadata (rows, cols, nnz, dtype and nbytes)
+        of each block, or None if it is not known yet. Entries can be
+        futures returned by the tasks that compute the blocks, or None if
+        unknown, until _get_block_meta is called.
     """
 
     def __init__(self, blocks, top_left_shape, reg_shape, shape, sparse):
         self._validate_blocks(blocks)
 
+        self._expr = None
         self._blocks = blocks
         self._top_left_shape = top_left_shape
         self._reg_shape = reg_shape
@@ -94,9 +142,14 @@ class Array(object):
                    self._sparse)
 
     def __getitem__(self, arg):
-        if getattr(self, "_base_array", None) is not None:
-            return array(x=list(self._base_array[arg]),
-                         block_size=self._reg_shape)
+        # persistent ds-arrays can provide a more efficient indexing that
+        # reads the data directly from the storage
+        storage = getattr(self, "_storage", None)
+        if storage is not None:
+            res = storage[0].getitem(self, storage[1], arg)
+
+            if res is not None:
+                return res
 
         # return a single row
         if isinstance(arg, int):
@@ -132,6 +185,57 @@ class Array(object):
 
         raise IndexError("Invalid indexing information: %s" % str(arg))
 
+    def __add__(self, other):
+        return _elementwise(np.add, self, other)
+
+    def __radd__(self, other):
+        return _elementwise(np.add, other, self)
+
+    def __sub__(self, other):
+        return _elementwise(np.subtract, self, other)
+
+    def __rsub__(self, other):
+        return _elementwise(np.subtract, other, self)
+
+    def __mul__(self, other):
+        return _elementwise(np.multiply, self, other)
+
+    def __rmul__(self, other):
+        return _elementwise(np.multiply, other, self)
+
+    def __truediv__(self, other):
+        return _elementwise(np.true_divide, self, other)
+
+    def __rtruediv__(self, other):
+        return _elementwise(np.true_divide, other, self)
+
+    def __pow__(self, other):
+        return _elementwise(np.power, self, other)
+
+    def __rpow__(self, other):
+        return _elementwise(np.power, other, self)
+
+    def __matmul__(self, other):
+        if not isinstance(other, Array):
+            return NotImplemented
+
+        return matmul(self, other)
+
+    def __neg__(self):
+        return _elementwise(np.negative, self)
+
+    def __abs__(self):
+        return _elementwise(np.absolute, self)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        # only plain calls of single-output ufuncs (e.g., np.sqrt(x) or
+        # np.add(x, 1)) can be fused into ds-array expressions
+        if method != "__call__" or kwargs or ufunc.nout != 1 \
+                or ufunc.nin > 2 or ufunc.signature is not None:
+            return NotImplemented
+
+        return _elementwise(ufunc, *inputs)
+
     @property
     def shape(self):
         """
@@ -139,6 +243,126 @@ class Array(object):
         """
         return self._shape
 
+    @property
+    def _blocks(self):
+        if self._expr is not None:
+            self._compute_expr()
+
+        return self._block_list
+
+    @_blocks.setter
+    def _blocks(self, blocks):
+        self._expr = None
+        self._block_meta = None
+        self._block_list = blocks
+
+    @property
+    def nnz(self):
+        """
+        Number of stored elements of the ds-array (i.e., non-zero elements
+        if the ds-array is sparse, and all the elements otherwise). This
+        waits for the metadata of the blocks (see _get_block_meta).
+        """
+        return sum(meta.nnz for row in self._get_block_meta()
+                   for meta in row)
+
+    @property
+    def nbytes(self):
+        """
+        Total bytes consumed by the blocks of the ds-array. This waits for
+        the metadata of the blocks (see _get_block_meta).
+        """
+        return sum(meta.nbytes for row in self._get_block_meta()
+                   for meta in row)
+
+    @property
+    def dtype(self):
+        """
+        Data type of the ds-array elements. This waits for the metadata of
+        the blocks (see _get_block_meta).
+        """
+        return np.result_type(*[meta.dtype for row in self._get_block_meta()
+                                for meta in row])
+
+    def _get_block_meta(self):
+        """
+        Returns the metadata of each block as a list of lists of _BlockMeta,
+        and keeps it in the driver.
+
+        The metadata is known without running any task when the ds-array is
+        created from data in the driver, and is returned alongside the
+        blocks by the tasks that evaluate element-wise expressions and load
+        or generate sparse blocks. Thus, waiting for it only waits for
+        those tasks to finish. The metadata of other blocks (e.g., rechunked
+        ones) is computed by a task per block, which waits for the block
+        itself.
+        """
+        blocks = self._blocks
+
+        if self._block_meta is None:
+            self._block_meta = [[None] * len(row) for row in blocks]
+
+        self._block_meta = [[_get_block_meta(block) if meta is None else meta
+                             for block, meta in zip(b_row, m_row)]
+                            for b_row, m_row in zip(blocks, self._block_meta)]
+        self._block_meta = compss_wait_on(self._block_meta)
+        return self._block_meta
+
+    def _set_dense_meta(self, dtype):
+        """
+        Sets the metadata of the blocks of a dense ds-array with the given
+        dtype, which can be computed without running any task.
+        """
+        itemsize = np.dtype(dtype).itemsize
+        dtype = np.dtype(dtype).str
+        self._block_meta = [[_BlockMeta(rows, cols, rows * cols, dtype,
+                                        rows * cols * itemsize)
+                             for cols in self._block_sizes(1)]
+                            for rows in self._block_sizes(0)]
+
+    def _compute_expr(self):
+        """
+        Evaluates the pending element-wise expression of this ds-array
+        launching a single task per block, regardless of the number of
+        operations in the expression.
+        """
+        expr = self._expr
+        row_bounds = _block_bounds(self, 0)
+        col_bounds = _block_bounds(self, 1)
+        blocks = []
+        block_meta = []
+
+        for i, rows in enumerate(row_bounds):
+            blocks.append([])
+            block_meta.append([])
+
+            for j, cols in enumerate(col_bounds):
+                leaves = []
+                block_expr = _block_expr(expr, leaves, {}, rows, cols)
+                in_blocks = [leaf._block_list[_bcast_idx(leaf, 0, i)]
+                             [_bcast_idx(leaf, 1, j)] for leaf in leaves]
+                block, meta = _eval_expr(block_expr, in_blocks, self._sparse)
+                blocks[-1].append(block)
+                block_meta[-1].append(meta)
+
+        self._blocks = blocks
+        self._block_meta = block_meta
+
+    def _block_sizes(self, axis):
+        """
+        Returns the number of rows (axis=0) or columns (axis=1) of each
+        block along the given axis.
+        """
+        n_blocks = self._n_blocks[axis]
+        first = min(self._top_left_shape[axis], self.shape[axis])
+
+        if n_blocks == 1:
+            return [first]
+
+        reg = self._reg_shape[axis]
+        last = self.shape[axis] - first - (n_blocks - 2) * reg
+        return [first] + [reg] * (n_blocks - 2) + [last]
+
     @staticmethod
     def _validate_blocks(blocks):
         if len(blocks) == 0 or len(blocks[0]) == 0:
@@ -151,12 +375,17 @@ class Array(object):
                     'All rows must contain the same number of blocks.')
 
     @staticmethod
+    @timed("merge")
     def _merge_blocks(blocks):
         """
         Helper function that merges the _blocks attribute of a ds-array into
         a single ndarray / sparse matrix.
+
+        If there is a single block, the block itself is returned without
+        copying it, and thus, callers must not modify the result in place.
+        Dense blocks are otherwise copied in a single pass into a
+        preallocated buffer.
         """
-        sparse = None
         if blocks[0].__class__.__name__ == "StorageNumpy":
             b0 = blocks[0]
             if len(b0.shape) > 2:
@@ -165,15 +394,18 @@ class Array(object):
                 return np.array(list(b0))
 
         b0 = blocks[0][0]
-        if sparse is None:
-            sparse = issparse(b0)
 
-        if sparse:
-            ret = sp.bmat(blocks, format=b0.getformat(), dtype=b0.dtype)
-        else:
-            ret = np.block(blocks)
+        if len(blocks) == 1 and len(blocks[0]) == 1:
+            return b0
+
+        if issparse(b0):
+            return sp.bmat(blocks, format=b0.getformat(), dtype=b0.dtype)
+
+        if not all(type(b) is np.ndarray and b.ndim == 2
+                   for row in blocks for b in row):
+            return np.block(blocks)
 
-        return ret
+        return _concat_blocks(blocks)
 
     @staticmethod
     def _get_out_blocks(n_blocks):
@@ -312,10 +544,14 @@ class Array(object):
         return Array(blocks=[[element]], top_left_shape=(1, 1),
                      reg_shape=(1, 1), shape=(1, 1), sparse=False)
 
-    def _get_slice(self, rows, cols):
+    def _get_slice(self, rows, cols, reader=None):
         """
          Returns a slice of the ds-array defined by the slices rows / cols.
          Only steps (as defined by slice.step) with value 1 can be used.
+
+         If reader is not None, it is called as reader(i, j, boundaries) to
+         obtain each block of the slice instead of filtering the block (i, j)
+         of the ds-array.
          """
         if (rows.step is not None and rows.step != 1) or \
                 (cols.step is not None and cols.step != 1):
@@ -387,8 +623,13 @@ class Array(object):
                     _, right = self._coords_in_block(i_n, j_n, r_stop, c_stop)
 
                 boundaries = (top, left, bot, right)
-                fb = _filter_block(block=self._blocks[i][j],
-                                   boundaries=boundaries)
+
+                if reader is not None:
+                    fb = reader(i, j, boundaries)
+                else:
+                    fb = _filter_block(block=self._blocks[i][j],
+                                       boundaries=boundaries)
+
                 out_blocks[out_i][out_j] = fb
 
         # Shape of the top left block
@@ -490,8 +731,8 @@ class Array(object):
                                          cols=adj_col_idxs[colblock_idx])
                 col_blocks.append((cols_in_block, col_block))
 
-        # now we need to merge the rowblocks until they have as much rows as
-        # self._reg_shape[0] (i.e. number of rows per block)
+        # now we need to merge the colblocks until they have as much cols as
+        # self._reg_shape[1] (i.e. number of cols per block)
         n_cols = 0
         to_merge = []
         final_blocks = []
@@ -501,16 +742,16 @@ class Array(object):
             to_merge.append(col)
             n_cols += cols_in_block
             # enough cols to merge into a col_block
-            if n_cols >= self._reg_shape[0]:
-                out_blocks = [object() for _ in range(self._n_blocks[1])]
+            if n_cols >= self._reg_shape[1]:
+                out_blocks = [object() for _ in range(self._n_blocks[0])]
                 _merge_cols([to_merge], out_blocks, self._reg_shape, skip)
                 final_blocks.append(out_blocks)
 
                 # if we didn't take all cols, we keep the last block and
                 # remember to skip the cols that have been merged
-                if n_cols > self._reg_shape[0]:
+                if n_cols > self._reg_shape[1]:
                     to_merge = [col]
-                    n_cols = n_cols - self._reg_shape[0]
+                    n_cols = n_cols - self._reg_shape[1]
                     skip = cols_in_block - n_cols
                 else:
                     to_merge = []
@@ -518,7 +759,7 @@ class Array(object):
                     skip = 0
 
         if n_cols > 0:
-            out_blocks = [object() for _ in range(self._n_blocks[1])]
+            out_blocks = [object() for _ in range(self._n_blocks[0])]
             _merge_cols([to_merge], out_blocks, self._reg_shape, skip)
             final_blocks.append(out_blocks)
 
@@ -529,6 +770,57 @@ class Array(object):
                      reg_shape=self._reg_shape,
                      shape=(self._shape[0], len(cols)), sparse=self._sparse)
 
+    def rechunk(self, block_size):
+        """
+        Returns a ds-array with the same contents as this one, divided in
+        blocks of the given size.
+
+        Each block of the output is created by a single task that takes the
+        parts of the input blocks that overlap with it. Input blocks that do
+        not change (i.e., that have the same boundaries in the output) are
+        reused without running any task.
+
+        Parameters
+        ----------
+        block_size : tuple (int, int) or 'balanced'
+            Size of the blocks of the output ds-array. If 'balanced', the
+            number of rows is evened out among the blocks (e.g., after
+            slicing or filtering rows), keeping the same number of blocks
+            along each axis and the same blocks of columns.
+
+        Returns
+        -------
+        dsarray : ds-array
+            A ds-array with the new block size.
+
+        Examples
+        --------
+        >>> import dislib as ds
+        >>> x = ds.random_array((1000, 100), block_size=(100, 100))
+        >>> x = x.rechunk((50, 50))
+        >>> print(x._reg_shape)
+        """
+        if isinstance(block_size, str) and block_size == 'balanced':
+            n_rows = ceil(self.shape[0] / self._n_blocks[0])
+            new_tl = (n_rows, self._top_left_shape[1])
+            new_reg = (n_rows, self._reg_shape[1])
+        elif len(block_size) == 2 and block_size[0] > 0 \
+                and block_size[1] > 0:
+            new_tl = new_reg = tuple(block_size)
+        else:
+            raise ValueError("Block size must be a tuple of two positive "
+                             "integers or 'balanced'.")
+
+        out_rows = _sizes_to_bounds(_regular_sizes(self.shape[0], new_tl[0],
+                                                   new_reg[0]))
+        out_cols = _sizes_to_bounds(_regular_sizes(self.shape[1], new_tl[1],
+                                                   new_reg[1]))
+        blocks = _reblock(self._blocks, _block_bounds(self, 0),
+                          _block_bounds(self, 1), out_rows, out_cols)
+
+        return Array(blocks=blocks, top_left_shape=new_tl, reg_shape=new_reg,
+                     shape=self.shape, sparse=self._sparse)
+
     def transpose(self, mode='rows'):
         """
         Returns the transpose of the ds-array following the method indicated by
@@ -582,65 +874,73 @@ class Array(object):
         return Array(blocks_t, top_left_shape=(bj0, bi0), reg_shape=(bm, bn),
                      shape=new_shape, sparse=self._sparse)
 
-    def min(self, axis=0):
+    def min(self, axis=0, arity=50):
         """
         Returns the minimum along the given axis.
 
         Parameters
         ----------
         axis : int, optional (default=0)
+        arity : int, optional (default=50)
+            Arity of the reduction of the partial results of each block.
 
         Returns
         -------
         min : ds-array
             Minimum along axis.
         """
-        return apply_along_axis(np.min, axis, self)
+        return _reduce_axis(self, "min", axis, arity)
 
-    def max(self, axis=0):
+    def max(self, axis=0, arity=50):
         """
         Returns the maximum along the given axis.
 
         Parameters
         ----------
         axis : int, optional (default=0)
+        arity : int, optional (default=50)
+            Arity of the reduction of the partial results of each block.
 
         Returns
         -------
         max : ds-array
             Maximum along axis.
         """
-        return apply_along_axis(np.max, axis, self)
+        return _reduce_axis(self, "max", axis, arity)
 
-    def sum(self, axis=0):
+    def sum(self, axis=0, arity=50):
         """
         Returns the sum along the given axis.
 
         Parameters
         ----------
         axis : int, optional (default=0)
+        arity : int, optional (default=50)
+            Arity of the reduction of the partial results of each block.
 
         Returns
         -------
         sum : ds-array
             Sum along axis.
         """
-        return apply_along_axis(np.sum, axis, self)
+        return _reduce_axis(self, "sum", axis, arity)
 
-    def mean(self, axis=0):
+    def mean(self, axis=0, arity=50):
         """
         Returns the mean along the given axis.
 
         Parameters
         ----------
         axis : int, optional (default=0)
+        arity : int, optional (default=50)
+            Arity of the reduction of the partial results of each block.
 
         Returns
         -------
         mean : ds-array
             Mean along axis.
         """
-        return apply_along_axis(np.mean, axis, self)
+        return _reduce_axis(self, "sum", axis, arity) / self.shape[axis]
 
     def collect(self):
         """
@@ -656,20 +956,155 @@ class Array(object):
         array : nd-array or spmatrix
             The actual contents of the ds-array.
         """
+        block_meta = self._block_meta
         self._blocks = compss_wait_on(self._blocks)
+        self._block_meta = block_meta
         res = self._merge_blocks(self._blocks)
+        if res is self._blocks[0][0]:
+            res = res.copy()
         if not self._sparse:
             res = np.squeeze(res)
         return res
 
-    def make_persistent(self, name):
+    def iter_collect(self, axis=0, prefetch=1):
+        """
+        Iterates over the contents of the ds-array one row (or column) of
+        blocks at a time. Unlike collect, this method does not keep the
+        retrieved blocks, and thus, the memory used in the driver is bounded
+        by the size of prefetch rows (or columns) of blocks.
+
+        Parameters
+        ----------
+        axis : int, optional (default=0)
+            If 0, yields rows of blocks. If 1, yields columns of blocks.
+        prefetch : int, optional (default=1)
+            Number of rows (or columns) of blocks that are retrieved at the
+            same time.
+
+        Yields
+        ------
+        array : nd-array or spmatrix
+            The contents of each row (or column) of blocks, in order.
+
+        Examples
+        --------
+        >>> import dislib as ds
+        >>> x = ds.random_array((1000, 10), block_size=(100, 10))
+        >>> for rows in x.iter_collect(prefetch=2):
+        >>>     print(rows.shape)
+        """
+        if axis != 0 and axis != 1:
+            raise ValueError("Axis must be 0 or 1.")
+
+        if prefetch < 1:
+            raise ValueError("Prefetch must be greater than 0.")
+
+        pending = []
+
+        for stripe in self._iterator(axis=axis):
+            pending.append(stripe._blocks)
+
+            if len(pending) == prefetch:
+                yield from self._yield_merged(pending)
+                pending = []
+
+        if pending:
+            yield from self._yield_merged(pending)
+
+    def _yield_merged(self, stripes):
+        # blocks are released as soon as they have been yielded
+        fetched = deque(compss_wait_on(stripes))
+
+        while fetched:
+            yield self._merge_blocks(fetched.popleft())
+
+    def save(self, path, compression=None):
+        """
+        Saves the ds-array to a directory, with a file per block and a
+        metadata file. Blocks are written in parallel by the workers, and
+        thus, the directory must be accessible from all of them (e.g., in a
+        shared file system). Saved ds-arrays can be loaded with
+        :meth:`dislib.load <dislib.load>`.
+
+        Dense blocks are stored in NumPy's .npy format, and sparse blocks as
+        the components of a CSR matrix in NumPy's .npz format. The metadata
+        file is written after all the blocks, and this method waits for
+        them to finish.
+
+        Parameters
+        ----------
+        path : str
+            Path of the output directory. It is created if it does not exist.
+        compression : str or None, optional (default=None)
+            Codec used to compress the blocks. Can be 'zlib', 'bz2', 'lzma',
+            or 'lz4' (if the lz4 package is installed). If None, blocks are
+            not compressed.
+        """
+        if compression is not None and compression not in _CODECS:
+            raise ValueError("Unknown compression '%s'. Options are: %s" %
+                             (compression, list(_CODECS)))
+
+        os.makedirs(path, exist_ok=True)
+
+        dtypes = []
+
+        for i, row in enumerate(self._blocks):
+            for j, block in enumerate(row):
+                file = os.path.join(path, _block_file_name(
+                    i, j, self._sparse, compression))
+                dtypes.append(_save_block(block, file, compression))
+
+        dtypes = compss_wait_on(dtypes)
+
+        metadata = {"shape": [int(d) for d in self.shape],
+                    "top_left_shape": [int(d) for d in self._top_left_shape],
+                    "reg_shape": [int(d) for d in self._reg_shape],
+                    "n_blocks": self._n_blocks,
+                    "sparse": bool(self._sparse),
+                    "dtype": np.result_type(*dtypes).str,
+                    "compression": compression}
+
+        with open(os.path.join(path, _METADATA_FILE), "w") as f:
+            json.dump(metadata, f)
+
+    def remove_scratch(self):
+        """
+        Removes the file written to the scratch directory when creating
+        this ds-array with :meth:`dislib.array <dislib.array>`, if any.
+        Waits for all the submitted tasks to finish first, as they may
+        still read the file (also to compute other ds-arrays derived from
+        this one).
         """
-        Stores data in Hecuba.
+        path = getattr(self, "_scratch_path", None)
+
+        if path is None:
+            return
+
+        compss_barrier()
+
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+        self._scratch_path = None
+
+    def make_persistent(self, name, storage="hecuba"):
+        """
+        Stores the ds-array in a persistent storage. Persistent ds-arrays
+        can be loaded with :meth:`dislib.load_from_storage
+        <dislib.load_from_storage>`, and slicing them reads only the
+        required data from the storage.
 
         Parameters
         ----------
         name : str
-            Name of the data.
+            Name of the data. With the 'filesystem' storage, this is the path
+            of the output directory.
+        storage : str or StorageBackend, optional (default='hecuba')
+            Storage backend. Can be 'hecuba', 'filesystem', or an instance of
+            a :class:`StorageBackend <dislib.data.array.StorageBackend>`
+            subclass.
 
         Returns
         -------
@@ -677,26 +1112,14 @@ class Array(object):
             A distributed and persistent representation of the data
             divided in blocks.
         """
-        if self._sparse:
-            raise Exception("Data must not be a sparse matrix.")
-
-        x = self.collect()
-        persistent_data = StorageNumpy(input_array=x, name=name)
-        # self._base_array is used for much more efficient slicing.
-        # It does not take up more space since it is a reference to the db.
-        self._base_array = persistent_data
-
-        blocks = []
-        for block in self._blocks:
-            persistent_block = StorageNumpy(input_array=block, name=name,
-                                            storage_id=uuid.uuid4())
-            blocks.append(persistent_block)
-        self._blocks = blocks
+        storage = _get_storage(storage)
+        storage.persist(self, name)
+        self._storage = (storage, name)
 
         return self
 
 
-def array(x, block_size):
+def array(x, block_size, scratch=None):
     """
     Loads data into a Distributed Array.
 
@@ -706,12 +1129,25 @@ def array(x, block_size):
         Array of samples.
     block_size : (int, int)
         Block sizes in number of samples.
+    scratch : str, optional (default=None)
+        Directory accessible from all the workers (e.g., in a shared file
+        system, or /dev/shm to use shared memory in a single node). If
+        given, x is written once to a file in this directory, and each block
+        is read by a different task that maps the file into memory, instead
+        of sending every block from the driver. Memory-mapped .npy files
+        (i.e., loaded with np.load and mmap_mode) are read in place without
+        writing them again. Files written to scratch are removed with
+        :meth:`Array.remove_scratch <dislib.data.array.Array.remove_scratch>`
+        once the ds-array is no longer needed.
 
     Returns
     -------
     dsarray : ds-array
         A distributed representation of the data divided in blocks.
     """
+    if scratch is not None:
+        return _array_from_scratch(x, block_size, scratch)
+
     bn, bm = block_size
 
     sparse = issparse(x)
@@ -733,6 +1169,175 @@ def array(x, block_size):
     arr = Array(blocks=blocks, top_left_shape=block_size,
                 reg_shape=block_size, shape=x.shape, sparse=sparse)
 
+    # blocks are in the driver, so their metadata is already known
+    arr._block_meta = [[_block_meta(block) for block in row]
+                       for row in blocks]
+
+    return arr
+
+
+def _array_from_scratch(x, block_size, scratch):
+    sparse = issparse(x)
+
+    if sparse:
+        x, path = csr_matrix(x), None
+    else:
+        x, path = np.asarray(x), _mapped_npy_file(x)
+
+    if len(x.shape) < 2:
+        raise ValueError("Input array must have two dimensions.")
+
+    # mapped files are not written, and thus, not removed either
+    written = None
+
+    if sparse:
+        path = written = os.path.join(scratch, "%s.csr" % uuid.uuid4().hex)
+        os.makedirs(path)
+
+        for attr in ("data", "indices", "indptr"):
+            np.save(os.path.join(path, attr + ".npy"), getattr(x, attr))
+    elif path is None:
+        path = written = os.path.join(scratch, "%s.npy" % uuid.uuid4().hex)
+        np.save(path, x)
+
+    shape = x.shape
+    bn, bm = block_size
+    blocks = []
+
+    for i in range(0, shape[0], bn):
+        if sparse:
+            row = [_read_csr_block(path, shape, i, i + bn, j, j + bm)
+                   for j in range(0, shape[1], bm)]
+        else:
+            row = [_read_npy_block(path, i, i + bn, j, j + bm)
+                   for j in range(0, shape[1], bm)]
+        blocks.append(row)
+
+    arr = Array(blocks=blocks, top_left_shape=block_size,
+                reg_shape=block_size, shape=shape, sparse=sparse)
+    arr._scratch_path = written
+
+    if not sparse:
+        arr._set_dense_meta(x.dtype)
+
+    return arr
+
+
+def _mapped_npy_file(x):
+    """ Returns the path of the .npy file x is a memory map of, or None if
+    x does not map a whole .npy file. """
+    path = getattr(x, "filename", None)
+
+    if not isinstance(x, np.memmap) or path is None:
+        return None
+
+    try:
+        mapped = np.load(path, mmap_mode="r", allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+
+    if (mapped.shape != x.shape or mapped.dtype != x.dtype or
+            mapped.offset != x.offset or mapped.strides != x.strides):
+        return None
+
+    return path
+
+
+def load(path):
+    """ Loads a ds-array saved with :meth:`Array.save
+    <dislib.data.array.Array.save>`.
+
+    Only the metadata file is read in the driver. Each block is read by a
+    different task, and thus, the directory must be accessible from all the
+    workers (e.g., in a shared file system).
+
+    Parameters
+    ----------
+    path : str
+        Path of the directory containing the ds-array.
+
+    Returns
+    -------
+    x : ds-array
+        The loaded ds-array, with the same blocks as the saved one.
+    """
+    with open(os.path.join(path, _METADATA_FILE), "r") as f:
+        metadata = json.load(f)
+
+    sparse = metadata["sparse"]
+    compression = metadata["compression"]
+    n_blocks = metadata["n_blocks"]
+    blocks = []
+    block_meta = []
+
+    for i in range(n_blocks[0]):
+        blocks.append([])
+        block_meta.append([])
+
+        for j in range(n_blocks[1]):
+            file = os.path.join(path, _block_file_name(i, j, sparse,
+                                                       compression))
+            block, meta = _load_block(file, sparse, compression)
+            blocks[-1].append(block)
+            block_meta[-1].append(meta)
+
+    arr = Array(blocks, top_left_shape=tuple(metadata["top_left_shape"]),
+                reg_shape=tuple(metadata["reg_shape"]),
+                shape=tuple(metadata["shape"]), sparse=sparse)
+    arr._block_meta = block_meta
+    return arr
+
+
+def _block_file_name(i, j, sparse, compression):
+    name = "block-%d-%d.%s" % (i, j, "npz" if sparse else "npy")
+
+    if compression is not None:
+        name += "." + compression
+
+    return name
+
+
+def load_npy_file(path, block_size):
+    """ Loads a file in NumPy's .npy binary format into a ds-array.
+
+    Only the header of the file is read in the driver. Each block is read
+    by a different task that maps the file into memory and takes its part
+    of the data. Thus, the file must be accessible from all the workers
+    (e.g., in a shared file system).
+
+    Parameters
+    ----------
+    path : string
+        File path.
+    block_size : tuple (int, int)
+        Size of the blocks of the output ds-array.
+
+    Returns
+    -------
+    x : ds-array
+        A distributed representation of the data divided in blocks.
+    """
+    try:
+        header = np.load(path, mmap_mode="r", allow_pickle=False)
+    except ValueError:
+        raise ValueError("Invalid file format.")
+
+    shape, dtype = header.shape, header.dtype
+
+    if len(shape) != 2:
+        raise ValueError("Input array must have two dimensions.")
+
+    bn, bm = block_size
+    blocks = []
+
+    for i in range(0, shape[0], bn):
+        row = [_read_npy_block(path, i, i + bn, j, j + bm)
+               for j in range(0, shape[1], bm)]
+        blocks.append(row)
+
+    arr = Array(blocks=blocks, top_left_shape=block_size,
+                reg_shape=block_size, shape=shape, sparse=False)
+    arr._set_dense_meta(dtype)
     return arr
 
 
@@ -753,69 +1358,484 @@ def load_from_hecuba(name, block_size):
         A distributed and persistent representation of the data
         divided in blocks.
     """
-    persistent_data = StorageNumpy(name=name)
-
-    bn, bm = block_size
-
-    blocks = []
-    for block in persistent_data.np_split(block_size=(bn, bm)):
-        blocks.append([block])
-
-    arr = Array(blocks=blocks, top_left_shape=block_size,
-                reg_shape=block_size, shape=persistent_data.shape,
-                sparse=False)
-    arr._base_array = persistent_data
-    return arr
+    return load_from_storage(name, storage="hecuba", block_size=block_size)
 
 
-def random_array(shape, block_size, random_state=None):
+def load_from_storage(name, storage="hecuba", block_size=None):
     """
-    Returns a distributed array of random floats in the open interval [0.0,
-    1.0). Values are from the "continuous uniform" distribution over the
-    stated interval.
+    Loads a ds-array stored with :meth:`Array.make_persistent
+    <dislib.data.array.Array.make_persistent>`.
 
     Parameters
     ----------
-    shape : tuple of two ints
-        Shape of the output ds-array.
-    block_size : tuple of two ints
-        Size of the ds-array blocks.
-    random_state : int or RandomState, optional (default=None)
-        Seed or numpy.random.RandomState instance to generate the random
-        numbers.
+    name : str
+        Name of the data. With the 'filesystem' storage, this is the path
+        of the directory containing the ds-array.
+    storage : str or StorageBackend, optional (default='hecuba')
+        Storage backend. Can be 'hecuba', 'filesystem', or an instance of
+        a :class:`StorageBackend <dislib.data.array.StorageBackend>`
+        subclass.
+    block_size : (int, int), optional (default=None)
+        Block sizes in number of samples. Required by the 'hecuba' storage.
+        The 'filesystem' storage keeps the blocks of the stored ds-array if
+        block_size is None. Otherwise, the stored blocks are rechunked, and
+        the returned ds-array is not persistent.
 
     Returns
     -------
     dsarray : ds-array
-        Distributed array of random floats.
+        A distributed and persistent representation of the data
+        divided in blocks.
     """
-    if shape[0] < block_size[0] or shape[1] < block_size[1]:
-        raise ValueError("Block size is greater than the array")
+    storage = _get_storage(storage)
+    arr = storage.load(name, block_size)
+    arr._storage = (storage, name)
 
-    r_state = check_random_state(random_state)
+    if block_size is not None and tuple(block_size) != arr._reg_shape:
+        # the rechunked blocks do not match the stored ones, and thus, the
+        # rechunked ds-array is not persistent
+        return arr.rechunk(block_size)
 
-    n_blocks = (int(np.ceil(shape[0] / block_size[0])),
-                int(np.ceil(shape[1] / block_size[1])))
+    return arr
 
-    blocks = list()
 
-    for row_idx in range(n_blocks[0]):
-        blocks.append(list())
+class StorageBackend(object):
+    """ Base class of the storage backends of persistent ds-arrays.
 
-        for col_idx in range(n_blocks[1]):
-            b_size0, b_size1 = block_size
+    Backends are used by :meth:`Array.make_persistent
+    <dislib.data.array.Array.make_persistent>` and
+    :meth:`dislib.load_from_storage <dislib.load_from_storage>`. Subclasses
+    must implement persist and load, and can implement getitem to index
+    persistent ds-arrays more efficiently.
+    """
 
-            if row_idx == n_blocks[0] - 1:
-                b_size0 = shape[0] - (n_blocks[0] - 1) * block_size[0]
+    def persist(self, x, name):
+        """ Stores the ds-array x with the given name. The blocks of x can
+        be replaced with persistent ones. """
+        raise NotImplementedError()
 
-            if col_idx == n_blocks[1] - 1:
-                b_size1 = shape[1] - (n_blocks[1] - 1) * block_size[1]
+    def load(self, name, block_size):
+        """ Returns a ds-array with the data stored with the given name.
+        Backends can use block_size (which can be None) to choose the
+        blocks of the ds-array, or keep the stored ones, in which case the
+        ds-array is rechunked by :meth:`dislib.load_from_storage
+        <dislib.load_from_storage>`. """
+        raise NotImplementedError()
 
-            seed = r_state.randint(np.iinfo(np.int32).max)
-            blocks[-1].append(_random_block((b_size0, b_size1), seed))
+    def getitem(self, x, name, arg):
+        """ Returns x[arg] reading the data stored with the given name, or
+        None to use the regular indexing of ds-arrays. """
+        return None
 
-    return Array(blocks, top_left_shape=block_size, reg_shape=block_size,
-                 shape=shape, sparse=False)
+
+class HecubaStorage(StorageBackend):
+    """ Stores dense ds-arrays in Hecuba as StorageNumpy objects.
+
+    Storing a ds-array collects it in the master, and indexing a
+    persistent ds-array loads the selected elements from Hecuba.
+    """
+
+    def persist(self, x, name):
+        if x._sparse:
+            raise Exception("Data must not be a sparse matrix.")
+
+        data = x.collect()
+        persistent_data = StorageNumpy(input_array=data, name=name)
+        # x._base_array is used for much more efficient slicing.
+        # It does not take up more space since it is a reference to the db.
+        x._base_array = persistent_data
+
+        blocks = []
+        for block in x._blocks:
+            persistent_block = StorageNumpy(input_array=block, name=name,
+                                            storage_id=uuid.uuid4())
+            blocks.append(persistent_block)
+        x._blocks = blocks
+
+    def load(self, name, block_size):
+        if block_size is None:
+            raise ValueError("block_size is required to load from Hecuba.")
+
+        persistent_data = StorageNumpy(name=name)
+
+        bn, bm = block_size
+
+        blocks = []
+        for block in persistent_data.np_split(block_size=(bn, bm)):
+            blocks.append([block])
+
+        arr = Array(blocks=blocks, top_left_shape=block_size,
+                    reg_shape=block_size, shape=persistent_data.shape,
+                    sparse=False)
+        arr._base_array = persistent_data
+        return arr
+
+    def getitem(self, x, name, arg):
+        return array(x=list(x._base_array[arg]), block_size=x._reg_shape)
+
+
+class FileSystemStorage(StorageBackend):
+    """ Stores ds-arrays in a directory, in the format of :meth:`Array.save
+    <dislib.data.array.Array.save>`.
+
+    Each block is written and read by a different task, and thus, the
+    directory must be accessible from all the workers (e.g., in a shared
+    file system). Dense and sparse ds-arrays are supported. Slices of
+    uncompressed dense ds-arrays are read directly from the block files,
+    loading only the rows and columns selected.
+
+    Parameters
+    ----------
+    root : str, optional (default=None)
+        Directory where ds-arrays are stored. If None, names are used as
+        paths.
+    compression : str or None, optional (default=None)
+        Codec used to compress the blocks (see :meth:`Array.save
+        <dislib.data.array.Array.save>`).
+    """
+
+    def __init__(self, root=None, compression=None):
+        self.root = root
+        self.compression = compression
+
+    def persist(self, x, name):
+        x.save(self._path(name), compression=self.compression)
+
+    def load(self, name, block_size):
+        return load(self._path(name))
+
+    def getitem(self, x, name, arg):
+        if isinstance(arg, slice):
+            arg = (arg, slice(None, None))
+
+        if not isinstance(arg, tuple) or len(arg) != 2 or \
+                not all(isinstance(s, slice) for s in arg):
+            return None
+
+        path = self._path(name)
+
+        with open(os.path.join(path, _METADATA_FILE), "r") as f:
+            metadata = json.load(f)
+
+        # only uncompressed .npy files can be memory mapped, and only if
+        # the blocks of x are the stored ones
+        if metadata["sparse"] or metadata["compression"] is not None or \
+                tuple(metadata["shape"]) != x.shape or \
+                tuple(metadata["top_left_shape"]) != x._top_left_shape or \
+                tuple(metadata["reg_shape"]) != x._reg_shape:
+            return None
+
+        def reader(i, j, boundaries):
+            top, left, bot, right = boundaries
+            file = os.path.join(path, _block_file_name(i, j, False, None))
+            return _read_npy_block(file, top, bot, left, right)
+
+        return x._get_slice(arg[0], arg[1], reader=reader)
+
+    def _path(self, name):
+        if self.root is None:
+            return name
+
+        return os.path.join(self.root, name)
+
+
+# Storage backends that can be selected by name
+_STORAGES = {"hecuba": HecubaStorage, "filesystem": FileSystemStorage}
+
+
+def _get_storage(storage):
+    if isinstance(storage, StorageBackend):
+        return storage
+
+    if storage not in _STORAGES:
+        raise ValueError("Unknown storage '%s'. Options are: %s" %
+                         (storage, list(_STORAGES)))
+
+    return _STORAGES[storage]()
+
+
+def random_array(shape, block_size, random_state=None):
+    """
+    Returns a distributed array of random floats in the open interval [0.0,
+    1.0). Values are from the "continuous uniform" distribution over the
+    stated interval.
+
+    Parameters
+    ----------
+    shape : tuple of two ints
+        Shape of the output ds-array.
+    block_size : tuple of two ints
+        Size of the ds-array blocks.
+    random_state : int or RandomState, optional (default=None)
+        Seed or numpy.random.RandomState instance to generate the random
+        numbers.
+
+    Returns
+    -------
+    dsarray : ds-array
+        Distributed array of random floats.
+    """
+    if shape[0] < block_size[0] or shape[1] < block_size[1]:
+        raise ValueError("Block size is greater than the array")
+
+    r_state = check_random_state(random_state)
+
+    n_blocks = (int(np.ceil(shape[0] / block_size[0])),
+                int(np.ceil(shape[1] / block_size[1])))
+
+    blocks = list()
+
+    for row_idx in range(n_blocks[0]):
+        blocks.append(list())
+
+        for col_idx in range(n_blocks[1]):
+            b_size0, b_size1 = block_size
+
+            if row_idx == n_blocks[0] - 1:
+                b_size0 = shape[0] - (n_blocks[0] - 1) * block_size[0]
+
+            if col_idx == n_blocks[1] - 1:
+                b_size1 = shape[1] - (n_blocks[1] - 1) * block_size[1]
+
+            seed = r_state.randint(np.iinfo(np.int32).max)
+            blocks[-1].append(_random_block((b_size0, b_size1), seed))
+
+    arr = Array(blocks, top_left_shape=block_size, reg_shape=block_size,
+                shape=shape, sparse=False)
+    arr._set_dense_meta(np.float64)
+    return arr
+
+
+def zeros(shape, block_size, dtype=float):
+    """ Returns a ds-array of given shape and block size, filled with zeros.
+
+    Parameters
+    ----------
+    shape : tuple of two ints
+        Shape of the output ds-array.
+    block_size : tuple of two ints
+        Size of the ds-array blocks.
+    dtype : data type, optional (default=float)
+        Data type of the output ds-array.
+
+    Returns
+    -------
+    dsarray : ds-array
+        Distributed array filled with zeros.
+    """
+    return full(shape, block_size, 0, dtype)
+
+
+def ones(shape, block_size, dtype=float):
+    """ Returns a ds-array of given shape and block size, filled with ones.
+
+    Parameters
+    ----------
+    shape : tuple of two ints
+        Shape of the output ds-array.
+    block_size : tuple of two ints
+        Size of the ds-array blocks.
+    dtype : data type, optional (default=float)
+        Data type of the output ds-array.
+
+    Returns
+    -------
+    dsarray : ds-array
+        Distributed array filled with ones.
+    """
+    return full(shape, block_size, 1, dtype)
+
+
+def full(shape, block_size, fill_value, dtype=None):
+    """ Returns a ds-array of given shape and block size, filled with
+    fill_value. Each block is created by a different task.
+
+    Parameters
+    ----------
+    shape : tuple of two ints
+        Shape of the output ds-array.
+    block_size : tuple of two ints
+        Size of the ds-array blocks.
+    fill_value : scalar
+        Fill value.
+    dtype : data type, optional (default=None)
+        Data type of the output ds-array. If None, the data type of
+        np.array(fill_value) is used.
+
+    Returns
+    -------
+    dsarray : ds-array
+        Distributed array filled with fill_value.
+    """
+    dtype = np.array(fill_value, dtype=dtype).dtype
+    row_sizes, col_sizes = _grid_sizes(shape, block_size)
+    blocks = [[_full_block((bn, bm), fill_value, dtype)
+               for bm in col_sizes]
+              for bn in row_sizes]
+
+    arr = Array(blocks, top_left_shape=block_size, reg_shape=block_size,
+                shape=shape, sparse=False)
+    arr._set_dense_meta(dtype)
+    return arr
+
+
+def eye(n, block_size, m=None, k=0, dtype=float):
+    """ Returns a 2-dimensional ds-array with ones on the k-th diagonal and
+    zeros elsewhere. Blocks are sparse (CSR) matrices.
+
+    Parameters
+    ----------
+    n : int
+        Number of rows of the output ds-array.
+    block_size : tuple of two ints
+        Size of the ds-array blocks.
+    m : int, optional (default=None)
+        Number of columns of the output ds-array. If None, defaults to n.
+    k : int, optional (default=0)
+        Index of the diagonal: 0 refers to the main diagonal, a positive
+        value refers to an upper diagonal, and a negative value to a lower
+        diagonal.
+    dtype : data type, optional (default=float)
+        Data type of the output ds-array.
+
+    Returns
+    -------
+    dsarray : ds-array
+        Sparse ds-array where all elements are equal to zero, except for
+        the k-th diagonal, whose values are equal to one.
+    """
+    shape = (n, n if m is None else m)
+    row_sizes, col_sizes = _grid_sizes(shape, block_size)
+    bn, bm = block_size
+    blocks = []
+
+    for i, rows in enumerate(row_sizes):
+        blocks.append([])
+
+        for j, cols in enumerate(col_sizes):
+            # offset of the diagonal relative to the top left of the block
+            offset = k - j * bm + i * bn
+
+            if -rows < offset < cols:
+                block = _eye_block((rows, cols), offset, dtype)
+            else:
+                block = _empty_sparse_block((rows, cols), dtype)
+
+            blocks[-1].append(block)
+
+    return Array(blocks, top_left_shape=block_size, reg_shape=block_size,
+                 shape=shape, sparse=True)
+
+
+def identity(n, block_size, dtype=float):
+    """ Returns the identity ds-array, a square ds-array with ones on the
+    main diagonal. Blocks are sparse (CSR) matrices.
+
+    Parameters
+    ----------
+    n : int
+        Number of rows and columns of the output ds-array.
+    block_size : tuple of two ints
+        Size of the ds-array blocks.
+    dtype : data type, optional (default=float)
+        Data type of the output ds-array.
+
+    Returns
+    -------
+    dsarray : ds-array
+        Identity ds-array of shape (n, n).
+    """
+    return eye(n, block_size, dtype=dtype)
+
+
+def random_normal(shape, block_size, loc=0.0, scale=1.0, random_state=None):
+    """ Returns a ds-array of random samples from a normal (Gaussian)
+    distribution. Each block is generated by a different task from its own
+    seed.
+
+    Parameters
+    ----------
+    shape : tuple of two ints
+        Shape of the output ds-array.
+    block_size : tuple of two ints
+        Size of the ds-array blocks.
+    loc : float, optional (default=0.0)
+        Mean of the distribution.
+    scale : float, optional (default=1.0)
+        Standard deviation of the distribution.
+    random_state : int or RandomState, optional (default=None)
+        Seed or numpy.random.RandomState instance to generate the random
+        numbers.
+
+    Returns
+    -------
+    dsarray : ds-array
+        Distributed array of random samples.
+    """
+    row_sizes, col_sizes = _grid_sizes(shape, block_size)
+    r_state = check_random_state(random_state)
+    blocks = [[_random_normal_block((bn, bm), loc, scale,
+                                    r_state.randint(np.iinfo(np.int32).max))
+               for bm in col_sizes]
+              for bn in row_sizes]
+
+    arr = Array(blocks, top_left_shape=block_size, reg_shape=block_size,
+                shape=shape, sparse=False)
+    arr._set_dense_meta(np.float64)
+    return arr
+
+
+def random_sparse(shape, block_size, density=0.01, random_state=None):
+    """ Returns a sparse ds-array with uniformly distributed random values
+    in [0.0, 1.0). Each block is generated by a different task from its own
+    seed, and contains (approximately) density times its number of elements
+    non-zero values.
+
+    Parameters
+    ----------
+    shape : tuple of two ints
+        Shape of the output ds-array.
+    block_size : tuple of two ints
+        Size of the ds-array blocks.
+    density : float, optional (default=0.01)
+        Density of the ds-array, in the range [0, 1].
+    random_state : int or RandomState, optional (default=None)
+        Seed or numpy.random.RandomState instance to generate the random
+        numbers.
+
+    Returns
+    -------
+    dsarray : ds-array
+        Sparse distributed array with CSR blocks.
+    """
+    if not 0 <= density <= 1:
+        raise ValueError("Density must be in the range [0, 1].")
+
+    row_sizes, col_sizes = _grid_sizes(shape, block_size)
+    r_state = check_random_state(random_state)
+    blocks = [[_random_sparse_block((bn, bm), density,
+                                    r_state.randint(np.iinfo(np.int32).max))
+               for bm in col_sizes]
+              for bn in row_sizes]
+
+    arr = Array([[block for block, _ in row] for row in blocks],
+                top_left_shape=block_size, reg_shape=block_size,
+                shape=shape, sparse=True)
+    arr._block_meta = [[meta for _, meta in row] for row in blocks]
+    return arr
+
+
+def _grid_sizes(shape, block_size):
+    """ Returns the number of rows of each row of blocks, and the number of
+    columns of each column of blocks, of a regular ds-array. """
+    if len(shape) != 2 or shape[0] <= 0 or shape[1] <= 0:
+        raise ValueError("Shape must be two positive integers.")
+
+    if len(block_size) != 2 or block_size[0] <= 0 or block_size[1] <= 0:
+        raise ValueError("Block size must be two positive integers.")
+
+    return (_regular_sizes(shape[0], block_size[0], block_size[0]),
+            _regular_sizes(shape[1], block_size[1], block_size[1]))
 
 
 def apply_along_axis(func, axis, x, *args, **kwargs):
@@ -884,11 +1904,1284 @@ def apply_along_axis(func, axis, x, *args, **kwargs):
         out_bshape = (bshape[0], 1)
         out_shape = (shape[0], 1)
 
-    return Array(blocks, top_left_shape=out_tlbshape, reg_shape=out_bshape,
-                 shape=out_shape, sparse=False)
+    return Array(blocks, top_left_shape=out_tlbshape, reg_shape=out_bshape,
+                 shape=out_shape, sparse=False)
+
+
+def _reduce_axis(x, method, axis, arity):
+    """
+    Reduces x along the given axis using method ('min', 'max' or 'sum').
+    Each block is reduced independently, and the partial results of each
+    row / column of blocks are merged in a tree of the given arity. This way,
+    tasks never need more than a block of x in memory.
+    """
+    if axis != 0 and axis != 1:
+        raise ValueError("Axis must be 0 or 1.")
+
+    if arity < 2:
+        raise ValueError("Arity must be greater than 1.")
+
+    blocks = x._blocks if axis == 0 else _transpose_grid(x._blocks)
+    out_blocks = []
+
+    for j in range(len(blocks[0])):
+        partials = [_block_reduce(blocks[i][j], method, axis)
+                    for i in range(len(blocks))]
+
+        while len(partials) > 1:
+            partials_subset = partials[:arity]
+            partials = partials[arity:]
+            partials.append(_merge_reduce(method, axis, *partials_subset))
+
+        out_blocks.append(partials[0])
+
+    tlshape = x._top_left_shape
+    bshape = x._reg_shape
+    shape = x.shape
+
+    if axis == 0:
+        blocks = [out_blocks]
+        out_tlbshape = (1, tlshape[1])
+        out_bshape = (1, bshape[1])
+        out_shape = (1, shape[1])
+    else:
+        blocks = [[block] for block in out_blocks]
+        out_tlbshape = (tlshape[0], 1)
+        out_bshape = (bshape[0], 1)
+        out_shape = (shape[0], 1)
+
+    return Array(blocks, top_left_shape=out_tlbshape, reg_shape=out_bshape,
+                 shape=out_shape, sparse=False)
+
+
+def matmul(a, b, transpose_a=False, transpose_b=False, arity=50):
+    """ Matrix product of two ds-arrays.
+
+    The product is computed block by block: each block of the result is the
+    sum of the products of a row of blocks of a and a column of blocks of b,
+    which is reduced in a tree of the given arity. Transposes are applied
+    to the individual blocks inside the tasks, and thus, expressions like
+    ``matmul(x, x, transpose_a=True)`` do not create a transposed copy of x.
+
+    Parameters
+    ----------
+    a : ds-array
+        First operand.
+    b : ds-array
+        Second operand.
+    transpose_a : boolean, optional (default=False)
+        Whether to multiply by the transpose of a.
+    transpose_b : boolean, optional (default=False)
+        Whether to multiply by the transpose of b.
+    arity : int, optional (default=50)
+        Maximum number of block products reduced by each task.
+
+    Returns
+    -------
+    out : ds-array
+        The matrix product of a and b. The output is sparse if both a and b
+        are sparse.
+
+    Raises
+    ------
+    ValueError
+        If the inner dimensions of a and b, or their blocks, do not match.
+
+    Examples
+    --------
+    >>> import dislib as ds
+    >>> x = ds.random_array((100, 10), block_size=(25, 5))
+    >>> gram = ds.matmul(x, x, transpose_a=True)
+    >>> print(gram.collect())
+    """
+    if arity < 2:
+        raise ValueError("Arity must be greater than 1.")
+
+    # axes of a and b that form the rows / columns of the result
+    a_axis = 1 if transpose_a else 0
+    b_axis = 0 if transpose_b else 1
+
+    if a.shape[1 - a_axis] != b.shape[1 - b_axis]:
+        raise ValueError("Cannot multiply ds-arrays of shapes %s and %s "
+                         "(transpose_a=%s, transpose_b=%s)." %
+                         (a.shape, b.shape, transpose_a, transpose_b))
+
+    if a._block_sizes(1 - a_axis) != b._block_sizes(1 - b_axis):
+        raise ValueError("The blocks of the inner dimension of the operands "
+                         "do not match.")
+
+    a_blocks = a._blocks if not transpose_a else _transpose_grid(a._blocks)
+    b_blocks = b._blocks if not transpose_b else _transpose_grid(b._blocks)
+    n_inner = len(a_blocks[0])
+
+    blocks = []
+
+    for a_row in a_blocks:
+        blocks.append([])
+
+        for j in range(len(b_blocks[0])):
+            partials = []
+
+            for k in range(0, n_inner, arity):
+                b_col = [b_blocks[k2][j] for k2 in
+                         range(k, min(k + arity, n_inner))]
+                partials.append(_multiply_add(a_row[k:k + arity], b_col,
+                                              transpose_a, transpose_b))
+
+            while len(partials) > 1:
+                partials_subset = partials[:arity]
+                partials = partials[arity:]
+                partials.append(_sum_blocks(*partials_subset))
+
+            blocks[-1].append(partials[0])
+
+    top_left_shape = (a._top_left_shape[a_axis], b._top_left_shape[b_axis])
+    reg_shape = (a._reg_shape[a_axis], b._reg_shape[b_axis])
+    shape = (a.shape[a_axis], b.shape[b_axis])
+
+    return Array(blocks, top_left_shape=top_left_shape, reg_shape=reg_shape,
+                 shape=shape, sparse=a._sparse and b._sparse)
+
+
+def concatenate(arrays, axis=0, block_size=None):
+    """ Joins a sequence of ds-arrays along an existing axis.
+
+    If the blocks of the ds-arrays line up (i.e., the ds-arrays have the
+    same blocks along the other axis, and the stacked blocks form a valid
+    ds-array), the output ds-array reuses the blocks of the input ones, and
+    no task is run. Otherwise, only the blocks that do not line up are
+    re-blocked, following the blocks of the first ds-array.
+
+    Parameters
+    ----------
+    arrays : sequence of ds-arrays
+        The ds-arrays must have the same number of rows (columns) if axis
+        is 1 (0), and all of them must be either dense or sparse.
+    axis : int, optional (default=0)
+        The axis along which the ds-arrays are joined.
+    block_size : tuple of two ints, optional (default=None)
+        If given, the output ds-array is divided in regular blocks of this
+        size.
+
+    Returns
+    -------
+    dsarray : ds-array
+        The concatenated ds-array.
+
+    Examples
+    --------
+    >>> import dislib as ds
+    >>> x = ds.random_array((100, 10), block_size=(20, 10))
+    >>> y = ds.random_array((40, 10), block_size=(20, 10))
+    >>> z = ds.concatenate([x, y])
+    >>> print(z.shape)
+    """
+    arrays = list(arrays)
+
+    if len(arrays) == 0:
+        raise ValueError("Need at least one ds-array to concatenate.")
+
+    if axis not in (0, 1):
+        raise ValueError("Axis must be 0 or 1.")
+
+    other = 1 - axis
+    first = arrays[0]
+
+    if any(x.shape[other] != first.shape[other] for x in arrays):
+        raise ValueError("All ds-arrays must have the same size along axis "
+                         "%d." % other)
+
+    if any(x._sparse != first._sparse for x in arrays):
+        raise ValueError("Cannot concatenate dense and sparse ds-arrays.")
+
+    across = _block_bounds(first, other)
+    along = []
+    grid = []
+
+    for x in arrays:
+        x_along = _block_bounds(x, axis)
+        x_grid = x._blocks if axis == 0 else _transpose_grid(x._blocks)
+
+        # blocks along the other axis need to match the first ds-array's
+        if _block_bounds(x, other) != across:
+            x_across = _block_bounds(x, other)
+
+            if axis == 0:
+                x_grid = _reblock(x_grid, x_along, x_across, x_along, across)
+            else:
+                x_grid = _transpose_grid(
+                    _reblock(x._blocks, x_across, x_along, across, x_along))
+
+        offset = along[-1][1] if along else 0
+        along.extend((start + offset, end + offset) for start, end in x_along)
+        grid.extend(x_grid)
+
+    shape = [0, 0]
+    shape[axis] = along[-1][1]
+    shape[other] = first.shape[other]
+    tl_shape = list(first._top_left_shape)
+    reg_shape = list(first._reg_shape)
+    sizes = [end - start for start, end in along]
+
+    if block_size is not None:
+        tl_shape = reg_shape = list(block_size)
+    elif _is_regular(sizes):
+        tl_shape[axis] = sizes[0]
+        reg_shape[axis] = sizes[1] if len(sizes) > 2 \
+            else max(sizes[-1], reg_shape[axis])
+
+    out_along = _sizes_to_bounds(_regular_sizes(shape[axis], tl_shape[axis],
+                                                reg_shape[axis]))
+    out_across = _sizes_to_bounds(_regular_sizes(shape[other],
+                                                 tl_shape[other],
+                                                 reg_shape[other]))
+
+    if axis == 0:
+        blocks = _reblock(grid, along, across, out_along, out_across)
+    else:
+        blocks = _reblock(_transpose_grid(grid), across, along, out_across,
+                          out_along)
+
+    return Array(blocks, top_left_shape=tuple(tl_shape),
+                 reg_shape=tuple(reg_shape), shape=tuple(shape),
+                 sparse=first._sparse)
+
+
+def vstack(arrays, block_size=None):
+    """ Stacks a sequence of ds-arrays vertically (row wise). Equivalent to
+    concatenate(arrays, axis=0, block_size).
+
+    Parameters
+    ----------
+    arrays : sequence of ds-arrays
+        The ds-arrays must have the same number of columns.
+    block_size : tuple of two ints, optional (default=None)
+        If given, the output ds-array is divided in regular blocks of this
+        size.
+
+    Returns
+    -------
+    dsarray : ds-array
+        The stacked ds-array.
+    """
+    return concatenate(arrays, axis=0, block_size=block_size)
+
+
+def hstack(arrays, block_size=None):
+    """ Stacks a sequence of ds-arrays horizontally (column wise).
+    Equivalent to concatenate(arrays, axis=1, block_size).
+
+    Parameters
+    ----------
+    arrays : sequence of ds-arrays
+        The ds-arrays must have the same number of rows.
+    block_size : tuple of two ints, optional (default=None)
+        If given, the output ds-array is divided in regular blocks of this
+        size.
+
+    Returns
+    -------
+    dsarray : ds-array
+        The stacked ds-array.
+    """
+    return concatenate(arrays, axis=1, block_size=block_size)
+
+
+def sort(x, axis=0, column=None):
+    """ Returns a sorted copy of a ds-array.
+
+    Rows are sorted by the values of one of the columns (or columns by the
+    values of one of the rows if axis is 1) using sample sort: each row of
+    blocks is sampled to choose splitters, rows are sent to the bucket of
+    their key, and each bucket is sorted by a different task. Splitters are
+    pairs of key and row index, so that rows with a repeated key are also
+    spread among the buckets. Only the number of rows of each bucket is
+    retrieved in the driver. The output ds-array has the same blocks as x.
+
+    The sort is stable, that is, rows with equal keys keep their order.
+
+    Parameters
+    ----------
+    x : ds-array
+        Input ds-array.
+    axis : int, optional (default=0)
+        Axis along which to sort.
+    column : int, optional (default=None)
+        Index of the column (row if axis is 1) used as key. Can be None if
+        x has a single column (row).
+
+    Returns
+    -------
+    dsarray : ds-array
+        Sorted ds-array.
+
+    Examples
+    --------
+    >>> import dislib as ds
+    >>> x = ds.random_array((1000, 10), block_size=(100, 5))
+    >>> x = ds.sort(x, column=3)
+    """
+    return _sort(x, axis, column, return_indices=False)
+
+
+def argsort(x, axis=0, column=None):
+    """ Returns the indices that would sort a ds-array along an axis, by the
+    values of one of its columns (rows if axis is 1). See
+    :meth:`dislib.sort <dislib.sort>`.
+
+    Parameters
+    ----------
+    x : ds-array
+        Input ds-array.
+    axis : int, optional (default=0)
+        Axis along which to sort.
+    column : int, optional (default=None)
+        Index of the column (row if axis is 1) used as key. Can be None if
+        x has a single column (row).
+
+    Returns
+    -------
+    indices : ds-array
+        Column ds-array of shape (x.shape[0], 1) (row ds-array of shape
+        (1, x.shape[1]) if axis is 1) with the indices that sort x.
+    """
+    return _sort(x, axis, column, return_indices=True)
+
+
+def _sort(x, axis, column, return_indices):
+    if axis not in (0, 1):
+        raise ValueError("Axis must be 0 or 1.")
+
+    if axis == 1:
+        return _sort(x.transpose(), 0, column, return_indices).transpose()
+
+    if column is None:
+        if x.shape[1] != 1:
+            raise ValueError("A column is required to sort ds-arrays with "
+                             "more than one column.")
+        column = 0
+
+    if not 0 <= column < x.shape[1]:
+        raise ValueError("Column %d is out of bounds." % column)
+
+    in_rows, in_cols = _block_bounds(x, 0), _block_bounds(x, 1)
+    key_j = _overlapping(in_cols, (column, column + 1))[0]
+    key_col = column - in_cols[key_j][0]
+    n_buckets = len(in_rows)
+
+    samples = [_sample_keys(row[key_j], [key_col], start, 4 * n_buckets)
+               for row, (start, _) in zip(x._blocks, in_rows)]
+    splitters = _choose_splitters(n_buckets, *samples)
+
+    pieces = []
+    for row, (start, _) in zip(x._blocks, in_rows):
+        out_blocks = [object() for _ in range(n_buckets)]
+        _partition_rows(row, key_j, key_col, splitters, start,
+                        return_indices, out_blocks)
+        pieces.append(out_blocks)
+
+    buckets, counts = [], []
+    for b in range(n_buckets):
+        bucket, count = _sort_bucket(*[piece[b] for piece in pieces])
+        buckets.append(bucket)
+        counts.append(count)
+
+    counts = compss_wait_on(counts)
+
+    # empty buckets are left out of the output ds-array
+    buckets = [[bucket] for bucket, count in zip(buckets, counts)
+               if count > 0]
+    bucket_rows = _sizes_to_bounds([count for count in counts if count > 0])
+
+    if return_indices:
+        tl_shape = (x._top_left_shape[0], 1)
+        reg_shape = (x._reg_shape[0], 1)
+        out_cols = [(0, 1)]
+        shape = (x.shape[0], 1)
+        sparse = False
+    else:
+        tl_shape, reg_shape, shape = x._top_left_shape, x._reg_shape, x.shape
+        out_cols = in_cols
+        sparse = x._sparse
+
+    blocks = _reblock(buckets, bucket_rows, [(0, shape[1])], in_rows,
+                      out_cols)
+
+    return Array(blocks, top_left_shape=tl_shape, reg_shape=reg_shape,
+                 shape=shape, sparse=sparse)
+
+
+def quantile(x, q, axis=0, method="sketch", sketch_size=1000, arity=50):
+    """ Computes the q-th quantiles of the data along an axis (e.g., of every
+    column if axis is 0).
+
+    With method='sketch', each block is summarized by a task into a
+    mergeable sketch of at most sketch_size weighted values per column,
+    and the sketches of each column of blocks are merged in a tree of the
+    given arity. Tasks thus need a bounded amount of memory, and quantiles
+    are approximate. The rank error is about n / sketch_size per level of
+    the reduction, where n is the number of elements of each column.
+    Quantiles are exact if no column of blocks has more than sketch_size
+    rows.
+
+    With method='exact', the values of each column of blocks are sorted
+    with a sample sort (see :meth:`dislib.sort <dislib.sort>`), where
+    each column is sorted independently and each bucket is sorted by a
+    different task. Then, the values at the ranks of the quantiles are
+    selected from the buckets that contain them. Only the number of values
+    of each bucket is retrieved in the driver, and tasks need an amount of
+    memory proportional to the size of the blocks.
+
+    Parameters
+    ----------
+    x : ds-array
+        Input ds-array.
+    q : float or array-like of floats
+        Quantiles to compute, in the range [0, 1].
+    axis : int, optional (default=0)
+        Axis along which the quantiles are computed.
+    method : str, optional (default='sketch')
+        'sketch' or 'exact'.
+    sketch_size : int, optional (default=1000)
+        Maximum number of values per column kept by the sketches.
+    arity : int, optional (default=50)
+        Arity of the reduction of the sketches of each block.
+
+    Returns
+    -------
+    quantiles : ds-array
+        ds-array of shape (len(q), x.shape[1]) if axis is 0, or of shape
+        (x.shape[0], len(q)) if axis is 1. Quantiles are computed with
+        linear interpolation, like in numpy.quantile.
+
+    Examples
+    --------
+    >>> import dislib as ds
+    >>> x = ds.random_array((10000, 10), block_size=(1000, 5))
+    >>> print(ds.quantile(x, [0.25, 0.5, 0.75]).collect())
+    """
+    q = np.atleast_1d(np.asarray(q, dtype=float))
+
+    if q.ndim != 1 or np.any(q < 0) or np.any(q > 1):
+        raise ValueError("Quantiles must be in the range [0, 1].")
+
+    if axis not in (0, 1):
+        raise ValueError("Axis must be 0 or 1.")
+
+    if method not in ("sketch", "exact"):
+        raise ValueError("Method must be 'sketch' or 'exact'.")
+
+    if sketch_size < 1:
+        raise ValueError("Sketch size must be greater than 0.")
+
+    if arity < 2:
+        raise ValueError("Arity must be greater than 1.")
+
+    if method == "exact":
+        if axis == 1:
+            return _exact_quantile(x.transpose(), q).transpose()
+
+        return _exact_quantile(x, q)
+
+    blocks = x._blocks if axis == 0 else _transpose_grid(x._blocks)
+    out_blocks = []
+
+    for j in range(len(blocks[0])):
+        partials = [_block_sketch(blocks[i][j], axis, sketch_size)
+                    for i in range(len(blocks))]
+
+        while len(partials) > 1:
+            partials_subset = partials[:arity]
+            partials = partials[arity:]
+            partials.append(_merge_sketches(sketch_size, *partials_subset))
+
+        out_blocks.append(_sketch_quantile(partials[0], q, axis))
+
+    if axis == 0:
+        return Array([out_blocks], top_left_shape=(q.size,
+                                                   x._top_left_shape[1]),
+                     reg_shape=(q.size, x._reg_shape[1]),
+                     shape=(q.size, x.shape[1]), sparse=False)
+
+    return Array([[block] for block in out_blocks],
+                 top_left_shape=(x._top_left_shape[0], q.size),
+                 reg_shape=(x._reg_shape[0], q.size),
+                 shape=(x.shape[0], q.size), sparse=False)
+
+
+def _exact_quantile(x, q):
+    """ Computes the quantiles of every column of x, sorting the values of
+    each column of blocks with a sample sort and selecting the values at
+    the ranks of the quantiles from the sorted buckets. """
+    in_rows = _block_bounds(x, 0)
+    n_buckets = len(in_rows)
+    buckets, counts = [], []
+
+    for j, (c0, c1) in enumerate(_block_bounds(x, 1)):
+        key_cols = list(range(c1 - c0))
+        samples = [_sample_keys(row[j], key_cols, start, 4 * n_buckets)
+                   for row, (start, _) in zip(x._blocks, in_rows)]
+        splitters = _choose_splitters(n_buckets, *samples)
+
+        pieces = []
+        for row, (start, _) in zip(x._blocks, in_rows):
+            out_blocks = [object() for _ in range(n_buckets)]
+            _partition_keys(row[j], splitters, start, out_blocks)
+            pieces.append(out_blocks)
+
+        buckets.append([])
+        counts.append([])
+
+        for b in range(n_buckets):
+            bucket, count = _sort_keys(*[piece[b] for piece in pieces])
+            buckets[-1].append(bucket)
+            counts[-1].append(count)
+
+    counts = compss_wait_on(counts)
+    n = x.shape[0]
+    ranks = _quantile_ranks(q, n)
+    out_blocks = []
+
+    for col_buckets, col_counts in zip(buckets, counts):
+        # first rank of each bucket, for each column
+        starts = np.cumsum(col_counts, axis=0) - col_counts
+        bucket_ids = np.unique(_rank_buckets(starts, ranks))
+        out_blocks.append(_select_quantiles(q, n, starts, bucket_ids,
+                                            *[col_buckets[b]
+                                              for b in bucket_ids]))
+
+    return Array([out_blocks], top_left_shape=(q.size, x._top_left_shape[1]),
+                 reg_shape=(q.size, x._reg_shape[1]),
+                 shape=(q.size, x.shape[1]), sparse=False)
+
+
+def _quantile_ranks(q, n):
+    """ Returns the ranks of the values that are interpolated to compute
+    the quantiles q of n values, like in numpy.quantile. """
+    positions = q * (n - 1)
+    return np.unique(np.concatenate((np.floor(positions),
+                                     np.ceil(positions))).astype(int))
+
+
+def _rank_buckets(starts, ranks):
+    """ Returns the buckets that contain the given ranks in each column,
+    given the first rank of each bucket (rows) in each column. """
+    return np.concatenate([np.searchsorted(starts[:, c], ranks,
+                                           side="right") - 1
+                           for c in range(starts.shape[1])])
+
+
+def unique(x, return_counts=False, arity=50):
+    """ Finds the unique elements of a ds-array.
+
+    The unique elements of each block are found by a different task, and
+    the partial results are merged in a tree of the given arity. The result
+    is retrieved in the driver, since its size depends on the data.
+
+    Parameters
+    ----------
+    x : ds-array
+        Input ds-array.
+    return_counts : bool, optional (default=False)
+        Whether to return the number of times each unique element appears.
+    arity : int, optional (default=50)
+        Arity of the reduction of the partial results of each block.
+
+    Returns
+    -------
+    unique : ndarray
+        Sorted unique elements of x.
+    counts : ndarray
+        Number of times each unique element appears in x. Only returned if
+        return_counts is True.
+    """
+    if arity < 2:
+        raise ValueError("Arity must be greater than 1.")
+
+    partials = [_block_unique(block) for row in x._blocks for block in row]
+
+    while len(partials) > 1:
+        partials_subset = partials[:arity]
+        partials = partials[arity:]
+        partials.append(_merge_unique(*partials_subset))
+
+    values, counts = compss_wait_on(partials[0])
+    return (values, counts) if return_counts else values
+
+
+def bincount(x, minlength=0, arity=50):
+    """ Counts the number of occurrences of each value in a ds-array of
+    non-negative integers (e.g., a column ds-array of labels). Non-integer
+    values are truncated.
+
+    Each block is counted by a different task, and the partial counts are
+    merged in a tree of the given arity. The result is retrieved in the
+    driver, since its size depends on the data.
+
+    Parameters
+    ----------
+    x : ds-array
+        Input ds-array of non-negative integers.
+    minlength : int, optional (default=0)
+        Minimum number of bins of the output.
+    arity : int, optional (default=50)
+        Arity of the reduction of the partial counts of each block.
+
+    Returns
+    -------
+    counts : ndarray
+        Number of occurrences of each value i in x at position i.
+    """
+    if minlength < 0:
+        raise ValueError("Minlength must be non-negative.")
+
+    if arity < 2:
+        raise ValueError("Arity must be greater than 1.")
+
+    partials = [_block_bincount(block, minlength) for row in x._blocks
+                for block in row]
+
+    while len(partials) > 1:
+        partials_subset = partials[:arity]
+        partials = partials[arity:]
+        partials.append(_merge_bincount(*partials_subset))
+
+    return compss_wait_on(partials[0])
+
+
+def histogram(x, bins=10, range=None, axis=0, arity=50):
+    """ Computes the histogram of every column (row if axis is 1) of a
+    ds-array.
+
+    The histogram of each block is computed by a different task, and the
+    partial histograms of each column of blocks are added in a tree of the
+    given arity. If bins is an int and range is None, the bins of each
+    column span from its minimum to its maximum.
+
+    Parameters
+    ----------
+    x : ds-array
+        Input ds-array.
+    bins : int or sequence of scalars, optional (default=10)
+        Number of equal-width bins, or monotonically increasing bin edges
+        (including the rightmost edge) shared by all the columns.
+    range : (float, float), optional (default=None)
+        Lower and upper range of the bins, shared by all the columns. Only
+        used if bins is an int.
+    axis : int, optional (default=0)
+        Axis along which the histograms are computed.
+    arity : int, optional (default=50)
+        Arity of the reduction of the partial histograms of each block.
+
+    Returns
+    -------
+    hist : ds-array
+        ds-array of shape (n_bins, x.shape[1]) if axis is 0, or of shape
+        (x.shape[0], n_bins) if axis is 1, with the number of elements of
+        each column (row) in each bin.
+    bin_edges : ds-array
+        ds-array of shape (n_bins + 1, x.shape[1]) if axis is 0, or of
+        shape (x.shape[0], n_bins + 1) if axis is 1, with the bin edges of
+        each column (row).
+    """
+    if axis not in (0, 1):
+        raise ValueError("Axis must be 0 or 1.")
+
+    if arity < 2:
+        raise ValueError("Arity must be greater than 1.")
+
+    if np.ndim(bins) == 0:
+        if bins < 1:
+            raise ValueError("Bins must be a positive integer.")
+
+        n_bins = int(bins)
+        fixed_edges = None if range is None else \
+            np.linspace(range[0], range[1], n_bins + 1)
+    else:
+        fixed_edges = np.asarray(bins, dtype=float)
+
+        if fixed_edges.ndim != 1 or np.any(np.diff(fixed_edges) < 0):
+            raise ValueError("Bins must increase monotonically.")
+
+        n_bins = fixed_edges.size - 1
+
+    if fixed_edges is None:
+        mn, mx = x.min(axis=axis), x.max(axis=axis)
+
+    blocks = x._blocks if axis == 0 else _transpose_grid(x._blocks)
+    hist_blocks, edge_blocks = [], []
+
+    for j, n_cols in enumerate(x._block_sizes(1 - axis)):
+        if fixed_edges is None:
+            limits = (mn._blocks[0][j], mx._blocks[0][j]) if axis == 0 \
+                else (mn._blocks[j][0], mx._blocks[j][0])
+            edges = _histogram_edges(limits[0], limits[1], n_bins)
+        else:
+            edges = np.tile(fixed_edges.reshape(-1, 1), (1, n_cols))
+
+        partials = [_block_histogram(row[j], edges, axis) for row in blocks]
+
+        while len(partials) > 1:
+            partials_subset = partials[:arity]
+            partials = partials[arity:]
+            partials.append(_sum_blocks(*partials_subset))
+
+        hist_blocks.append(partials[0])
+        edge_blocks.append(edges if axis == 0 else _transpose_block(edges))
+
+    tl, reg = x._top_left_shape[1 - axis], x._reg_shape[1 - axis]
+    size = x.shape[1 - axis]
+
+    if axis == 0:
+        hist = Array([hist_blocks], top_left_shape=(n_bins, tl),
+                     reg_shape=(n_bins, reg), shape=(n_bins, size),
+                     sparse=False)
+        bin_edges = Array([edge_blocks], top_left_shape=(n_bins + 1, tl),
+                          reg_shape=(n_bins + 1, reg),
+                          shape=(n_bins + 1, size), sparse=False)
+    else:
+        hist = Array([[block] for block in hist_blocks],
+                     top_left_shape=(tl, n_bins), reg_shape=(reg, n_bins),
+                     shape=(size, n_bins), sparse=False)
+        bin_edges = Array([[block] for block in edge_blocks],
+                          top_left_shape=(tl, n_bins + 1),
+                          reg_shape=(reg, n_bins + 1),
+                          shape=(size, n_bins + 1), sparse=False)
+
+    return hist, bin_edges
+
+
+def describe(x, axis=0, arity=50):
+    """ Computes the count, mean, variance, minimum, maximum and number of
+    non-zero elements of every column (row if axis is 1) of a ds-array in a
+    single pass over the data.
+
+    The statistics of each block are computed by a different task, and the
+    partial statistics of each column of blocks are merged in a tree of the
+    given arity, using the parallel algorithm of Chan et al. for the mean
+    and the sum of squared differences to the mean.
+
+    Parameters
+    ----------
+    x : ds-array
+        Input ds-array.
+    axis : int, optional (default=0)
+        Axis along which the statistics are computed.
+    arity : int, optional (default=50)
+        Arity of the reduction of the partial statistics of each block.
+
+    Returns
+    -------
+    stats : dict
+        Dictionary with keys 'count', 'mean', 'var' (population variance,
+        that is, with zero degrees of freedom), 'min', 'max' and 'nnz'. Each
+        value is a ds-array of shape (1, x.shape[1]) if axis is 0, or of
+        shape (x.shape[0], 1) if axis is 1.
+
+    Examples
+    --------
+    >>> import dislib as ds
+    >>> x = ds.random_array((1000, 10), block_size=(100, 5))
+    >>> stats = ds.describe(x)
+    >>> print(stats["mean"].collect(), stats["var"].collect())
+    """
+    if axis not in (0, 1):
+        raise ValueError("Axis must be 0 or 1.")
+
+    if arity < 2:
+        raise ValueError("Arity must be greater than 1.")
+
+    blocks = x._blocks if axis == 0 else _transpose_grid(x._blocks)
+    out_blocks = [[] for _ in _STATS]
+
+    for j in range(len(blocks[0])):
+        partials = [_block_stats(row[j], axis) for row in blocks]
+
+        while len(partials) > 1:
+            partials_subset = partials[:arity]
+            partials = partials[arity:]
+            partials.append(_merge_stats(*partials_subset))
+
+        stats = _split_stats(partials[0], axis)
+
+        for stat_blocks, block in zip(out_blocks, stats):
+            stat_blocks.append(block)
+
+    tl, reg = x._top_left_shape[1 - axis], x._reg_shape[1 - axis]
+    size = x.shape[1 - axis]
+    stats = dict()
+
+    for name, stat_blocks in zip(_STATS, out_blocks):
+        if axis == 0:
+            stats[name] = Array([stat_blocks], top_left_shape=(1, tl),
+                                reg_shape=(1, reg), shape=(1, size),
+                                sparse=False)
+        else:
+            stats[name] = Array([[block] for block in stat_blocks],
+                                top_left_shape=(tl, 1), reg_shape=(reg, 1),
+                                shape=(size, 1), sparse=False)
+
+    return stats
+
+
+def _sketch(values, weights, size):
+    """ Returns a sketch of at most size values per column from values and
+    weights of shape (n, n_cols). The sketch is a (values, weights) pair,
+    where each column of values is sorted. If there are more than size
+    values, each value of the sketch represents an equal part of the
+    total weight. """
+    order = np.argsort(values, axis=0, kind="stable")
+    values = np.take_along_axis(values, order, axis=0)
+    weights = np.take_along_axis(weights, order, axis=0)
+
+    if values.shape[0] <= size:
+        return values, weights
+
+    cum_weights = np.cumsum(weights, axis=0)
+    total = cum_weights[-1]
+    out_values = np.empty((size, values.shape[1]), dtype=values.dtype)
+
+    for j in range(values.shape[1]):
+        targets = (np.arange(size) + 0.5) * total[j] / size
+        idx = np.searchsorted(cum_weights[:, j], targets)
+        out_values[:, j] = values[np.minimum(idx, len(values) - 1), j]
+
+    out_weights = np.tile(total / size, (size, 1))
+    return out_values, out_weights
+
+
+def _is_regular(sizes):
+    """ Whether a ds-array can have blocks of these sizes along an axis,
+    that is, all the blocks but the first and the last have the same size,
+    and the first and the last are not larger than the rest. """
+    if len(sizes) <= 2:
+        return True
+
+    reg = sizes[1]
+    return all(size == reg for size in sizes[2:-1]) and sizes[0] <= reg \
+        and sizes[-1] <= reg
+
+
+def _block_meta(block):
+    if issparse(block):
+        nbytes = sum(getattr(block, attr).nbytes for attr in
+                     ("data", "indices", "indptr", "row", "col")
+                     if hasattr(block, attr))
+        nnz = block.nnz
+    else:
+        block = np.asarray(block)
+        nbytes = block.nbytes
+        nnz = block.size
+
+    return _BlockMeta(block.shape[0], block.shape[1], nnz, block.dtype.str,
+                      nbytes)
+
+
+def _transpose_grid(blocks):
+    return list(map(list, zip(*blocks)))
+
+
+def _concat_blocks(blocks):
+    """ Copies a grid of 2-dimensional ndarrays into a single preallocated
+    C-contiguous ndarray. """
+    n_rows = sum(row[0].shape[0] for row in blocks)
+    n_cols = sum(block.shape[1] for block in blocks[0])
+    dtype = np.result_type(*[block for row in blocks for block in row])
+    out = np.empty((n_rows, n_cols), dtype=dtype)
+
+    r0 = 0
+    for row in blocks:
+        r1 = r0 + row[0].shape[0]
+        c0 = 0
+        for block in row:
+            c1 = c0 + block.shape[1]
+            if block.shape != (r1 - r0, c1 - c0):
+                raise ValueError("Blocks of the same row (column) must have "
+                                 "the same number of rows (columns).")
+            out[r0:r1, c0:c1] = block
+            c0 = c1
+        if c0 != n_cols:
+            raise ValueError("All rows of blocks must have the same number "
+                             "of columns.")
+        r0 = r1
+
+    return out
+
+
+class _VirtualHStack(object):
+    """ Lazy horizontal concatenation of a stripe of blocks.
+
+    Tasks can use it instead of Array._merge_blocks to operate on the
+    column groups of a row stripe one at a time, without merging them into
+    a single matrix. Column groups are only concatenated when an operation
+    needs all the columns at once.
+
+    Parameters
+    ----------
+    blocks : list of lists
+        Blocks of a row stripe. If there is more than one row of blocks,
+        each column group is merged vertically.
+    """
+
+    def __init__(self, blocks):
+        if len(blocks) == 1:
+            self.groups = list(blocks[0])
+        else:
+            self.groups = [Array._merge_blocks([[block] for block in col])
+                           for col in _transpose_grid(blocks)]
+
+        widths = [group.shape[1] for group in self.groups]
+        self.bounds = _sizes_to_bounds(widths)
+        self.shape = (self.groups[0].shape[0], sum(widths))
+
+    @property
+    def dtype(self):
+        return np.result_type(*[group.dtype for group in self.groups])
+
+    @property
+    def sparse(self):
+        return issparse(self.groups[0])
+
+    def __len__(self):
+        return self.shape[0]
+
+    def iter_groups(self):
+        """ Yields (start, end, group) for each column group. """
+        for (start, end), group in zip(self.bounds, self.groups):
+            yield start, end, group
+
+    def take_rows(self, indices):
+        """ Returns a new _VirtualHStack with the given rows. """
+        return _VirtualHStack([[group[indices] for group in self.groups]])
+
+    def dot(self, other):
+        """ Returns self @ other, with other a (n_cols, k) matrix, as the sum
+        of the products of each column group. """
+        out = None
+        for start, end, group in self.iter_groups():
+            part = group.dot(other[start:end])
+            out = part if out is None else out + part
+        return out
+
+    def sum(self, axis=None):
+        """ Sums the elements along axis (None, 0 or 1). """
+        if axis is None:
+            return sum(group.sum() for group in self.groups)
+
+        sums = [np.asarray(group.sum(axis=axis)) for group in self.groups]
+
+        if axis == 0:
+            return np.hstack([s.reshape(1, -1) for s in sums])
+
+        return np.sum([s.reshape(-1, 1) for s in sums], axis=0)
+
+    def row_norms(self, squared=False):
+        """ Returns the euclidean norm of each row. """
+        norms = np.zeros(self.shape[0])
+        for group in self.groups:
+            if issparse(group):
+                norms += np.asarray(group.multiply(group).sum(axis=1)).ravel()
+            else:
+                norms += np.einsum("ij,ij->i", group, group)
+
+        return norms if squared else np.sqrt(norms)
+
+    def merge(self):
+        """ Returns the concatenation of all the column groups. """
+        return Array._merge_blocks([self.groups])
+
+
+def _elementwise(ufunc, *operands):
+    """ Returns a lazy ds-array representing ufunc(*operands).
+
+    Operands can be ds-arrays, scalars or nd-arrays, and are broadcast
+    following NumPy rules. At least one of the ds-array operands needs to
+    have the shape of the result, and the rest of ds-arrays need to have the
+    same blocking along the non-broadcast dimensions. The blocks of the
+    result are not computed until they are used; chained expressions
+    are fused into a single task per block.
+    """
+    operands = [_check_operand(op) for op in operands]
+    shape = _broadcast_shape([np.shape(op) for op in operands])
+    arrays = [op for op in operands if isinstance(op, Array)]
+    base = next((a for a in arrays if a.shape == shape), None)
+
+    if base is None:
+        raise ValueError("Operands could not be broadcast to a ds-array of "
+                         "shape %s." % (shape,))
+
+    for arr in arrays:
+        for axis in range(2):
+            if arr.shape[axis] == 1 and shape[axis] != 1:
+                continue
+
+            if arr._block_sizes(axis) != base._block_sizes(axis):
+                raise ValueError("ds-arrays must have the same block sizes "
+                                 "along non-broadcast dimensions.")
+
+    expr = ("op", ufunc, tuple(_as_expr(op) for op in operands))
+    sparse = _is_sparse_result(ufunc, operands)
+    out_blocks = Array._get_out_blocks(base._n_blocks)
+
+    res = Array(blocks=out_blocks, top_left_shape=base._top_left_shape,
+                reg_shape=base._reg_shape, shape=shape, sparse=sparse)
+    res._expr = expr
+    return res
+
+
+def _check_operand(op):
+    if isinstance(op, Array):
+        return op
+
+    if isinstance(op, (Number, np.generic)):
+        return op
+
+    if not isinstance(op, (np.ndarray, list, tuple)):
+        raise TypeError("Unsupported operand type for ds-array operations: "
+                        "%s" % type(op))
+
+    op = np.asarray(op)
+
+    if op.ndim == 0:
+        return op[()]
+    elif op.ndim == 1:
+        return op.reshape(1, -1)
+    elif op.ndim == 2:
+        return op
+
+    raise ValueError("Operands must have at most two dimensions.")
+
+
+def _broadcast_shape(shapes):
+    shapes = [s for s in shapes if len(s) > 0]
+    shape = []
+
+    for axis in range(2):
+        sizes = set(s[axis] for s in shapes) - {1}
+
+        if len(sizes) > 1:
+            raise ValueError("Operands could not be broadcast together with "
+                             "shapes %s" % " ".join(str(s) for s in shapes))
+
+        shape.append(sizes.pop() if sizes else 1)
+
+    return tuple(shape)
+
+
+def _as_expr(op):
+    if isinstance(op, Array):
+        # fuse pending expressions instead of materializing them
+        if op._expr is not None:
+            return op._expr
+
+        return "array", op
+
+    return "const", op
+
+
+def _is_sparse_result(ufunc, operands):
+    """
+    Whether applying ufunc to the operands preserves sparsity. This has to
+    match the operations performed in _apply_ufunc.
+    """
+    sparse = [isinstance(op, Array) and op._sparse for op in operands]
+
+    if len(operands) == 1:
+        return sparse[0] and _preserves_zero(ufunc)
+
+    a, b = operands
+
+    if ufunc is np.multiply:
+        return any(sparse)
+    elif ufunc is np.add or ufunc is np.subtract:
+        return all(sparse) and a.shape == b.shape
+    elif ufunc is np.true_divide:
+        return sparse[0] and _is_sparse_divisor(b)
+    elif ufunc is np.power:
+        return sparse[0] and np.isscalar(b) and b > 0
+
+    return False
+
+
+def _is_sparse_divisor(b):
+    """ Whether dividing a sparse matrix by b keeps its zeros (0 / 0 and
+    0 / nan are nan). """
+    return np.isscalar(b) and b != 0 and not np.isnan(b)
+
+
+def _preserves_zero(ufunc):
+    with np.errstate(all="ignore"):
+        return ufunc.nin == 1 and ufunc(0.0) == 0
+
+
+def _reblock(blocks, in_rows, in_cols, out_rows, out_cols):
+    """
+    Returns a grid of blocks with the given (start, end) bounds, from the
+    blocks of a grid with bounds in_rows and in_cols. Each output block is
+    created by a single task that takes the parts of the input blocks that
+    overlap with it, and input blocks that do not change are reused.
+    """
+    out_blocks = []
+
+    for rows in out_rows:
+        out_blocks.append([])
+        in_i = _overlapping(in_rows, rows)
+
+        for cols in out_cols:
+            in_j = _overlapping(in_cols, cols)
+
+            # reuse input blocks that do not change
+            if len(in_i) == 1 and len(in_j) == 1 and \
+                    in_rows[in_i[0]] == rows and in_cols[in_j[0]] == cols:
+                out_blocks[-1].append(blocks[in_i[0]][in_j[0]])
+                continue
+
+            in_blocks = [[blocks[i][j] for j in in_j] for i in in_i]
+            row_slices = [_local_bounds(in_rows[i], rows) for i in in_i]
+            col_slices = [_local_bounds(in_cols[j], cols) for j in in_j]
+            out_blocks[-1].append(_assemble_block(in_blocks, row_slices,
+                                                  col_slices))
+
+    return out_blocks
+
+
+def _block_bounds(x, axis):
+    return _sizes_to_bounds(x._block_sizes(axis))
+
+
+def _sizes_to_bounds(sizes):
+    bounds = []
+    start = 0
+
+    for size in sizes:
+        bounds.append((start, start + size))
+        start += size
+
+    return bounds
+
+
+def _regular_sizes(size, first, reg):
+    first = min(first, size)
+    sizes = [first]
+
+    for start in range(first, size, reg):
+        sizes.append(min(reg, size - start))
+
+    return sizes
+
+
+def _overlapping(bounds, target):
+    """
+    Returns the indices of the (start, end) bounds that overlap with the
+    target (start, end) bounds.
+    """
+    idx = max(bisect_right(bounds, (target[0], np.inf)) - 1, 0)
+    indices = []
+
+    while idx < len(bounds) and bounds[idx][0] < target[1]:
+        if bounds[idx][1] > target[0]:
+            indices.append(idx)
+
+        idx += 1
+
+    return indices
+
+
+def _local_bounds(bounds, target):
+    """
+    Returns the part of the target bounds that lies in bounds, relative to
+    the start of bounds.
+    """
+    start = max(bounds[0], target[0])
+    end = min(bounds[1], target[1])
+    return start - bounds[0], end - bounds[0]
+
+
+def _bcast_idx(x, axis, idx):
+    # broadcast ds-arrays have a single block along the broadcast axis
+    return idx if x._n_blocks[axis] > 1 else 0
+
+
+def _block_expr(expr, leaves, leaf_idx, rows, cols):
+    """
+    Builds the expression that computes a single block of the result, where
+    ds-arrays are replaced by indices to the list of input blocks (leaves)
+    and constants are sliced to the block boundaries (rows, cols).
+    """
+    kind = expr[0]
+
+    if kind == "op":
+        args = tuple(_block_expr(e, leaves, leaf_idx, rows, cols)
+                     for e in expr[2])
+        return "op", expr[1], args
+    elif kind == "array":
+        arr = expr[1]
+
+        if id(arr) not in leaf_idx:
+            leaf_idx[id(arr)] = len(leaves)
+            leaves.append(arr)
+
+        return "block", leaf_idx[id(arr)]
+
+    value = expr[1]
+
+    if not np.isscalar(value):
+        if value.shape[0] != 1:
+            value = value[rows[0]:rows[1]]
+        if value.shape[1] != 1:
+            value = value[:, cols[0]:cols[1]]
+
+    return "const", value
+
+
+def _eval_node(expr, blocks):
+    kind = expr[0]
+
+    if kind == "op":
+        args = [_eval_node(e, blocks) for e in expr[2]]
+        return _apply_ufunc(expr[1], args)
+    elif kind == "block":
+        return blocks[expr[1]]
+
+    return expr[1]
+
+
+def _apply_ufunc(ufunc, args):
+    if not any(issparse(a) for a in args):
+        return ufunc(*args)
+
+    if len(args) == 1:
+        a = args[0]
+
+        if _preserves_zero(ufunc):
+            out = a.tocsr(copy=True)
+            out.data = ufunc(out.data)
+            return out
+
+        return ufunc(a.toarray())
+
+    a, b = args
+
+    if ufunc is np.multiply:
+        return a.multiply(b) if issparse(a) else b.multiply(a)
+    elif ufunc is np.add and issparse(a) and issparse(b) \
+            and a.shape == b.shape:
+        return a + b
+    elif ufunc is np.subtract and issparse(a) and issparse(b) \
+            and a.shape == b.shape:
+        return a - b
+    elif ufunc is np.true_divide and issparse(a) and _is_sparse_divisor(b):
+        return a.multiply(1 / b)
+    elif ufunc is np.power and issparse(a) and np.isscalar(b) and b > 0:
+        return a.power(b)
+
+    a = a.toarray() if issparse(a) else a
+    b = b.toarray() if issparse(b) else b
+    return ufunc(a, b)
 
 
-def load_svmlight_file(path, block_size, n_features, store_sparse):
+def load_svmlight_file(path, block_size, n_features, store_sparse,
+                       parallel=False):
     """ Loads a SVMLight file into a distributed array.
 
     Parameters
@@ -902,12 +3195,23 @@ def load_svmlight_file(path, block_size, n_features, store_sparse):
     store_sparse : boolean
         Whether to use scipy.sparse data structures to store data. If False,
         numpy.array is used instead.
+    parallel : boolean, optional (default=False)
+        If False, the file is read in the driver and the lines are sent to
+        the tasks that parse them. If True, the driver only splits the file
+        in byte ranges, and each task parses its part of the file directly
+        from disk. This requires the file to be accessible from all the
+        workers (e.g., in a shared file system), and to contain a sample
+        per line.
 
     Returns
     -------
     x, y : (ds-array, ds-array)
         A distributed representation (ds-array) of the X and y.
     """
+    if parallel:
+        return _load_svmlight_file_parallel(path, block_size, n_features,
+                                            store_sparse)
+
     n, m = block_size
     lines = []
     x_blocks, y_blocks = [], []
@@ -950,7 +3254,31 @@ def load_svmlight_file(path, block_size, n_features, store_sparse):
     return x, y
 
 
-def load_txt_file(path, block_size, delimiter=","):
+def _load_svmlight_file_parallel(path, block_size, n_features, store_sparse):
+    n, m = block_size
+    ranges, counts = _count_lines_in_ranges(path, n)
+    n_rows = sum(counts)
+    x_blocks, y_blocks = [], []
+
+    for start, stop, skip in _row_block_ranges(ranges, counts, n_rows, n):
+        out_blocks = Array._get_out_blocks((1, ceil(n_features / m)))
+        out_blocks.append([object()])
+        _read_svmlight_range(path, start, skip, stop - skip, out_blocks,
+                             col_size=m, n_features=n_features,
+                             store_sparse=store_sparse)
+        x_blocks.append(out_blocks[0])
+        y_blocks.append(out_blocks[1])
+
+    x = Array(x_blocks, top_left_shape=block_size, reg_shape=block_size,
+              shape=(n_rows, n_features), sparse=store_sparse)
+
+    y = Array(y_blocks, top_left_shape=(n, 1), reg_shape=(n, 1),
+              shape=(n_rows, 1), sparse=False)
+
+    return x, y
+
+
+def load_txt_file(path, block_size, delimiter=",", parallel=False):
     """ Loads a text file into a distributed array.
 
     Parameters
@@ -961,6 +3289,12 @@ def load_txt_file(path, block_size, delimiter=","):
         Size of the blocks of the array.
     delimiter : string, optional (default=",")
         String that separates columns in the file.
+    parallel : boolean, optional (default=False)
+        If False, the file is read in the driver and the lines are sent to
+        the tasks that parse them. If True, the driver only splits the file
+        in byte ranges, and each task reads and parses its part of the file.
+        This requires the file to be accessible from all the workers (e.g.,
+        in a shared file system).
 
     Returns
     -------
@@ -973,6 +3307,10 @@ def load_txt_file(path, block_size, delimiter=","):
         n_cols = len(first_line.split(delimiter))
 
     n_blocks = ceil(n_cols / block_size[1])
+
+    if parallel:
+        return _load_txt_file_parallel(path, block_size, delimiter, n_cols)
+
     blocks = []
     lines = []
     n_lines = 0
@@ -997,6 +3335,75 @@ def load_txt_file(path, block_size, delimiter=","):
                  shape=(n_lines, n_cols), sparse=False)
 
 
+def _load_txt_file_parallel(path, block_size, delimiter, n_cols):
+    n_blocks = ceil(n_cols / block_size[1])
+    ranges, counts = _count_lines_in_ranges(path, block_size[0])
+    n_lines = sum(counts)
+
+    blocks = []
+
+    for start, stop, skip in _row_block_ranges(ranges, counts, n_lines,
+                                               block_size[0]):
+        out_blocks = [object() for _ in range(n_blocks)]
+        _read_lines_range(path, start, skip, stop - skip, block_size[1],
+                          delimiter, n_cols, out_blocks)
+        blocks.append(out_blocks)
+
+    return Array(blocks, top_left_shape=block_size, reg_shape=block_size,
+                 shape=(n_lines, n_cols), sparse=False)
+
+
+def _count_lines_in_ranges(path, lines_per_range):
+    """
+    Splits the file in byte ranges that start at the beginning of a line and
+    contain approximately lines_per_range lines each (estimated from the
+    length of the first line), and counts the actual number of lines in
+    each range in parallel. Only the counts are synchronized.
+    """
+    file_size = os.path.getsize(path)
+
+    with open(path, "rb") as f:
+        line_size = max(len(f.readline()), 1)
+
+    n_ranges = max(round(file_size / (line_size * lines_per_range)), 1)
+    offsets = [0]
+
+    with open(path, "rb") as f:
+        for i in range(1, n_ranges):
+            # move to the end of the line that contains the split point
+            f.seek(i * file_size // n_ranges - 1)
+            f.readline()
+            offset = f.tell()
+
+            if offsets[-1] < offset < file_size:
+                offsets.append(offset)
+
+    ranges = list(zip(offsets, offsets[1:] + [file_size]))
+    counts = [_count_lines(path, start, end) for start, end in ranges]
+    counts = compss_wait_on(counts)
+
+    return ranges, counts
+
+
+def _row_block_ranges(ranges, counts, n_lines, n_rows):
+    """
+    Yields, for each block of n_rows lines, the byte offset of the range
+    containing the first line of the block, and the number of lines to skip
+    from there and the line where the block ends (relative to that offset).
+    """
+    range_idx = 0
+    first_line = 0
+
+    for block_start in range(0, n_lines, n_rows):
+        while first_line + counts[range_idx] <= block_start:
+            first_line += counts[range_idx]
+            range_idx += 1
+
+        skip = block_start - first_line
+        stop = skip + min(n_rows, n_lines - block_start)
+        yield ranges[range_idx][0], stop, skip
+
+
 @task(out_blocks=COLLECTION_INOUT, returns=1)
 def _read_lines(lines, block_size, delimiter, out_blocks):
     samples = np.genfromtxt(lines, delimiter=delimiter)
@@ -1005,6 +3412,49 @@ def _read_lines(lines, block_size, delimiter, out_blocks):
         out_blocks[i] = samples[:, j:j + block_size]
 
 
+@task(returns=1)
+def _count_lines(path, start, end):
+    n_lines = 0
+    last = b"\n"
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+
+        while remaining > 0:
+            data = f.read(min(remaining, 2 ** 26))
+
+            if not data:
+                break
+
+            n_lines += data.count(b"\n")
+            last = data[-1:]
+            remaining -= len(data)
+
+    # the last line of the file might not end with a line break
+    if last != b"\n":
+        n_lines += 1
+
+    return n_lines
+
+
+@task(out_blocks=COLLECTION_INOUT)
+def _read_lines_range(path, offset, skip, n_lines, block_size, delimiter,
+                      n_cols, out_blocks):
+    with open(path, "rb") as f:
+        f.seek(offset)
+
+        for _ in range(skip):
+            f.readline()
+
+        lines = [f.readline() for _ in range(n_lines)]
+
+    samples = np.genfromtxt(lines, delimiter=delimiter).reshape(-1, n_cols)
+
+    for i, j in enumerate(range(0, n_cols, block_size)):
+        out_blocks[i] = samples[:, j:j + block_size]
+
+
 @task(out_blocks={Type: COLLECTION_INOUT, Depth: 2})
 def _read_svmlight(lines, out_blocks, col_size, n_features, store_sparse):
     from tempfile import SpooledTemporaryFile
@@ -1019,6 +3469,50 @@ def _read_svmlight(lines, out_blocks, col_size, n_features, store_sparse):
     tmp_file.seek(0)
 
     x, y = load_svmlight_file(tmp_file, n_features)
+    _split_svmlight(x, y, out_blocks, col_size, n_features, store_sparse)
+
+
+@task(out_blocks={Type: COLLECTION_INOUT, Depth: 2})
+def _read_svmlight_range(path, offset, skip, n_lines, out_blocks, col_size,
+                         n_features, store_sparse):
+    from sklearn.datasets import load_svmlight_file
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+
+        for _ in range(skip):
+            f.readline()
+
+        start = f.tell()
+
+        for _ in range(n_lines):
+            f.readline()
+
+        end = f.tell()
+
+    # load_svmlight_file drops the (possibly truncated) line found at
+    # offset, so we point it to the line break that precedes our first line,
+    # and it stops parsing after the line that crosses offset + length.
+    # Indices are read as zero-based, and thus, one-based files can have
+    # n_features + 1 columns here
+    offset = max(start - 1, 0)
+    x, y = load_svmlight_file(path, n_features=n_features + 1,
+                              zero_based=True, offset=offset,
+                              length=max(end - 1 - offset, 1))
+
+    # same heuristic as zero_based="auto", which is not available when
+    # reading parts of a file
+    indices = x.indices
+
+    if x.nnz > 0 and indices.min() > 0:
+        indices = indices - 1
+
+    x = csr_matrix((x.data, indices, x.indptr),
+                   shape=(x.shape[0], n_features))
+    _split_svmlight(x, y, out_blocks, col_size, n_features, store_sparse)
+
+
+def _split_svmlight(x, y, out_blocks, col_size, n_features, store_sparse):
     if not store_sparse:
         x = x.toarray()
 
@@ -1031,6 +3525,367 @@ def _read_svmlight(lines, out_blocks, col_size, n_features, store_sparse):
     out_blocks[1][0] = y.reshape(-1, 1)
 
 
+@task(blocks={Type: COLLECTION_IN, Depth: 2}, returns=1)
+def _assemble_block(blocks, row_slices, col_slices):
+    parts = [[block[r0:r1, c0:c1] for block, (c0, c1) in zip(row, col_slices)]
+             for row, (r0, r1) in zip(blocks, row_slices)]
+
+    return Array._merge_blocks(parts)
+
+
+@task(returns=1)
+def _get_block_meta(block):
+    return _block_meta(block)
+
+
+@task(returns=1)
+def _save_block(block, path, compression):
+    out = io.BytesIO()
+
+    if issparse(block):
+        block = block.tocsr()
+        np.savez(out, data=block.data, indices=block.indices,
+                 indptr=block.indptr, shape=block.shape)
+    else:
+        np.save(out, np.asarray(block), allow_pickle=False)
+
+    data = out.getvalue()
+
+    if compression is not None:
+        data = _CODECS[compression].compress(data)
+
+    with open(path, "wb") as f:
+        f.write(data)
+
+    return block.dtype.str
+
+
+@task(returns=2)
+def _load_block(path, sparse, compression):
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if compression is not None:
+        data = _CODECS[compression].decompress(data)
+
+    if sparse:
+        with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+            block = csr_matrix((npz["data"], npz["indices"], npz["indptr"]),
+                               shape=tuple(npz["shape"]))
+    else:
+        block = np.load(io.BytesIO(data), allow_pickle=False)
+
+    return block, _block_meta(block)
+
+
+@task(returns=1)
+def _read_npy_block(path, r_start, r_end, c_start, c_end):
+    data = np.load(path, mmap_mode="r", allow_pickle=False)
+
+    # asarray returns a plain nd-array view of the memory map (no copy)
+    return np.asarray(data[r_start:r_end, c_start:c_end])
+
+
+@task(returns=1)
+def _read_csr_block(path, shape, r_start, r_end, c_start, c_end):
+    indptr = np.load(os.path.join(path, "indptr.npy"), mmap_mode="r")
+    indptr = np.array(indptr[r_start:min(r_end, shape[0]) + 1])
+    start, end = indptr[0], indptr[-1]
+    indptr -= start
+
+    data, indices = [np.load(os.path.join(path, attr + ".npy"),
+                             mmap_mode="r")[start:end]
+                     for attr in ("data", "indices")]
+
+    rows = csr_matrix((np.array(data), np.array(indices), indptr),
+                      shape=(indptr.size - 1, shape[1]))
+    return rows[:, c_start:c_end]
+
+
+@task(returns=1)
+def _sample_keys(block, columns, start, n_samples):
+    keys = _column_values(block, columns)
+    n_samples = min(n_samples, keys.shape[0])
+    idx = np.linspace(0, keys.shape[0] - 1, n_samples).astype(int)
+
+    # the stable sort orders equal keys by row index
+    rows = np.argsort(keys, axis=0, kind="stable")[idx]
+    return np.take_along_axis(keys, rows, axis=0), rows + start
+
+
+@task(returns=1)
+def _choose_splitters(n_buckets, *samples):
+    keys = np.concatenate([sample[0] for sample in samples])
+    indices = np.concatenate([sample[1] for sample in samples])
+    idx = np.arange(1, n_buckets) * keys.shape[0] // n_buckets
+    split_keys = np.empty((len(idx), keys.shape[1]), dtype=keys.dtype)
+    split_indices = np.empty((len(idx), keys.shape[1]), dtype=int)
+
+    for c in range(keys.shape[1]):
+        order = np.lexsort((indices[:, c], keys[:, c]))[idx]
+        split_keys[:, c] = keys[order, c]
+        split_indices[:, c] = indices[order, c]
+
+    return split_keys, split_indices
+
+
+def _bucket_ids(keys, indices, split_keys, split_indices):
+    """ Returns the bucket of each (key, row index) pair, that is, the
+    number of splitters that are smaller or equal (comparing keys, and then
+    row indices). """
+    bucket_ids = np.searchsorted(split_keys, keys, side="left")
+
+    for key in np.unique(split_keys):
+        lo = np.searchsorted(split_keys, key, side="left")
+        hi = np.searchsorted(split_keys, key, side="right")
+        rows = np.flatnonzero(keys == key)
+        bucket_ids[rows] = lo + np.searchsorted(split_indices[lo:hi],
+                                                indices[rows], side="right")
+
+    return bucket_ids
+
+
+@task(blocks={Type: COLLECTION_IN, Depth: 1},
+      out_blocks={Type: COLLECTION_INOUT, Depth: 1})
+def _partition_rows(blocks, key_j, key_col, splitters, start,
+                    return_indices, out_blocks):
+    keys = _column_values(blocks[key_j], [key_col])[:, 0]
+    indices = np.arange(start, start + len(keys))
+    data = None if return_indices else Array._merge_blocks([blocks])
+    bucket_ids = _bucket_ids(keys, indices, splitters[0][:, 0],
+                             splitters[1][:, 0])
+
+    for b in range(len(out_blocks)):
+        rows = np.flatnonzero(bucket_ids == b)
+        out_blocks[b] = (keys[rows], indices[rows],
+                         None if data is None else data[rows])
+
+
+@task(returns=2)
+def _sort_bucket(*pieces):
+    keys = np.concatenate([piece[0] for piece in pieces])
+    indices = np.concatenate([piece[1] for piece in pieces])
+
+    # sorting by key and then by index makes the sort stable
+    order = np.lexsort((indices, keys))
+
+    if pieces[0][2] is None:
+        return indices[order].reshape(-1, 1), len(order)
+
+    if issparse(pieces[0][2]):
+        data = sp.vstack([piece[2] for piece in pieces], format="csr")
+    else:
+        data = np.concatenate([piece[2] for piece in pieces])
+
+    return data[order], len(order)
+
+
+@task(out_blocks={Type: COLLECTION_INOUT, Depth: 1})
+def _partition_keys(block, splitters, start, out_blocks):
+    keys = _column_values(block, list(range(block.shape[1])))
+    indices = np.arange(start, start + keys.shape[0])
+    bucket_ids = np.column_stack([
+        _bucket_ids(keys[:, c], indices, splitters[0][:, c],
+                    splitters[1][:, c]) for c in range(keys.shape[1])])
+
+    for b in range(len(out_blocks)):
+        out_blocks[b] = [keys[bucket_ids[:, c] == b, c]
+                         for c in range(keys.shape[1])]
+
+
+@task(returns=2)
+def _sort_keys(*pieces):
+    keys = [np.sort(np.concatenate(col_keys)) for col_keys in zip(*pieces)]
+    return keys, np.array([len(col_keys) for col_keys in keys])
+
+
+@task(returns=1)
+def _select_quantiles(q, n, starts, bucket_ids, *buckets):
+    buckets = dict(zip(bucket_ids, buckets))
+    positions = q * (n - 1)
+    lo = np.floor(positions).astype(int)
+    hi = np.ceil(positions).astype(int)
+    out = np.empty((len(q), starts.shape[1]))
+
+    for c in range(starts.shape[1]):
+        lo_values = _values_at(buckets, starts, c, lo)
+        hi_values = _values_at(buckets, starts, c, hi)
+        out[:, c] = lo_values + (hi_values - lo_values) * (positions - lo)
+
+    return out
+
+
+def _values_at(buckets, starts, column, ranks):
+    ids = np.searchsorted(starts[:, column], ranks, side="right") - 1
+    return np.array([buckets[b][column][r - starts[b, column]]
+                     for b, r in zip(ids, ranks)])
+
+
+def _column_values(block, columns):
+    values = block[:, columns]
+    return values.toarray() if issparse(values) else np.asarray(values)
+
+
+@task(returns=1)
+def _block_sketch(block, axis, size):
+    values = block.toarray() if issparse(block) else np.asarray(block)
+    values = values if axis == 0 else values.T
+    return _sketch(values, np.ones(values.shape), size)
+
+
+@task(returns=1)
+def _merge_sketches(size, *sketches):
+    values = np.concatenate([sketch[0] for sketch in sketches])
+    weights = np.concatenate([sketch[1] for sketch in sketches])
+    return _sketch(values, weights, size)
+
+
+@task(returns=1)
+def _sketch_quantile(sketch, q, axis):
+    values, weights = sketch
+
+    # each value stands for the ranks [start, start + weight), and is
+    # placed at their center, so that quantiles of uncompressed sketches
+    # are the same as numpy's
+    positions = np.cumsum(weights, axis=0) - (weights + 1) / 2
+    total = weights.sum(axis=0)
+    out = np.empty((len(q), values.shape[1]))
+
+    for j in range(values.shape[1]):
+        out[:, j] = np.interp(q * (total[j] - 1), positions[:, j],
+                              values[:, j])
+
+    return out if axis == 0 else out.T
+
+
+@task(returns=1)
+def _block_unique(block):
+    if issparse(block):
+        values, counts = np.unique(block.data, return_counts=True)
+        n_zeros = block.shape[0] * block.shape[1] - block.nnz
+
+        if n_zeros > 0:
+            values = np.append(values, 0)
+            counts = np.append(counts, n_zeros)
+
+        return _unique_counts((values, counts))
+
+    return np.unique(block, return_counts=True)
+
+
+@task(returns=1)
+def _merge_unique(*partials):
+    return _unique_counts(*partials)
+
+
+def _unique_counts(*partials):
+    values = np.concatenate([partial[0] for partial in partials])
+    counts = np.concatenate([partial[1] for partial in partials])
+    values, inverse = np.unique(values, return_inverse=True)
+    return values, np.bincount(inverse.ravel(), weights=counts,
+                               minlength=values.size).astype(int)
+
+
+@task(returns=1)
+def _block_bincount(block, minlength):
+    values = block.toarray() if issparse(block) else np.asarray(block)
+    return np.bincount(values.ravel().astype(int), minlength=minlength)
+
+
+@task(returns=1)
+def _merge_bincount(*partials):
+    counts = np.zeros(max(partial.size for partial in partials), dtype=int)
+
+    for partial in partials:
+        counts[:partial.size] += partial
+
+    return counts
+
+
+@task(returns=1)
+def _histogram_edges(mn, mx, n_bins):
+    mn, mx = np.ravel(mn).astype(float), np.ravel(mx).astype(float)
+
+    # like numpy, empty ranges are extended by 0.5 on each side
+    equal = mn == mx
+    mn[equal] -= 0.5
+    mx[equal] += 0.5
+
+    return np.linspace(mn, mx, n_bins + 1)
+
+
+@task(returns=1)
+def _block_histogram(block, edges, axis):
+    values = block.toarray() if issparse(block) else np.asarray(block)
+    values = values if axis == 0 else values.T
+    hist = np.empty((edges.shape[0] - 1, edges.shape[1]), dtype=int)
+
+    for j in range(edges.shape[1]):
+        hist[:, j] = np.histogram(values[:, j], bins=edges[:, j])[0]
+
+    return hist if axis == 0 else hist.T
+
+
+@task(returns=1)
+def _transpose_block(block):
+    return block.T
+
+
+@task(returns=1)
+def _block_stats(block, axis):
+    if axis == 1:
+        block = block.T
+
+    count = np.full(block.shape[1], block.shape[0])
+
+    if issparse(block):
+        block = csr_matrix(block)
+        mean = np.asarray(block.mean(axis=0)).ravel()
+        nnz = np.bincount(block.indices[block.data != 0],
+                          minlength=block.shape[1])
+
+        # implicit zeros add mean ** 2 each to the squared differences
+        diff = (block.data - mean[block.indices]) ** 2
+        n_implicit = block.shape[0] - np.bincount(block.indices,
+                                                  minlength=block.shape[1])
+        m2 = np.bincount(block.indices, weights=diff,
+                         minlength=block.shape[1]) + n_implicit * mean ** 2
+        mn = block.min(axis=0).toarray().ravel()
+        mx = block.max(axis=0).toarray().ravel()
+    else:
+        block = np.asarray(block)
+        mean = block.mean(axis=0)
+        m2 = ((block - mean) ** 2).sum(axis=0)
+        mn, mx = block.min(axis=0), block.max(axis=0)
+        nnz = np.count_nonzero(block, axis=0)
+
+    return count, mean, m2, mn, mx, nnz
+
+
+@task(returns=1)
+def _merge_stats(*partials):
+    count, mean, m2, mn, mx, nnz = partials[0]
+
+    for p_count, p_mean, p_m2, p_mn, p_mx, p_nnz in partials[1:]:
+        total = count + p_count
+        delta = p_mean - mean
+        mean = mean + delta * p_count / total
+        m2 = m2 + p_m2 + delta ** 2 * count * p_count / total
+        count = total
+        mn, mx = np.minimum(mn, p_mn), np.maximum(mx, p_mx)
+        nnz = nnz + p_nnz
+
+    return count, mean, m2, mn, mx, nnz
+
+
+@task(returns=6)
+def _split_stats(stats, axis):
+    count, mean, m2, mn, mx, nnz = stats
+    shape = (1, -1) if axis == 0 else (-1, 1)
+    out = (count, mean, m2 / count, mn, mx, nnz)
+    return tuple(stat.reshape(shape) for stat in out)
+
+
 @task(returns=1)
 def _get_item(i, j, block):
     """
@@ -1068,7 +3923,7 @@ def _merge_rows(blocks, out_blocks, blocks_shape, skip):
     data = Array._merge_blocks(blocks)
 
     for j in range(0, ceil(data.shape[1] / bm)):
-        out_blocks[j] = data[skip:bn, j * bm: (j + 1) * bm]
+        out_blocks[j] = data[skip:skip + bn, j * bm: (j + 1) * bm]
 
 
 @task(blocks={Type: COLLECTION_IN, Depth: 2},
@@ -1082,7 +3937,7 @@ def _merge_cols(blocks, out_blocks, blocks_shape, skip):
     data = Array._merge_blocks(blocks)
 
     for i in range(0, ceil(data.shape[0] / bn)):
-        out_blocks[i] = data[i * bn: (i + 1) * bn, skip:bm]
+        out_blocks[i] = data[i * bn: (i + 1) * bn, skip:skip + bm]
 
 
 @task(returns=1)
@@ -1113,6 +3968,33 @@ def _random_block(shape, seed):
     return np.random.random(shape)
 
 
+@task(returns=1)
+def _full_block(shape, fill_value, dtype):
+    return np.full(shape, fill_value, dtype=dtype)
+
+
+@task(returns=1)
+def _eye_block(shape, k, dtype):
+    return sp.eye(shape[0], shape[1], k=k, dtype=dtype, format="csr")
+
+
+@task(returns=1)
+def _empty_sparse_block(shape, dtype):
+    return csr_matrix(shape, dtype=dtype)
+
+
+@task(returns=1)
+def _random_normal_block(shape, loc, scale, seed):
+    return np.random.RandomState(seed).normal(loc, scale, shape)
+
+
+@task(returns=2)
+def _random_sparse_block(shape, density, seed):
+    block = sp.random(shape[0], shape[1], density=density, format="csr",
+                      random_state=np.random.RandomState(seed))
+    return block, _block_meta(block)
+
+
 @task(blocks={Type: COLLECTION_IN, Depth: 2}, returns=np.array)
 def _block_apply(func, axis, blocks, *args, **kwargs):
     arr = Array._merge_blocks(blocks)
@@ -1128,3 +4010,66 @@ def _block_apply(func, axis, blocks, *args, **kwargs):
         return np.asarray(out).reshape(1, -1)
     else:
         return np.asarray(out).reshape(-1, 1)
+
+
+@task(blocks=COLLECTION_IN, returns=2)
+def _eval_expr(expr, blocks, sparse):
+    out = _eval_node(expr, blocks)
+
+    if sparse:
+        out = csr_matrix(out)
+    elif issparse(out):
+        out = out.toarray()
+    else:
+        out = np.asarray(out)
+
+    return out, _block_meta(out)
+
+
+@task(a_blocks=COLLECTION_IN, b_blocks=COLLECTION_IN, returns=1)
+def _multiply_add(a_blocks, b_blocks, transpose_a, transpose_b):
+    res = None
+
+    for a, b in zip(a_blocks, b_blocks):
+        a = a.T if transpose_a else a
+        b = b.T if transpose_b else b
+        prod = a @ b
+        res = prod if res is None else res + prod
+
+    if issparse(res):
+        return res.tocsr() if issparse(a) and issparse(b) else res.toarray()
+
+    return np.asarray(res)
+
+
+@task(returns=1)
+def _sum_blocks(*blocks):
+    res = blocks[0]
+
+    for block in blocks[1:]:
+        res = res + block
+
+    return res
+
+
+@task(returns=1)
+def _block_reduce(block, method, axis):
+    out = getattr(block, method)(axis=axis)
+
+    if issparse(out):
+        out = out.toarray()
+
+    if axis == 0:
+        return np.asarray(out).reshape(1, -1)
+    else:
+        return np.asarray(out).reshape(-1, 1)
+
+
+@task(returns=1)
+def _merge_reduce(method, axis, *partials):
+    if axis == 0:
+        stacked = np.vstack(partials)
+    else:
+        stacked = np.hstack(partials)
+
+    return getattr(stacked, method)(axis=axis, keepdims=True)
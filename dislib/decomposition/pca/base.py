@@ -1,13 +1,12 @@
 from copy import copy
 
 import numpy as np
-from pycompss.api.api import compss_wait_on
 from pycompss.api.parameter import COLLECTION_IN, Depth, Type, COLLECTION_INOUT
-from pycompss.api.task import task
 from sklearn.base import BaseEstimator
 from sklearn.utils import validation
 
 from dislib.data.array import Array
+from dislib.runtime import task, compss_wait_on
 
 
 class PCA(BaseEstimator):
@@ -0,0 +1,3 @@
+from dislib.linalg.base import qr, svd
+
+__all__ = ['qr', 'svd']
@@ -0,0 +1,207 @@
+import numpy as np
+from pycompss.api.parameter import COLLECTION_IN, COLLECTION_INOUT, Type, \
+    Depth
+from scipy.sparse import issparse
+
+from dislib.data.array import Array, _regular_sizes, _sizes_to_bounds
+from dislib.runtime import task
+
+
+def qr(x, arity=2):
+    """ Computes the thin QR decomposition of a ds-array using TSQR
+    (tall-skinny QR).
+
+    Each row of blocks is decomposed by a different task, and the R
+    factors are merged in a tree of the given arity, where each task stacks
+    and decomposes the R factors of its children. The Q factor of each row
+    of blocks is then obtained by applying the Q factors of the tree from
+    the root to the leaves. Thus, no task needs more than a row of blocks
+    of x in memory, and the driver does not wait for any task.
+
+    Parameters
+    ----------
+    x : ds-array, shape=(n_samples, n_features)
+        Input ds-array. It is assumed to be tall and skinny (i.e., that a
+        row of blocks fits in memory), and sparse blocks are densified.
+    arity : int, optional (default=2)
+        Arity of the reduction of the R factors.
+
+    Returns
+    -------
+    q : ds-array, shape=(n_samples, k)
+        Matrix with orthonormal columns, with k = min(n_samples,
+        n_features). It has the same blocks of rows as x.
+    r : ds-array, shape=(k, n_features)
+        Upper triangular matrix, with a single block of rows.
+
+    Examples
+    --------
+    >>> import dislib as ds
+    >>> from dislib.linalg import qr
+    >>> x = ds.random_array((10000, 20), block_size=(1000, 20))
+    >>> q, r = qr(x)
+    """
+    if arity < 2:
+        raise ValueError("Arity must be greater than 1.")
+
+    leaves, root = _tsqr(x, arity)
+    _propagate(root, None)
+
+    return _q_array(x, leaves, root.size), _row_array(root.r, x, root.size)
+
+
+def svd(x, k=None, arity=2):
+    """ Computes the thin singular value decomposition of a ds-array on top
+    of its TSQR decomposition (see :meth:`qr <dislib.linalg.base.qr>`).
+
+    If x = QR, and R = U' S V^T is the SVD of R, which is computed by a
+    single task, then x = (QU') S V^T. The left singular vectors QU' are
+    computed by the same tasks that compute Q, without building Q.
+
+    Parameters
+    ----------
+    x : ds-array, shape=(n_samples, n_features)
+        Input ds-array, assumed to be tall and skinny.
+    k : int, optional (default=None)
+        Number of singular values and vectors to return, in descending
+        order of the singular values. If None, min(n_samples, n_features)
+        are returned.
+    arity : int, optional (default=2)
+        Arity of the reduction of the R factors.
+
+    Returns
+    -------
+    u : ds-array, shape=(n_samples, k)
+        Left singular vectors, with the same blocks of rows as x.
+    s : ds-array, shape=(1, k)
+        Singular values, in descending order.
+    vt : ds-array, shape=(k, n_features)
+        Right singular vectors (as rows), with a single block of rows.
+    """
+    if arity < 2:
+        raise ValueError("Arity must be greater than 1.")
+
+    n_values = min(x.shape)
+    k = n_values if k is None else k
+
+    if not 1 <= k <= n_values:
+        raise ValueError("k must be between 1 and %d." % n_values)
+
+    leaves, root = _tsqr(x, arity)
+    u_r, s, vt = _svd(root.r, k)
+    _propagate(root, u_r)
+
+    return (_q_array(x, leaves, k),
+            Array([[s]], top_left_shape=(1, k), reg_shape=(1, k),
+                  shape=(1, k), sparse=False),
+            _row_array(vt, x, k))
+
+
+class _Node(object):
+    """ Node of the TSQR tree, with the Q and R factors of its task, the
+    number of rows of R, and its children. """
+
+    def __init__(self, q, r, size, children=()):
+        self.q = q
+        self.r = r
+        self.size = size
+        self.children = children
+        self.factor = None
+
+
+def _tsqr(x, arity):
+    n_features = x.shape[1]
+    leaves = []
+
+    for row, n_rows in zip(x._iterator(axis=0), x._block_sizes(0)):
+        q, r = _qr_rows(row._blocks)
+        leaves.append(_Node(q, r, min(n_rows, n_features)))
+
+    partials = list(leaves)
+
+    while len(partials) > 1:
+        partials_subset = partials[:arity]
+        partials = partials[arity:]
+        q, r = _qr_stack(*[node.r for node in partials_subset])
+        size = min(sum(node.size for node in partials_subset), n_features)
+        partials.append(_Node(q, r, size, partials_subset))
+
+    return leaves, partials[0]
+
+
+def _propagate(node, factor):
+    """ Sets the factor that multiplies the Q of each node of the tree on the
+    right, which, for each child, is its part of the Q of its parent (times
+    the factor of the parent). """
+    node.factor = factor
+    start = 0
+
+    for child in node.children:
+        end = start + child.size
+        _propagate(child, _q_factor(node.q, start, end, factor))
+        start = end
+
+
+def _q_array(x, leaves, k):
+    col_bounds = _col_bounds(x, k)
+    blocks = []
+
+    for leaf in leaves:
+        out_blocks = [object() for _ in range(len(col_bounds))]
+        _split_cols(leaf.q, leaf.factor, col_bounds, out_blocks)
+        blocks.append(out_blocks)
+
+    return Array(blocks, top_left_shape=(x._top_left_shape[0],
+                                         col_bounds[0][1]),
+                 reg_shape=(x._reg_shape[0], min(x._reg_shape[1], k)),
+                 shape=(x.shape[0], k), sparse=False)
+
+
+def _row_array(matrix, x, n_rows):
+    """ Returns a ds-array of a single block of rows, with the same blocks
+    of columns as x. """
+    col_bounds = _col_bounds(x, x.shape[1])
+    out_blocks = [object() for _ in range(len(col_bounds))]
+    _split_cols(matrix, None, col_bounds, out_blocks)
+
+    return Array([out_blocks], top_left_shape=(n_rows, col_bounds[0][1]),
+                 reg_shape=(n_rows, x._reg_shape[1]),
+                 shape=(n_rows, x.shape[1]), sparse=False)
+
+
+def _col_bounds(x, n_cols):
+    return _sizes_to_bounds(_regular_sizes(n_cols, x._top_left_shape[1],
+                                           x._reg_shape[1]))
+
+
+@task(blocks={Type: COLLECTION_IN, Depth: 2}, returns=2)
+def _qr_rows(blocks):
+    data = Array._merge_blocks(blocks)
+    data = data.toarray() if issparse(data) else data
+    return np.linalg.qr(data)
+
+
+@task(returns=2)
+def _qr_stack(*r_factors):
+    return np.linalg.qr(np.vstack(r_factors))
+
+
+@task(returns=1)
+def _q_factor(q, start, end, factor):
+    q = q[start:end]
+    return q if factor is None else q @ factor
+
+
+@task(returns=3)
+def _svd(r, k):
+    u, s, vt = np.linalg.svd(r, full_matrices=False)
+    return u[:, :k], s[:k].reshape(1, -1), vt[:k]
+
+
+@task(out_blocks={Type: COLLECTION_INOUT, Depth: 1})
+def _split_cols(matrix, factor, col_bounds, out_blocks):
+    if factor is not None:
+        matrix = matrix @ factor
+
+    for j, (start, end) in enumerate(col_bounds):
+        out_blocks[j] = matrix[:, start:end]
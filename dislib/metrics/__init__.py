@@ -0,0 +1,3 @@
+from dislib.metrics.pairwise import pairwise_distances, pairwise_kernels
+
+__all__ = ['pairwise_distances', 'pairwise_kernels']
@@ -0,0 +1,215 @@
+import numpy as np
+from pycompss.api.parameter import COLLECTION_IN, Type, Depth
+from scipy.sparse import issparse
+from sklearn.metrics.pairwise import manhattan_distances
+
+from dislib.data.array import Array, _VirtualHStack
+from dislib.runtime import task
+
+_METRICS = ("euclidean", "sqeuclidean", "cosine", "manhattan")
+_KERNELS = ("linear", "rbf", "polynomial", "sigmoid", "cosine")
+
+
+def pairwise_distances(x, y=None, metric="euclidean"):
+    """ Computes the distances between the rows of x and the rows of y.
+
+    Each block of the output is computed by a different task from a row of
+    blocks of x and a row of blocks of y. Euclidean distances are computed
+    as sqrt(||x||^2 + ||y||^2 - 2 x y^T), where the row norms of each row of
+    blocks are computed only once. The products are computed for each
+    column of blocks without merging them, and the output has the same
+    precision as the inputs (i.e., float32 inputs give float32 distances).
+
+    Parameters
+    ----------
+    x : ds-array, shape=(n_samples_x, n_features)
+        Input samples. Can be sparse.
+    y : ds-array, shape=(n_samples_y, n_features), optional (default=None)
+        Input samples. If None, the distances between the rows of x are
+        computed. x and y must have the same blocks of columns.
+    metric : str, optional (default='euclidean')
+        'euclidean', 'sqeuclidean', 'cosine' or 'manhattan'.
+
+    Returns
+    -------
+    distances : ds-array, shape=(n_samples_x, n_samples_y)
+        Dense ds-array where the element (i, j) is the distance between the
+        i-th row of x and the j-th row of y. Blocks have the number of rows
+        of the blocks of x and the number of columns of the blocks of y.
+
+    Examples
+    --------
+    >>> import dislib as ds
+    >>> from dislib.metrics import pairwise_distances
+    >>> x = ds.random_array((1000, 10), block_size=(100, 10))
+    >>> y = ds.random_array((50, 10), block_size=(10, 10))
+    >>> print(pairwise_distances(x, y).shape)
+    """
+    if metric not in _METRICS:
+        raise ValueError("Unknown metric %s. Supported metrics are %s."
+                         % (metric, ", ".join(_METRICS)))
+
+    return _pairwise(x, y, metric, {})
+
+
+def pairwise_kernels(x, y=None, kernel="linear", gamma=None, degree=3,
+                     coef0=1):
+    """ Computes the kernel between the rows of x and the rows of y.
+
+    Each block of the output is computed by a different task, like in
+    :meth:`pairwise_distances
+    <dislib.metrics.pairwise.pairwise_distances>`.
+
+    Parameters
+    ----------
+    x : ds-array, shape=(n_samples_x, n_features)
+        Input samples. Can be sparse.
+    y : ds-array, shape=(n_samples_y, n_features), optional (default=None)
+        Input samples. If None, the kernel between the rows of x is
+        computed. x and y must have the same blocks of columns.
+    kernel : str, optional (default='linear')
+        'linear' (x y^T), 'rbf' (exp(-gamma ||x - y||^2)), 'polynomial'
+        ((gamma x y^T + coef0)^degree), 'sigmoid' (tanh(gamma x y^T +
+        coef0)) or 'cosine'.
+    gamma : float, optional (default=None)
+        Coefficient of the rbf, polynomial and sigmoid kernels. If None,
+        1 / n_features is used.
+    degree : int, optional (default=3)
+        Degree of the polynomial kernel.
+    coef0 : float, optional (default=1)
+        Independent term of the polynomial and sigmoid kernels.
+
+    Returns
+    -------
+    kernel_matrix : ds-array, shape=(n_samples_x, n_samples_y)
+        Dense ds-array where the element (i, j) is the kernel between the
+        i-th row of x and the j-th row of y.
+    """
+    if kernel not in _KERNELS:
+        raise ValueError("Unknown kernel %s. Supported kernels are %s."
+                         % (kernel, ", ".join(_KERNELS)))
+
+    if gamma is None:
+        gamma = 1.0 / x.shape[1]
+
+    params = {"gamma": gamma, "degree": degree, "coef0": coef0}
+    func = "cosine_kernel" if kernel == "cosine" else kernel
+    return _pairwise(x, y, func, params)
+
+
+def _pairwise(x, y, func, params):
+    symmetric = y is None
+    y = x if symmetric else y
+
+    if x.shape[1] != y.shape[1]:
+        raise ValueError("x and y must have the same number of features.")
+
+    if x._block_sizes(1) != y._block_sizes(1):
+        raise ValueError("x and y must have the same blocks of columns.")
+
+    if func == "manhattan":
+        x_norms, y_norms = [None] * x._n_blocks[0], [None] * y._n_blocks[0]
+    else:
+        x_norms = [_row_norms(row._blocks) for row in x._iterator(axis=0)]
+        y_norms = x_norms if symmetric else \
+            [_row_norms(row._blocks) for row in y._iterator(axis=0)]
+
+    y_rows = [row._blocks for row in y._iterator(axis=0)]
+    blocks = []
+
+    for i, x_row in enumerate(x._iterator(axis=0)):
+        blocks.append([])
+
+        for k, y_row in enumerate(y_rows):
+            diagonal = symmetric and i == k
+            blocks[-1].append(_pairwise_block(x_row._blocks, y_row,
+                                              x_norms[i], y_norms[k], func,
+                                              params, diagonal))
+
+    return Array(blocks, top_left_shape=(x._top_left_shape[0],
+                                         y._top_left_shape[0]),
+                 reg_shape=(x._reg_shape[0], y._reg_shape[0]),
+                 shape=(x.shape[0], y.shape[0]), sparse=False)
+
+
+def _out_dtype(x, y):
+    return np.result_type(x.dtype, y.dtype, np.float32)
+
+
+def _compute(x, y, x_norms, y_norms, func, params, diagonal):
+    """ Computes the distances or kernel between the rows of two
+    _VirtualHStack, where x_norms and y_norms are their squared row
+    norms. """
+    dtype = _out_dtype(x, y)
+
+    if func == "manhattan":
+        return manhattan_distances(x.merge(), y.merge()).astype(dtype)
+
+    products = None
+
+    for x_group, y_group in zip(x.groups, y.groups):
+        part = x_group @ y_group.T
+        part = part.toarray() if issparse(part) else np.asarray(part)
+        products = part if products is None else products + part
+
+    products = products.astype(dtype, copy=False)
+
+    if func in ("euclidean", "sqeuclidean", "rbf"):
+        out = -2 * products
+        out += x_norms.astype(dtype).reshape(-1, 1)
+        out += y_norms.astype(dtype).reshape(1, -1)
+        np.maximum(out, 0, out=out)
+
+        # distances between a row and itself are exactly 0
+        if diagonal:
+            np.fill_diagonal(out, 0)
+
+        if func == "euclidean":
+            np.sqrt(out, out=out)
+        elif func == "rbf":
+            out *= -params["gamma"]
+            np.exp(out, out=out)
+
+        return out
+
+    if func in ("cosine", "cosine_kernel"):
+        x_norms = np.sqrt(x_norms).astype(dtype)
+        y_norms = np.sqrt(y_norms).astype(dtype)
+        x_norms[x_norms == 0] = 1
+        y_norms[y_norms == 0] = 1
+        out = products / x_norms.reshape(-1, 1) / y_norms.reshape(1, -1)
+
+        if func == "cosine_kernel":
+            return out
+
+        out = 1 - out
+        np.clip(out, 0, 2, out=out)
+
+        if diagonal:
+            np.fill_diagonal(out, 0)
+
+        return out
+
+    if func == "linear":
+        return products
+
+    products *= params["gamma"]
+    products += params["coef0"]
+
+    if func == "polynomial":
+        return products ** params["degree"]
+
+    return np.tanh(products)
+
+
+@task(blocks={Type: COLLECTION_IN, Depth: 2}, returns=1)
+def _row_norms(blocks):
+    return _VirtualHStack(blocks).row_norms(squared=True)
+
+
+@task(x_blocks={Type: COLLECTION_IN, Depth: 2},
+      y_blocks={Type: COLLECTION_IN, Depth: 2}, returns=1)
+def _pairwise_block(x_blocks, y_blocks, x_norms, y_norms, func, params,
+                    diagonal):
+    x, y = _VirtualHStack(x_blocks), _VirtualHStack(y_blocks)
+    return _compute(x, y, x_norms, y_norms, func, params, diagonal)
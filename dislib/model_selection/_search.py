@@ -5,7 +5,6 @@ from functools import partial
 from itertools import product
 
 import numpy as np
-from pycompss.api.api import compss_wait_on
 from scipy.stats import rankdata
 from sklearn import clone
 from sklearn.model_selection import ParameterGrid, ParameterSampler
@@ -14,6 +13,7 @@ from sklearn.utils.fixes import MaskedArray
 from dislib.model_selection._split import infer_cv
 from dislib.model_selection._validation import check_scorer, fit_and_score, \
     validate_score, aggregate_score_dicts
+from dislib.runtime import compss_wait_on
 
 
 class BaseSearchCV(ABC):
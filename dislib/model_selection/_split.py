@@ -1,13 +1,13 @@
 import numbers
 
 from pycompss.api.parameter import Type, COLLECTION_IN, Depth, COLLECTION_INOUT
-from pycompss.api.task import task
 
 from dislib import utils
 
 import numpy as np
 
 from dislib.data.array import Array
+from dislib.runtime import task
 
 
 def infer_cv(cv=None):
@@ -1,11 +1,11 @@
 import numpy as np
 from pycompss.api.parameter import Depth, Type, COLLECTION_IN
-from pycompss.api.task import task
 from sklearn.base import BaseEstimator
 from sklearn.neighbors import NearestNeighbors as SKNeighbors
 from sklearn.utils import validation
 
 from dislib.data.array import Array
+from dislib.runtime import task
 
 
 class NearestNeighbors(BaseEstimator):
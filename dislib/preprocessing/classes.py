@@ -1,10 +1,10 @@
 import numpy as np
 from pycompss.api.parameter import Depth, Type, COLLECTION_IN, COLLECTION_INOUT
-from pycompss.api.task import task
 from scipy.sparse import csr_matrix, issparse
 
 from dislib.data.array import Array
 import dislib as ds
+from dislib.runtime import task
 
 
 class StandardScaler(object):
@@ -38,16 +38,9 @@ class StandardScaler(object):
         -------
         self : StandardScaler
         """
-        self.mean_ = ds.apply_along_axis(np.mean, 0, x)
-        var_blocks = [[]]
-
-        for row, m_row in zip(x._iterator(1), self.mean_._iterator(1)):
-            var_blocks[0].append(_compute_var(row._blocks, m_row._blocks))
-
-        self.var_ = Array(var_blocks,
-                          top_left_shape=self.mean_._top_left_shape,
-                          reg_shape=self.mean_._reg_shape,
-                          shape=self.mean_.shape, sparse=False)
+        stats = ds.describe(x)
+        self.mean_ = stats["mean"]
+        self.var_ = stats["var"]
 
         return self
 
@@ -96,15 +89,6 @@ class StandardScaler(object):
                      sparse=x._sparse)
 
 
-@task(blocks={Type: COLLECTION_IN, Depth: 2},
-      m_blocks={Type: COLLECTION_IN, Depth: 2},
-      returns=1)
-def _compute_var(blocks, m_blocks):
-    x = Array._merge_blocks(blocks)
-    mean = Array._merge_blocks(m_blocks)
-    return np.mean(np.array(x - mean) ** 2, axis=0)
-
-
 @task(blocks={Type: COLLECTION_IN, Depth: 2},
       m_blocks={Type: COLLECTION_IN, Depth: 2},
       v_blocks={Type: COLLECTION_IN, Depth: 2},
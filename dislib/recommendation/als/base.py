@@ -1,14 +1,15 @@
+import functools
 from math import sqrt
 
 import numpy as np
-from pycompss.api.api import compss_wait_on
 from pycompss.api.parameter import COLLECTION_IN, Depth, Type
-from pycompss.api.task import task
 from scipy import sparse
 from sklearn.base import BaseEstimator
 from sklearn.metrics import mean_squared_error
 
 from dislib.data.array import Array
+from dislib.runtime import task, compss_wait_on, phase, \
+    ConvergenceController, Checkpointer
 
 
 class ALS(BaseEstimator):
@@ -36,6 +37,13 @@ class ALS(BaseEstimator):
         The arity of the tasks during the merge of each matrix chunk.
     verbose : boolean, optional (default=False)
         Whether to print progress information.
+    convergence_lag : int, optional (default=0)
+        Number of iterations submitted before waiting for the convergence
+        criterion of an iteration (see :class:`ConvergenceController
+        <dislib.runtime.convergence.ConvergenceController>`). Lags greater
+        than 0 avoid idle workers between iterations, at the cost of running
+        up to convergence_lag extra iterations that are discarded. Ignored if
+        `check_convergence` is False.
 
     Attributes
     ----------
@@ -71,7 +79,7 @@ class ALS(BaseEstimator):
 
     def __init__(self, random_state=None, n_f=100, lambda_=0.065,
                  tol=1e-4, max_iter=100, arity=5,
-                 check_convergence=True, verbose=False):
+                 check_convergence=True, verbose=False, convergence_lag=0):
         # params
         self.random_state = random_state
         self.n_f = n_f
@@ -81,6 +89,7 @@ class ALS(BaseEstimator):
         self.verbose = verbose
         self.arity = arity
         self.check_convergence = check_convergence
+        self.convergence_lag = convergence_lag
 
     def _update(self, r, x, axis):
         """ Returns updated matrix M given U (if x=U), or matrix U given M
@@ -123,11 +132,20 @@ class ALS(BaseEstimator):
     def _compute_rmse(self, dataset, U, I):
         rmses = [_get_rmse(sb._blocks, U, I) for sb in
                  dataset._iterator(axis=0)]
-        rmses = np.array(compss_wait_on(rmses))
-        # remove NaN errors that come from empty chunks
-        return np.mean(rmses[~np.isnan(rmses)])
+        return _mean_rmse(*rmses)
 
-    def fit(self, x, test=None):
+    def _check_rmse(self, test_set, rmse, iteration):
+        converged = self._has_converged(self._last_rmse, rmse)
+
+        if self.verbose:
+            print("%s RMSE: %.3f  [%s]" % (test_set, rmse,
+                                           abs(self._last_rmse - rmse)))
+
+        self._last_rmse = rmse
+        return converged
+
+    def fit(self, x, test=None, checkpoint_dir=None, checkpoint_every=1,
+            resume=False):
         """ Fits a model using training data. Training data is also used to
         check for convergence unless test data is provided.
 
@@ -140,6 +158,16 @@ class ALS(BaseEstimator):
             Sparse matrix used to check convergence with users as rows and
             items as columns. If not passed, uses training data to check
             convergence.
+        checkpoint_dir : str, optional (default=None)
+            Directory where the users and items matrices are saved every
+            checkpoint_every iterations (see :class:`Checkpointer
+            <dislib.runtime.checkpoint.Checkpointer>`). It must be accessible
+            from all the workers. If None, checkpoints are not saved.
+        checkpoint_every : int, optional (default=1)
+            Number of iterations between checkpoints.
+        resume : bool, optional (default=False)
+            Whether to resume the fit from the last checkpoint in
+            checkpoint_dir instead of initializing the items matrix.
         """
         self.converged = False
         self.users = None
@@ -152,40 +180,72 @@ class ALS(BaseEstimator):
             print("Item blocks: %s" % n_i)
             print("User blocks: %s" % n_u)
 
-        if self.random_state:
-            np.random.seed(self.random_state)
-
-        self.converged = False
-        users = None
-        items = np.random.rand(n_i, self.n_f)
-
-        # Assign average rating as first feature
-        # average_ratings = dataset.mean(axis='columns').collect()
-        average_ratings = _mean(x)
-
-        items[:, 0] = average_ratings
-
-        rmse, last_rmse = np.inf, np.NaN
-        i = 0
+        checkpointer = Checkpointer(checkpoint_dir, checkpoint_every, resume)
+        checkpoint = checkpointer.load()
+
+        if checkpoint is None:
+            if self.random_state:
+                np.random.seed(self.random_state)
+
+            users = None
+            items = np.random.rand(n_i, self.n_f)
+
+            # Assign average rating as first feature
+            # average_ratings = dataset.mean(axis='columns').collect()
+            with phase(self, "init"):
+                average_ratings = _mean(x)
+
+            items[:, 0] = average_ratings
+
+            self._last_rmse = np.inf
+            i = 0
+        else:
+            users, items = checkpoint["users"], checkpoint["items"]
+            rmse = checkpoint["rmse"]
+            self._last_rmse = np.inf if rmse is None else rmse
+            self.converged = checkpoint["converged"]
+            i = checkpoint["iteration"]
+
+            if self.converged:
+                self.users, self.items = users, items
+                return users, items
+
+        test_set = "Train" if test is None else "Test"
+        controller = ConvergenceController(
+            self.convergence_lag, functools.partial(self._check_rmse,
+                                                    test_set), i,
+            (users, items))
         while not self._has_finished(i):
-            last_rmse = rmse
+            with phase(self, "update users"):
+                users = self._update(r=x, x=items, axis=0)
+
+            with phase(self, "update items"):
+                items = self._update(r=x, x=users, axis=1)
 
-            users = self._update(r=x, x=items, axis=0)
-            items = self._update(r=x, x=users, axis=1)
+            i += 1
+            rmse = None
 
             if self.check_convergence:
 
                 _test = x if test is None else test
-                rmse = compss_wait_on(self._compute_rmse(_test, users, items))
-                self.converged = self._has_converged(last_rmse, rmse)
-                if self.verbose:
-                    test_set = "Train" if test is None else "Test"
-                    print("%s RMSE: %.3f  [%s]" % (test_set, rmse,
-                                                   abs(last_rmse - rmse)))
-            i += 1
+
+                with phase(self, "convergence sync"):
+                    rmse = self._compute_rmse(_test, users, items)
+                    checkpointer.save(i, users=users, items=items, rmse=rmse)
+                    self.converged = controller.add(rmse, (users, items))
+            else:
+                checkpointer.save(i, users=users, items=items,
+                                  rmse=self._last_rmse)
+
+        if self.check_convergence:
+            users, items = controller.finish()
+            self.converged = controller.converged
+            i = controller.iteration
 
         self.users = compss_wait_on(users)
         self.items = compss_wait_on(items)
+        checkpointer.save_final(i, self.converged, users=self.users,
+                                items=self.items, rmse=self._last_rmse)
 
         return users, items
 
@@ -272,3 +332,10 @@ def _get_rmse(blocks, users, items):
         rmse = sqrt(mean_squared_error(recs, preds))
 
     return rmse
+
+
+@task(returns=1)
+def _mean_rmse(*rmses):
+    rmses = np.array(rmses)
+    # remove NaN errors that come from empty chunks
+    return np.mean(rmses[~np.isnan(rmses)])
@@ -1,9 +1,9 @@
 import numpy as np
 from pycompss.api.parameter import COLLECTION_IN, Depth, Type
-from pycompss.api.task import task
 from sklearn.base import BaseEstimator
 
 from dislib.data.array import Array
+from dislib.runtime import task
 
 
 class LinearRegression(BaseEstimator):
@@ -31,7 +31,7 @@ class LinearRegression(BaseEstimator):
     >>> import numpy as np
     >>> import dislib as ds
     >>> from dislib.regression import LinearRegression
-    >>> from pycompss.api.api import compss_wait_on
+    >>> from dislib.runtime import compss_wait_on
     >>> x_data = np.array([1, 2, 3, 4, 5]).reshape(-1, 1)
     >>> y_data = np.array([2, 1, 1, 2, 4.5]).reshape(-1, 1)
     >>> bn, bm = 2, 2
@@ -0,0 +1,10 @@
+from dislib.runtime.base import task, compss_wait_on, compss_delete_object, \
+    compss_barrier, set_executor, get_executor, Future
+from dislib.runtime.checkpoint import Checkpointer
+from dislib.runtime.convergence import ConvergenceController
+from dislib.runtime.tracing import profile, phase, Profile
+
+__all__ = ['task', 'compss_wait_on', 'compss_delete_object',
+           'compss_barrier', 'set_executor', 'get_executor', 'Future',
+           'ConvergenceController', 'Checkpointer', 'profile', 'phase',
+           'Profile']
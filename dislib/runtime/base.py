@@ -0,0 +1,488 @@
+import functools
+import inspect
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future as _BaseFuture, \
+    ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from pycompss.api import api as _compss_api
+from pycompss.api import parameter as _parameter
+from pycompss.api.task import task as _compss_task
+
+try:
+    from pycompss.util.context import in_pycompss as _in_pycompss
+except ImportError:
+    def _in_pycompss():
+        return False
+
+from dislib.runtime import tracing
+
+_COLLECTION_INOUT = (_parameter.COLLECTION_INOUT,
+                     getattr(_parameter, "COLLECTION_OUT", None))
+_FILE_IN = (_parameter.FILE_IN,)
+_FILE_OUT = (_parameter.FILE_INOUT, getattr(_parameter, "FILE_OUT", None))
+
+# Built-in executors that can be selected by name
+_EXECUTORS = {"processes": ProcessPoolExecutor, "threads": ThreadPoolExecutor}
+
+# Executor used to run the tasks, or None to use PyCOMPSs
+_executor = None
+_lock = threading.RLock()
+
+# Futures of the tasks that have not finished yet, used by compss_barrier
+_running = set()
+
+# Last task writing each file, and tasks reading it since then
+_file_writers = {}
+_file_readers = {}
+
+# Tasks whose dependencies have finished are submitted to the executor by
+# a dispatcher thread, and not from the callbacks of the executor
+_ready = queue.Queue()
+_dispatcher = None
+
+# Tasks called from within a task run inline
+_local = threading.local()
+
+
+class Future(_BaseFuture):
+    """ Result of a task run by a local executor.
+
+    Futures can be passed as arguments to other tasks (also inside
+    collections), which then wait for them to finish. Use
+    :meth:`compss_wait_on <dislib.runtime.compss_wait_on>` to get their
+    value.
+    """
+
+
+def set_executor(executor=None, max_workers=None):
+    """ Sets the executor that runs dislib tasks.
+
+    By default, tasks are run by PyCOMPSs, which runs them sequentially when
+    the COMPSs runtime is not available. A local executor runs the tasks in
+    parallel in the current node instead, tracking the dependencies between
+    them. Waits for the tasks submitted to the previous executor to finish.
+
+    The executor can also be set with the environment variable
+    ``DISLIB_EXECUTOR``, and its number of workers with
+    ``DISLIB_MAX_WORKERS``.
+
+    Parameters
+    ----------
+    executor : str, Executor or None, optional (default=None)
+        Can be 'processes' (a ProcessPoolExecutor), 'threads' (a
+        ThreadPoolExecutor), an instance of concurrent.futures.Executor, or
+        None to use PyCOMPSs.
+    max_workers : int, optional (default=None)
+        Number of workers of the built-in executors. Defaults to the number
+        of CPUs.
+    """
+    global _executor
+
+    if executor is not None and not isinstance(executor, Executor):
+        if executor not in _EXECUTORS:
+            raise ValueError("Unknown executor '%s'. Options are: %s" %
+                             (executor, list(_EXECUTORS)))
+
+        executor = _EXECUTORS[executor](max_workers=max_workers)
+
+    with _lock:
+        previous, _executor = _executor, executor
+
+    if previous is not None:
+        compss_barrier()
+        previous.shutdown(wait=True)
+
+
+def get_executor():
+    """ Returns the executor that runs dislib tasks, or None if tasks are
+    run by PyCOMPSs. """
+    return _executor
+
+
+def task(**kwargs):
+    """ Decorator of dislib tasks.
+
+    Takes the same arguments as the PyCOMPSs task decorator. Decorated
+    functions are run by PyCOMPSs, or by the executor set with
+    :meth:`set_executor <dislib.runtime.set_executor>`.
+    """
+    compss_decorator = _compss_task(**kwargs)
+
+    def decorator(func):
+        compss_func = compss_decorator(func)
+        spec = _TaskSpec(func, kwargs)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kw):
+            executor = _executor
+
+            if getattr(_local, "inline", False):
+                return compss_func(*args, **kw)
+
+            if executor is None:
+                # tasks submitted to the COMPSs runtime return before they
+                # run, and thus, cannot be recorded
+                if tracing.active_profiles() and not _in_pycompss():
+                    return _run_profiled(spec, compss_func, args, kw)
+
+                return compss_func(*args, **kw)
+
+            return _submit(executor, spec, wrapper, args, kw)
+
+        wrapper._function = func
+        return wrapper
+
+    return decorator
+
+
+def compss_wait_on(*args, **kwargs):
+    """ Waits for the tasks computing the given objects, and returns their
+    values. Objects can be futures or lists of futures. If more than one
+    object is given, returns a list with their values. """
+    values = [_compss_api.compss_wait_on(_resolve(obj, wait=True), **kwargs)
+              for obj in args]
+    return values[0] if len(values) == 1 else values
+
+
+def compss_delete_object(obj):
+    """ Notifies that obj is no longer needed. """
+    if isinstance(obj, Future):
+        # the value is released when the last reference is gone
+        return True
+
+    return _compss_api.compss_delete_object(obj)
+
+
+def compss_barrier(no_more_tasks=False):
+    """ Waits for all the submitted tasks to finish. """
+    with _lock:
+        running = list(_running)
+
+    wait(running)
+
+    if _executor is None:
+        _compss_api.compss_barrier(no_more_tasks)
+
+
+class _TaskSpec(object):
+    """ Parameters of a task required to track its dependencies. """
+
+    def __init__(self, func, kwargs):
+        self.name = func.__name__
+        self.signature = inspect.signature(func)
+        self.n_returns = _n_returns(kwargs.get("returns"))
+        self.inouts = {}
+        self.file_in = []
+        self.file_out = []
+
+        for name, param in kwargs.items():
+            if isinstance(param, dict):
+                depth = param.get(_parameter.Depth, 1)
+                param = param.get(_parameter.Type)
+            else:
+                depth = 1
+
+            if _is_in(param, _COLLECTION_INOUT):
+                self.inouts[name] = depth
+            elif _is_in(param, _FILE_IN):
+                self.file_in.append(name)
+            elif _is_in(param, _FILE_OUT):
+                self.file_out.append(name)
+
+
+def _is_in(param, options):
+    return any(param is opt or param == opt for opt in options
+               if opt is not None)
+
+
+def _n_returns(returns):
+    if returns is None:
+        return 0
+    if isinstance(returns, int):
+        return returns
+    if isinstance(returns, (tuple, list)):
+        return len(returns)
+
+    return 1
+
+
+def _submit(executor, spec, func, args, kwargs):
+    bound = spec.signature.bind(*args, **kwargs)
+    arguments = bound.arguments
+    outputs = [Future() for _ in range(spec.n_returns)]
+    done = Future()
+
+    deps = []
+    _find_futures((bound.args, bound.kwargs), deps)
+
+    # the arguments are copied before replacing the elements of the
+    # COLLECTION_INOUT parameters with the futures of their final values
+    args, kwargs = _resolve((bound.args, bound.kwargs), wait=False)
+    inout_futures = {}
+
+    for name, depth in spec.inouts.items():
+        if name in arguments:
+            inout_futures[name] = _replace_leaves(arguments[name], depth)
+
+    with _lock:
+        for name in spec.file_in:
+            path = arguments.get(name)
+            writer = _file_writers.get(path)
+
+            if writer is not None:
+                deps.append(writer)
+
+            readers = _file_readers.setdefault(path, [])
+            readers[:] = [r for r in readers if not r.done()]
+            readers.append(done)
+
+        for name in spec.file_out:
+            path = arguments.get(name)
+            writer = _file_writers.get(path)
+
+            if writer is not None:
+                deps.append(writer)
+
+            deps.extend(_file_readers.pop(path, []))
+            _file_writers[path] = done
+
+        _running.add(done)
+
+    # tasks are recorded by the profiles active when they are submitted
+    profiles = tracing.active_profiles()
+    launch = functools.partial(_launch, executor, func, spec, args, kwargs,
+                               outputs, inout_futures, done, profiles,
+                               tracing.current_phase())
+    _when_done(deps, launch)
+
+    if spec.n_returns == 0:
+        return None
+    if spec.n_returns == 1:
+        return outputs[0]
+
+    return tuple(outputs)
+
+
+def _when_done(futures, callback):
+    """ Dispatches callback when all the futures have finished. """
+    pending = [f for f in futures if not f.done()]
+
+    if not pending:
+        _dispatch(callback)
+        return
+
+    counter = [len(pending)]
+    lock = threading.Lock()
+
+    def _done(_):
+        with lock:
+            counter[0] -= 1
+            ready = counter[0] == 0
+
+        if ready:
+            _dispatch(callback)
+
+    for future in pending:
+        future.add_done_callback(_done)
+
+
+def _dispatch(callback):
+    global _dispatcher
+
+    with _lock:
+        if _dispatcher is None:
+            _dispatcher = threading.Thread(target=_dispatch_loop,
+                                           name="dislib-dispatcher",
+                                           daemon=True)
+            _dispatcher.start()
+
+    _ready.put(callback)
+
+
+def _dispatch_loop():
+    while True:
+        _ready.get()()
+
+
+def _launch(executor, func, spec, args, kwargs, outputs, inout_futures,
+            done, profiles, phase):
+    outputs = outputs + [f for futures in inout_futures.values()
+                         for f in futures]
+
+    try:
+        args, kwargs = _resolve((args, kwargs), wait=True)
+        inouts = [(name, spec.inouts[name]) for name in inout_futures]
+        result = executor.submit(_run_task, func, args, kwargs, inouts,
+                                 bool(profiles))
+    except BaseException as e:
+        _finish(outputs, done, exception=e)
+        return
+
+    def _set_results(f):
+        try:
+            value, leaves, record = f.result()
+
+            if spec.n_returns == 1:
+                values = [value]
+            elif spec.n_returns > 1:
+                values = list(value)
+            else:
+                values = []
+
+            for inout_leaves in leaves:
+                values.extend(inout_leaves)
+
+            if len(values) != len(outputs):
+                raise ValueError("Task %s returned %d values, expected %d" %
+                                 (func.__name__, len(values), len(outputs)))
+        except BaseException as e:
+            _finish(outputs, done, exception=e)
+            return
+
+        if record is not None:
+            record["phase"] = phase
+            tracing.add_record(record, profiles)
+
+        _finish(outputs, done, values=values)
+
+    result.add_done_callback(_set_results)
+
+
+def _finish(outputs, done, values=None, exception=None):
+    for i, future in enumerate(outputs):
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(values[i])
+
+    with _lock:
+        _running.discard(done)
+
+    done.set_result(None)
+
+
+def _run_task(func, args, kwargs, inouts, profiled):
+    """ Runs a task in a worker. Returns its result, the final values of
+    its COLLECTION_INOUT parameters, and its record if it is profiled. """
+    bound = inspect.signature(func._function).bind(*args, **kwargs)
+    value, record = _call(func._function, func.__name__, bound,
+                          [name for name, _ in inouts], profiled)
+    leaves = []
+
+    for name, depth in inouts:
+        leaves.append([])
+        _collect_leaves(bound.arguments[name], depth, leaves[-1])
+
+    return value, leaves, record
+
+
+def _run_profiled(spec, function, args, kwargs):
+    """ Runs a task inline recording it in the active profiles. """
+    bound = spec.signature.bind(*args, **kwargs)
+    profiles = tracing.active_profiles()
+    value, record = _call(function, spec.name, bound, list(spec.inouts),
+                          True)
+    record["phase"] = tracing.current_phase()
+    tracing.add_record(record, profiles)
+    return value
+
+
+def _call(function, name, bound, inouts, profiled):
+    """ Calls function with the bound arguments, running the tasks that it
+    calls inline. Returns its result and, if profiled, a record with the
+    duration and the size of the inputs and outputs of the call. """
+    record = None
+
+    if profiled:
+        input_bytes = tracing.nbytes(list(bound.arguments.values()))
+        tracing.begin_task()
+        start = time.time()
+
+    _local.inline = True
+
+    try:
+        value = function(*bound.args, **bound.kwargs)
+    finally:
+        _local.inline = False
+
+    if profiled:
+        end = time.time()
+        outputs = [value] + [bound.arguments[name] for name in inouts
+                             if name in bound.arguments]
+        record = tracing.end_task(name, start, end, input_bytes,
+                                  tracing.nbytes(outputs))
+
+    return value, record
+
+
+def _find_futures(obj, futures):
+    if isinstance(obj, Future):
+        futures.append(obj)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            _find_futures(item, futures)
+    elif isinstance(obj, dict):
+        for item in obj.values():
+            _find_futures(item, futures)
+
+
+def _replace_leaves(collection, depth):
+    """ Replaces the elements of a COLLECTION_INOUT parameter with futures,
+    which are set when the task finishes. """
+    futures = []
+
+    for i, item in enumerate(collection):
+        if depth > 1 and isinstance(item, list):
+            futures.extend(_replace_leaves(item, depth - 1))
+        else:
+            collection[i] = Future()
+            futures.append(collection[i])
+
+    return futures
+
+
+def _collect_leaves(collection, depth, leaves):
+    for item in collection:
+        if depth > 1 and isinstance(item, list):
+            _collect_leaves(item, depth - 1, leaves)
+        else:
+            leaves.append(item)
+
+
+def _resolve(obj, wait):
+    """ Replaces the futures in obj with their values. If wait is False,
+    only the lists, tuples and dicts of obj are copied, so that later
+    changes made by the caller do not modify them. """
+    if isinstance(obj, Future):
+        return obj.result() if wait else obj
+
+    if isinstance(obj, list):
+        return [_resolve(item, wait) for item in obj]
+
+    if isinstance(obj, tuple):
+        items = [_resolve(item, wait) for item in obj]
+
+        # namedtuples are rebuilt with their own type
+        if hasattr(obj, "_fields"):
+            return type(obj)(*items)
+
+        return tuple(items)
+
+    if isinstance(obj, dict):
+        return {key: _resolve(value, wait) for key, value in obj.items()}
+
+    return obj
+
+
+def _from_environment():
+    executor = os.environ.get("DISLIB_EXECUTOR")
+
+    if executor:
+        max_workers = os.environ.get("DISLIB_MAX_WORKERS")
+        set_executor(executor, int(max_workers) if max_workers else None)
+
+
+_from_environment()
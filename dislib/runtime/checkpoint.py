@@ -0,0 +1,160 @@
+import glob
+import os
+import pickle
+import re
+
+from dislib.runtime.base import task, compss_wait_on
+
+_ITERATION_FILE = "iteration_%d.pkl"
+_FINAL_FILE = "final.pkl"
+
+
+class Checkpointer(object):
+    """ Saves the state of an iterative estimator every number of
+    iterations, and loads it to resume a fit.
+
+    Checkpoints are written by tasks as soon as the state of their iteration
+    is computed, without waiting for it in the driver. Thus, the directory
+    must be accessible from all the workers (e.g., in a shared file system).
+    Each checkpoint is a pickle file with the iteration number, whether the
+    estimator converged, and the state of the estimator. As with any pickle
+    file, checkpoints should only be loaded from trusted directories.
+
+    A fit that finishes saves a final checkpoint, from which it can be
+    resumed with a greater number of iterations. A fit resumed from the
+    checkpoint of an iteration performs at least one more iteration, as the
+    convergence of the checkpointed iteration is not checked again.
+
+    Parameters
+    ----------
+    path : str or None, optional (default=None)
+        Directory of the checkpoints. It is created if it does not exist. If
+        None, checkpoints are not saved.
+    every : int, optional (default=1)
+        Number of iterations between checkpoints.
+    resume : bool, optional (default=False)
+        Whether to load the last checkpoint in path. If False, the
+        checkpoints in path are removed.
+    """
+
+    def __init__(self, path=None, every=1, resume=False):
+        if every < 1:
+            raise ValueError("Checkpoints must be saved every 1 or more "
+                             "iterations.")
+
+        self.path = path
+        self.every = every
+        self.resume = resume
+        self._written = []
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+            if not resume:
+                final = os.path.join(path, _FINAL_FILE)
+
+                for file in self._files() + [final]:
+                    if os.path.exists(file):
+                        os.remove(file)
+
+    def load(self):
+        """ Loads the last checkpoint. The final checkpoint of a fit is
+        preferred over the checkpoints of its iterations.
+
+        Returns
+        -------
+        checkpoint : dict or None
+            State of the estimator, with the number of the iteration
+            ('iteration') and whether the estimator converged
+            ('converged'), or None if resume is False or there are no
+            checkpoints.
+        """
+        if self.path is None or not self.resume:
+            return None
+
+        final = os.path.join(self.path, _FINAL_FILE)
+
+        if os.path.exists(final):
+            return _load(final)
+
+        files = self._files()
+
+        if not files:
+            return None
+
+        return _load(max(files, key=_iteration))
+
+    def save(self, iteration, **state):
+        """ Saves the state of an iteration if it is a multiple of every.
+
+        Parameters
+        ----------
+        iteration : int
+            Number of the iteration (starting from 1).
+        **state
+            Values of the state of the estimator (can be futures).
+        """
+        if self.path is None or iteration % self.every != 0:
+            return
+
+        # the final checkpoint of a resumed fit is outdated by new iterations
+        final = os.path.join(self.path, _FINAL_FILE)
+
+        if os.path.exists(final):
+            os.remove(final)
+
+        path = os.path.join(self.path, _ITERATION_FILE % iteration)
+        self._written.append(_save_checkpoint(path, iteration, False,
+                                              list(state), *state.values()))
+
+    def save_final(self, iteration, converged, **state):
+        """ Saves the final state of a fit, and waits for all the checkpoints
+        to be written.
+
+        Parameters
+        ----------
+        iteration : int
+            Number of iterations performed.
+        converged : bool
+            Whether the estimator converged.
+        **state
+            Values of the state of the estimator (can be futures).
+        """
+        if self.path is None:
+            return
+
+        path = os.path.join(self.path, _FINAL_FILE)
+        self._written.append(_save_checkpoint(path, iteration, converged,
+                                              list(state), *state.values()))
+        self._written = compss_wait_on(self._written)
+
+    def _files(self):
+        files = glob.glob(os.path.join(self.path, "iteration_*.pkl"))
+        return [f for f in files if _iteration(f) is not None]
+
+
+def _iteration(path):
+    match = re.match(r"iteration_(\d+)\.pkl$", os.path.basename(path))
+    return int(match.group(1)) if match else None
+
+
+def _load(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+@task(returns=1)
+def _save_checkpoint(path, iteration, converged, keys, *values):
+    checkpoint = dict(zip(keys, values))
+    checkpoint["iteration"] = iteration
+    checkpoint["converged"] = converged
+
+    # checkpoints are renamed once written, so that a fit interrupted while
+    # writing one does not leave it incomplete
+    tmp = path + ".tmp"
+
+    with open(tmp, "wb") as f:
+        pickle.dump(checkpoint, f)
+
+    os.replace(tmp, path)
+    return path
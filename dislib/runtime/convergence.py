@@ -0,0 +1,124 @@
+from collections import deque
+
+from dislib.runtime.base import compss_wait_on, compss_delete_object
+
+
+class ConvergenceController(object):
+    """ Checks the convergence criterion of an iterative estimator a number
+    of iterations late.
+
+    Waiting for the convergence criterion of each iteration before
+    submitting the next one leaves the workers idle while the driver
+    synchronizes. With a lag of k, the criterion of iteration i is only
+    waited for after submitting iteration i + k, so the tasks of the next
+    iterations keep the workers busy in the meantime.
+
+    Criteria are checked in order, and the state of the model in each
+    iteration is kept until it is checked. When an iteration converges,
+    the state and criteria of the surplus iterations submitted after it are
+    deleted, and the estimator is left in the state of the iteration that
+    converged. Thus, the results are the same for any lag, at the cost of
+    running up to k extra iterations.
+
+    Parameters
+    ----------
+    lag : int, optional (default=0)
+        Number of iterations submitted before checking the criterion of an
+        iteration. If 0, the criterion of each iteration is checked right
+        after submitting it.
+    check : callable
+        Function that takes the value of the criterion of an iteration and
+        its number (starting from 1), and returns whether the estimator has
+        converged.
+    iteration : int, optional (default=0)
+        Number of iterations already performed (e.g., when resuming a fit
+        from a checkpoint).
+    state : object, optional (default=None)
+        State of the model before the iterations are added, which is
+        returned by :meth:`finish` if no iterations are added.
+
+    Attributes
+    ----------
+    converged : bool
+        Whether an iteration has converged.
+    iteration : int
+        Number of iterations checked.
+    state : object
+        State of the last iteration checked.
+    """
+
+    def __init__(self, lag=0, check=None, iteration=0, state=None):
+        if lag < 0:
+            raise ValueError("Convergence lag must be a non-negative "
+                             "number of iterations.")
+
+        self.lag = lag
+        self.check = check
+        self.converged = False
+        self.iteration = iteration
+        self.state = state
+        self._pending = deque()
+
+    def add(self, criterion, state):
+        """ Adds the next iteration, and checks the criteria of the
+        iterations submitted more than lag iterations ago.
+
+        Parameters
+        ----------
+        criterion : object
+            Convergence criterion of the iteration (usually a future).
+        state : object
+            State of the model after the iteration, which is returned by
+            :meth:`finish` if the iteration converges or is the last one.
+
+        Returns
+        -------
+        converged : bool
+            Whether an iteration has converged, in which case no more
+            iterations should be added.
+        """
+        self._pending.append((criterion, state))
+
+        while len(self._pending) > self.lag and not self.converged:
+            self._check_next()
+
+        return self.converged
+
+    def finish(self):
+        """ Checks the criteria of the pending iterations.
+
+        Returns
+        -------
+        state : object
+            State of the iteration that converged, or of the last iteration
+            if none converged.
+        """
+        while self._pending and not self.converged:
+            self._check_next()
+
+        self._discard()
+        return self.state
+
+    def _check_next(self):
+        criterion, self.state = self._pending.popleft()
+        self.iteration += 1
+        self.converged = bool(self.check(compss_wait_on(criterion),
+                                         self.iteration))
+
+        if self.converged:
+            self._discard()
+
+    def _discard(self):
+        while self._pending:
+            _delete(self._pending.popleft())
+
+
+def _delete(obj):
+    if isinstance(obj, (list, tuple)):
+        for item in obj:
+            _delete(item)
+    elif isinstance(obj, dict):
+        for item in obj.values():
+            _delete(item)
+    elif obj is not None:
+        compss_delete_object(obj)
@@ -0,0 +1,319 @@
+import functools
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+from scipy.sparse import issparse
+
+# Profiles recording the tasks that are run
+_active = []
+_lock = threading.Lock()
+
+# Phase of the estimator running in the driver, and time spent in each
+# section of the task running in the current thread
+_local = threading.local()
+
+
+class Profile(object):
+    """ Records the tasks run by dislib.
+
+    Profiles are created with :meth:`dislib.profile <dislib.profile>`, and
+    record, for every task run while they are active, its name, start and end
+    times, time spent merging blocks, size of its inputs and outputs (in
+    bytes), worker where it ran, and the phase of the estimator that
+    submitted it (e.g., the E-step of a GaussianMixture).
+
+    Tasks are recorded when they are run sequentially (without the COMPSs
+    runtime) or by a local executor (see :meth:`dislib.runtime.set_executor
+    <dislib.runtime.set_executor>`). Tasks run by the COMPSs runtime (e.g.,
+    with runcompss) return before they run, and thus, are not recorded,
+    although phases are. They can be traced with the tracing options of
+    COMPSs instead.
+
+    Attributes
+    ----------
+    tasks : list
+        List of dicts with the record of each task.
+    phases : list
+        List of dicts with the estimator, name, start and end times of each
+        phase.
+    start : float
+        Time when the profile started.
+    end : float
+        Time when the profile stopped, or None if it is active.
+    """
+
+    def __init__(self):
+        self.tasks = []
+        self.phases = []
+        self.start = None
+        self.end = None
+
+    def __enter__(self):
+        self.start = time.time()
+
+        with _lock:
+            _active.append(self)
+
+        return self
+
+    def __exit__(self, *args):
+        with _lock:
+            _active.remove(self)
+
+        self.end = time.time()
+
+    def summary(self):
+        """ Returns a summary of the recorded tasks and phases.
+
+        Returns
+        -------
+        summary : dict
+            Dict with the total wall time of the profile ('wall_time'),
+            the count, total time, merge time, and input and output bytes
+            of each task type ('tasks'), and the count, wall time and
+            total time of the tasks of each phase of each estimator
+            ('phases'). Times are in seconds.
+        """
+        end = self.end if self.end is not None else time.time()
+        tasks = defaultdict(lambda: {"count": 0, "time": 0.0,
+                                     "merge_time": 0.0, "input_bytes": 0,
+                                     "output_bytes": 0})
+        phases = defaultdict(lambda: defaultdict(
+            lambda: {"count": 0, "time": 0.0, "task_time": 0.0,
+                     "tasks": 0}))
+
+        for record in self.tasks:
+            stats = tasks[record["name"]]
+            stats["count"] += 1
+            stats["time"] += record["end"] - record["start"]
+            stats["merge_time"] += record["merge_time"]
+            stats["input_bytes"] += record["input_bytes"]
+            stats["output_bytes"] += record["output_bytes"]
+
+            if record["phase"] is not None:
+                estimator, name = record["phase"]
+                stats = phases[estimator][name]
+                stats["tasks"] += 1
+                stats["task_time"] += record["end"] - record["start"]
+
+        for record in self.phases:
+            stats = phases[record["estimator"]][record["name"]]
+            stats["count"] += 1
+            stats["time"] += record["end"] - record["start"]
+
+        return {"wall_time": end - self.start,
+                "tasks": {name: dict(stats) for name, stats in tasks.items()},
+                "phases": {estimator: {name: dict(stats)
+                                       for name, stats in est_phases.items()}
+                           for estimator, est_phases in phases.items()}}
+
+    def save_summary(self, path):
+        """ Saves the summary of the profile to a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the output file.
+        """
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def export_chrome_trace(self, path):
+        """ Saves the recorded tasks and phases in the Chrome trace format,
+        which can be opened with chrome://tracing or Perfetto.
+
+        Each worker process is shown as a different process of the trace, and
+        the phases of the estimators as a separate 'phases' process.
+
+        Parameters
+        ----------
+        path : str
+            Path of the output file.
+        """
+        events = [_metadata("process_name", 0, 0, "phases")]
+        pids = {}
+        tids = {}
+
+        for record in self.phases:
+            events.append({"name": "%s.%s" % (record["estimator"],
+                                              record["name"]),
+                           "cat": "phase", "ph": "X", "pid": 0, "tid": 0,
+                           "ts": self._timestamp(record["start"]),
+                           "dur": _micros(record["end"] - record["start"])})
+
+        for record in self.tasks:
+            process, thread = record["worker"].rsplit(":", 1)
+
+            if process not in pids:
+                pids[process] = len(pids) + 1
+                events.append(_metadata("process_name", pids[process], 0,
+                                        process))
+
+            pid = pids[process]
+
+            if (pid, thread) not in tids:
+                tids[pid, thread] = len(tids) + 1
+                events.append(_metadata("thread_name", pid,
+                                        tids[pid, thread], thread))
+
+            args = {key: record[key] for key in ("merge_time", "input_bytes",
+                                                 "output_bytes")}
+
+            if record["phase"] is not None:
+                args["phase"] = "%s.%s" % record["phase"]
+
+            events.append({"name": record["name"], "cat": "task", "ph": "X",
+                           "pid": pid, "tid": tids[pid, thread],
+                           "ts": self._timestamp(record["start"]),
+                           "dur": _micros(record["end"] - record["start"]),
+                           "args": args})
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def _timestamp(self, t):
+        return _micros(t - self.start)
+
+
+def profile():
+    """ Returns a :class:`Profile <dislib.runtime.tracing.Profile>` that
+    records the tasks run by dislib while it is active.
+
+    Examples
+    --------
+    >>> import dislib as ds
+    >>> from dislib.cluster import GaussianMixture
+    >>>
+    >>>
+    >>> if __name__ == '__main__':
+    >>>     x = ds.random_array((1000, 10), (100, 10))
+    >>>     with ds.profile() as prof:
+    >>>         GaussianMixture(n_components=4).fit(x)
+    >>>     print(prof.summary()["phases"]["GaussianMixture"])
+    >>>     prof.export_chrome_trace("gm.json")
+    """
+    return Profile()
+
+
+@contextmanager
+def phase(estimator, name):
+    """ Marks a phase of an estimator (e.g., an E-step). Tasks submitted in
+    the phase are recorded as part of it. """
+    if not _active:
+        yield
+        return
+
+    previous = getattr(_local, "phase", None)
+    current = (type(estimator).__name__, name)
+    _local.phase = current
+    start = time.time()
+
+    try:
+        yield
+    finally:
+        _local.phase = previous
+        record = {"estimator": current[0], "name": name, "start": start,
+                  "end": time.time()}
+
+        for prof in active_profiles():
+            prof.phases.append(record)
+
+
+@contextmanager
+def section(name):
+    """ Adds the time spent in the block to the given section of the task
+    running in the current thread (if it is being profiled). """
+    sections = getattr(_local, "sections", None)
+
+    if sections is None:
+        yield
+        return
+
+    start = time.time()
+
+    try:
+        yield
+    finally:
+        sections[name] = sections.get(name, 0.0) + time.time() - start
+
+
+def timed(name):
+    """ Decorator that adds the time spent in the function to the given
+    section of the task that calls it. """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "sections", None) is None:
+                return func(*args, **kwargs)
+
+            with section(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def active_profiles():
+    with _lock:
+        return list(_active)
+
+
+def current_phase():
+    return getattr(_local, "phase", None)
+
+
+def begin_task():
+    _local.sections = {}
+
+
+def end_task(name, start, end, input_bytes, output_bytes):
+    sections = _local.sections
+    _local.sections = None
+    worker = "%s:%d:%s" % (socket.gethostname(), os.getpid(),
+                           threading.current_thread().name)
+
+    return {"name": name, "start": start, "end": end,
+            "merge_time": sections.get("merge", 0.0),
+            "input_bytes": input_bytes, "output_bytes": output_bytes,
+            "worker": worker, "phase": None}
+
+
+def add_record(record, profiles):
+    for prof in profiles:
+        prof.tasks.append(record)
+
+
+def nbytes(obj):
+    """ Approximate size in bytes of obj. """
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+
+    if issparse(obj):
+        return sum(getattr(obj, attr).nbytes
+                   for attr in ("data", "indices", "indptr", "row", "col")
+                   if hasattr(obj, attr))
+
+    if isinstance(obj, (list, tuple)):
+        return sum(nbytes(item) for item in obj)
+
+    if isinstance(obj, dict):
+        return sum(nbytes(item) for item in obj.values())
+
+    return sys.getsizeof(obj)
+
+
+def _micros(seconds):
+    return seconds * 1e6
+
+
+def _metadata(name, pid, tid, value):
+    return {"name": name, "ph": "M", "pid": pid, "tid": tid,
+            "args": {"name": value}}
@@ -1,10 +1,9 @@
 import numpy as np
-from pycompss.api.api import compss_delete_object
 from pycompss.api.parameter import COLLECTION_INOUT, Type, COLLECTION_IN, Depth
-from pycompss.api.task import task
 from scipy.sparse import issparse, vstack
 
 from dislib.data.array import Array
+from dislib.runtime import task, compss_delete_object
 
 
 def shuffle(x, y=None, random_state=None):
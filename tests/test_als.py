@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import unittest
 
 import numpy as np
@@ -92,6 +95,64 @@ class ALSTest(unittest.TestCase):
                         predictions[1] < 1 and
                         predictions[2] > 4.5)
 
+    def test_convergence_lag(self):
+        """ Tests that checking convergence with a lag gives the same
+        results. """
+        train, test = load_movielens()
+
+        als = ALS(tol=0.01, random_state=666, n_f=10)
+        als.fit(train, test)
+
+        als_lag = ALS(tol=0.01, random_state=666, n_f=10, convergence_lag=2)
+        als_lag.fit(train, test)
+
+        self.assertEqual(als_lag.converged, als.converged)
+        self.assertTrue(np.allclose(als_lag.users, als.users))
+        self.assertTrue(np.allclose(als_lag.items, als.items))
+
+    def test_checkpoint(self):
+        """ Tests resuming a fit from a checkpoint. """
+        data = np.array([[0, 0, 5], [3, 0, 5], [3, 1, 2], [0, 4, 1]])
+        train = ds.array(x=csr_matrix(data), block_size=(2, 2))
+        path = tempfile.mkdtemp()
+
+        try:
+            als = ALS(tol=0.01, random_state=666, n_f=2)
+            als.fit(train)
+
+            als_part = ALS(tol=0.01, random_state=666, n_f=2, max_iter=2)
+            als_part.fit(train, checkpoint_dir=path)
+            self.assertFalse(als_part.converged)
+
+            als_res = ALS(tol=0.01, n_f=2)
+            als_res.fit(train, checkpoint_dir=path, resume=True)
+
+            self.assertTrue(als_res.converged)
+            self.assertTrue(np.allclose(als_res.users, als.users))
+            self.assertTrue(np.allclose(als_res.items, als.items))
+        finally:
+            shutil.rmtree(path)
+
+    def test_checkpoint_no_convergence(self):
+        """ Tests resuming a fit with convergence checks from a checkpoint
+        saved without them. """
+        data = np.array([[0, 0, 5], [3, 0, 5], [3, 1, 2], [0, 4, 1]])
+        train = ds.array(x=csr_matrix(data), block_size=(2, 2))
+        path = tempfile.mkdtemp()
+
+        try:
+            als_part = ALS(tol=0.01, random_state=666, n_f=2, max_iter=3,
+                           check_convergence=False)
+            als_part.fit(train, checkpoint_dir=path)
+            os.remove(os.path.join(path, "final.pkl"))
+
+            als_res = ALS(tol=0.01, n_f=2)
+            als_res.fit(train, checkpoint_dir=path, resume=True)
+
+            self.assertTrue(als_res.converged)
+        finally:
+            shutil.rmtree(path)
+
 
 def main():
     unittest.main()
@@ -1,15 +1,18 @@
-# import os
+import json
+import os
+import shutil
+import tempfile
 import unittest
 from math import ceil
 
 import numpy as np
-from pycompss.api.api import compss_wait_on
 from scipy import sparse as sp
 from scipy.sparse import issparse, csr_matrix
 from sklearn.datasets import load_svmlight_file
 
 import dislib as ds
 from dislib.data.array import Array
+from dislib.runtime import compss_wait_on
 
 
 def equal(arr1, arr2):
@@ -104,6 +107,27 @@ class DataLoadingTest(unittest.TestCase):
         _validate_arrays(self, arr_x, x.toarray(), (bn, bm))
         _validate_arrays(self, arr_y, y, (bn, 1))
 
+    def test_load_libsvm_file_parallel(self):
+        """ Tests loading a LibSVM file reading byte ranges in the workers.
+        """
+        file_ = "tests/files/libsvm/1"
+
+        x, y = load_svmlight_file(file_, n_features=780)
+
+        bn, bm = 25, 100
+
+        arr_x, arr_y = ds.load_svmlight_file(file_, (25, 100), n_features=780,
+                                             store_sparse=True, parallel=True)
+
+        _validate_arrays(self, arr_x, x, (bn, bm))
+        _validate_arrays(self, arr_y, y, (bn, 1))
+
+        arr_x, arr_y = ds.load_svmlight_file(file_, (25, 100), n_features=780,
+                                             store_sparse=False, parallel=True)
+
+        _validate_arrays(self, arr_x, x.toarray(), (bn, bm))
+        _validate_arrays(self, arr_y, y, (bn, 1))
+
     def test_load_csv_file(self):
         """ Tests loading a CSV file. """
         csv_f = "tests/files/csv/1"
@@ -124,6 +148,193 @@ class DataLoadingTest(unittest.TestCase):
 
         self.assertTrue(np.array_equal(data.collect(), csv))
 
+    def test_load_csv_file_parallel(self):
+        """ Tests loading a CSV file reading byte ranges in the workers. """
+        csv_f = "tests/files/csv/1"
+
+        data = ds.load_txt_file(csv_f, block_size=(300, 50), parallel=True)
+        csv = np.loadtxt(csv_f, delimiter=",")
+
+        self.assertEqual(data._top_left_shape, (300, 50))
+        self.assertEqual(data._reg_shape, (300, 50))
+        self.assertEqual(data.shape, (4235, 122))
+        self.assertEqual(data._n_blocks, (15, 3))
+        self.assertEqual(compss_wait_on(data._blocks[14][2]).shape, (35, 22))
+
+        self.assertTrue(np.array_equal(data.collect(), csv))
+
+        data = ds.load_txt_file(csv_f, block_size=(7, 122), parallel=True)
+        self.assertTrue(np.array_equal(data.collect(), csv))
+
+        csv_f = "tests/files/other/4"
+        data = ds.load_txt_file(csv_f, block_size=(1000, 122), delimiter=" ",
+                                parallel=True)
+        csv = np.loadtxt(csv_f, delimiter=" ")
+
+        self.assertTrue(np.array_equal(data.collect(), csv))
+
+    def test_load_npy_file(self):
+        """ Tests loading a .npy file. """
+        x = np.random.rand(43, 17)
+        fd, path = tempfile.mkstemp(suffix=".npy")
+        os.close(fd)
+
+        try:
+            np.save(path, x)
+            data = ds.load_npy_file(path, block_size=(10, 5))
+
+            _validate_arrays(self, data, x, (10, 5))
+            self.assertEqual(data._top_left_shape, (10, 5))
+            self.assertEqual(data._n_blocks, (5, 4))
+
+            np.save(path, np.asfortranarray(x))
+            data = ds.load_npy_file(path, block_size=(43, 3))
+            self.assertTrue(np.array_equal(data.collect(), x))
+
+            np.save(path, np.arange(5))
+            self.assertRaises(ValueError, ds.load_npy_file, path, (2, 2))
+        finally:
+            os.remove(path)
+
+    def test_array_scratch(self):
+        """ Tests creating ds-arrays from files in a scratch directory. """
+        scratch = tempfile.mkdtemp()
+
+        try:
+            x = np.random.rand(43, 17)
+            data = ds.array(x, block_size=(10, 5), scratch=scratch)
+            _validate_arrays(self, data, x, (10, 5))
+            self.assertEqual(len(os.listdir(scratch)), 1)
+
+            # derived ds-arrays can be computed after removing the file
+            res = data[3:20] * 2
+            data.remove_scratch()
+            self.assertEqual(os.listdir(scratch), [])
+            self.assertTrue(np.array_equal(res.collect(), x[3:20] * 2))
+            data.remove_scratch()
+
+            # memory-mapped .npy files are not written again
+            path = os.path.join(scratch, "x.npy")
+            np.save(path, x)
+            mapped = np.load(path, mmap_mode="r")
+            data = ds.array(mapped, block_size=(43, 3), scratch=scratch)
+            self.assertTrue(np.array_equal(data.collect(), x))
+            self.assertEqual(len(os.listdir(scratch)), 1)
+
+            data = ds.array(mapped[1:, 2:], block_size=(10, 5),
+                            scratch=scratch)
+            self.assertTrue(np.array_equal(data.collect(), x[1:, 2:]))
+            self.assertEqual(len(os.listdir(scratch)), 2)
+
+            # mapped files are not removed
+            data.remove_scratch()
+            self.assertEqual(os.listdir(scratch), ["x.npy"])
+
+            x = sp.random(43, 17, density=0.2, format="csr")
+            data = ds.array(x, block_size=(10, 5), scratch=scratch)
+            _validate_arrays(self, data, x, (10, 5))
+            self.assertTrue(data._sparse)
+            self.assertEqual(data.nnz, x.nnz)
+            data.remove_scratch()
+            self.assertEqual(os.listdir(scratch), ["x.npy"])
+
+            self.assertRaises(ValueError, ds.array, np.arange(5), (2, 2),
+                              scratch=scratch)
+        finally:
+            shutil.rmtree(scratch)
+
+    def test_save_load(self):
+        """ Tests saving and loading ds-arrays. """
+        path = tempfile.mkdtemp()
+
+        try:
+            x = np.random.rand(43, 17).astype(np.float32)
+            data = ds.array(x, block_size=(10, 5))[3:, 1:]
+
+            for compression in [None, "zlib", "lzma"]:
+                data.save(path, compression=compression)
+                loaded = ds.load(path)
+
+                self.assertEqual(loaded.shape, data.shape)
+                self.assertEqual(loaded._top_left_shape, data._top_left_shape)
+                self.assertEqual(loaded._reg_shape, data._reg_shape)
+                self.assertEqual(loaded._n_blocks, data._n_blocks)
+                self.assertFalse(loaded._sparse)
+                self.assertTrue(np.array_equal(loaded.collect(), x[3:, 1:]))
+
+            with open(os.path.join(path, "metadata.json")) as f:
+                self.assertEqual(json.load(f)["dtype"], "<f4")
+
+            x = sp.random(43, 17, density=0.2, format="csr", random_state=0)
+            data = ds.array(x, block_size=(10, 5))
+            data.save(path, compression="zlib")
+            loaded = ds.load(path)
+
+            self.assertTrue(loaded._sparse)
+            self.assertTrue(equal(loaded.collect(), x))
+
+            self.assertRaises(ValueError, data.save, path, "invalid")
+        finally:
+            shutil.rmtree(path)
+
+    def test_filesystem_storage(self):
+        """ Tests persistent ds-arrays in the file system. """
+        root = tempfile.mkdtemp()
+
+        try:
+            x = np.random.rand(43, 17)
+            data = ds.array(x, block_size=(10, 5))
+            path = os.path.join(root, "path")
+            self.assertIs(data.make_persistent(path, "filesystem"), data)
+            self.assertTrue(os.path.isfile(os.path.join(path,
+                                                        "metadata.json")))
+
+            storage = ds.FileSystemStorage(root=root)
+            data = ds.array(x, block_size=(10, 5))
+            data.make_persistent("dense", storage=storage)
+            loaded = ds.load_from_storage("dense", storage=storage)
+
+            self.assertEqual(loaded._n_blocks, data._n_blocks)
+            self.assertTrue(np.array_equal(loaded.collect(), x))
+
+            # slices are read from the block files
+            for arr in [data, loaded]:
+                self.assertTrue(np.array_equal(arr[7:31, 3:12].collect(),
+                                               x[7:31, 3:12]))
+                self.assertTrue(np.array_equal(arr[12:].collect(), x[12:]))
+                self.assertTrue(np.array_equal(arr[[1, 20]].collect(),
+                                               x[[1, 20]]))
+                self.assertEqual(arr[4, 5].collect(), x[4, 5])
+
+            # rechunked ds-arrays are not persistent
+            for block_size in [(8, 8), (10, 6)]:
+                loaded = ds.load_from_storage("dense", storage=storage,
+                                              block_size=block_size)
+                self.assertEqual(loaded._reg_shape, block_size)
+                self.assertIsNone(getattr(loaded, "_storage", None))
+                self.assertTrue(np.array_equal(loaded[3:25, 0:10].collect(),
+                                               x[3:25, 0:10]))
+
+            # blocks that do not match the stored ones are not read from the
+            # block files
+            other = ds.array(x, block_size=(10, 6))
+            self.assertIsNone(storage.getitem(other, "dense",
+                                              (slice(3, 25), slice(0, 10))))
+
+            x = sp.random(43, 17, density=0.2, format="csr", random_state=0)
+            storage = ds.FileSystemStorage(root=root, compression="zlib")
+            ds.array(x, block_size=(10, 5)).make_persistent("sparse", storage)
+            loaded = ds.load_from_storage("sparse", storage=storage)
+
+            self.assertTrue(loaded._sparse)
+            self.assertTrue(equal(loaded.collect(), x))
+            self.assertTrue(equal(loaded[7:31, 3:12].collect(),
+                                  x[7:31, 3:12]))
+
+            self.assertRaises(ValueError, data.make_persistent, "x", "invalid")
+        finally:
+            shutil.rmtree(root)
+
 
 class ArrayTest(unittest.TestCase):
     def test_sizes(self):
@@ -397,6 +608,59 @@ class ArrayTest(unittest.TestCase):
         self.assertFalse(np.array_equal(arr1.collect(), arr3.collect()))
         self.assertFalse(np.array_equal(arr4.collect(), arr5.collect()))
 
+    def test_constructors(self):
+        """ Tests creating constant and eye ds-arrays """
+        arr = ds.zeros((23, 17), (5, 4))
+        self.assertEqual(arr._n_blocks, (5, 5))
+        self.assertEqual(compss_wait_on(arr._blocks[4][4]).shape, (3, 1))
+        self.assertTrue(np.array_equal(arr.collect(), np.zeros((23, 17))))
+        self.assertEqual(arr.dtype, np.float64)
+
+        arr = ds.ones((23, 17), (5, 4), dtype=np.int32)
+        self.assertTrue(np.array_equal(arr.collect(), np.ones((23, 17))))
+        self.assertEqual(arr.collect().dtype, np.int32)
+
+        arr = ds.full((3, 4), (5, 5), 7)
+        self.assertTrue(np.array_equal(arr.collect(), np.full((3, 4), 7)))
+
+        for k in (-7, -2, 0, 3, 16):
+            arr = ds.eye(13, (5, 4), m=17, k=k)
+            self.assertTrue(arr._sparse)
+            self.assertTrue(np.array_equal(arr.collect().toarray(),
+                                           np.eye(13, 17, k=k)))
+
+        arr = ds.identity(11, (4, 4))
+        self.assertTrue(np.array_equal(arr.collect().toarray(), np.eye(11)))
+
+        self.assertRaises(ValueError, ds.zeros, (0, 3), (2, 2))
+        self.assertRaises(ValueError, ds.ones, (5, 3), (2, -2))
+
+    def test_random_constructors(self):
+        """ Tests random normal and random sparse ds-arrays """
+        arr1 = ds.random_normal((300, 40), (70, 15), loc=5, scale=2,
+                                random_state=88)
+        arr2 = ds.random_normal((300, 40), (70, 15), loc=5, scale=2,
+                                random_state=88)
+        x = arr1.collect()
+
+        self.assertEqual(arr1._n_blocks, (5, 3))
+        self.assertTrue(np.array_equal(x, arr2.collect()))
+        self.assertAlmostEqual(x.mean(), 5, delta=0.2)
+        self.assertAlmostEqual(x.std(), 2, delta=0.2)
+
+        arr1 = ds.random_sparse((300, 40), (70, 15), density=0.1,
+                                random_state=88)
+        arr2 = ds.random_sparse((300, 40), (70, 15), density=0.1,
+                                random_state=88)
+        x = arr1.collect()
+
+        self.assertTrue(arr1._sparse)
+        self.assertTrue(issparse(x))
+        self.assertEqual(x.shape, (300, 40))
+        self.assertEqual(x.nnz, 1200)
+        self.assertTrue(equal(x, arr2.collect()))
+        self.assertRaises(ValueError, ds.random_sparse, (3, 3), (2, 2), 2)
+
     def test_apply_axis(self):
         """ Tests apply along axis"""
         x = ds.array(np.array([[1, 2, 3], [4, 5, 6], [7, 8, 9]]),
@@ -464,6 +728,614 @@ class ArrayTest(unittest.TestCase):
         self.assertTrue((x.mean().collect() == [4, 5, 6]).all())
         self.assertTrue((x.sum().collect() == [12, 15, 18]).all())
 
+    def test_rechunk(self):
+        """ Tests changing the block size of a ds-array """
+        x = np.random.rand(23, 17)
+        data = ds.array(x, block_size=(4, 3))
+
+        res = data.rechunk((7, 5))
+        self.assertEqual(res._top_left_shape, (7, 5))
+        self.assertEqual(res._reg_shape, (7, 5))
+        self.assertEqual(res._n_blocks, (4, 4))
+        self.assertEqual(compss_wait_on(res._blocks[3][3]).shape, (2, 2))
+        self.assertTrue(np.array_equal(res.collect(), x))
+
+        res = data.rechunk((8, 3))
+        self.assertIsNot(res._blocks[0][0], data._blocks[0][0])
+        self.assertTrue(np.array_equal(res.collect(), x))
+
+        # unchanged blocks are reused
+        sliced = data[4:, 3:]
+        res = sliced.rechunk((4, 3))
+        self.assertIs(res._blocks[4][4], sliced._blocks[4][4])
+        self.assertTrue(np.array_equal(res.collect(), x[4:, 3:]))
+
+        # irregular arrays become regular
+        sliced = data[3:, 1:]
+        res = sliced.rechunk((4, 3))
+        self.assertEqual(res._top_left_shape, (4, 3))
+        self.assertEqual(res._n_blocks, (5, 6))
+        self.assertTrue(np.array_equal(res.collect(), x[3:, 1:]))
+
+        res = data[[0, 3, 5, 6, 7, 12, 22]].rechunk('balanced')
+        self.assertEqual(res._reg_shape, (4, 3))
+        self.assertTrue(np.array_equal(res.collect(),
+                                       x[[0, 3, 5, 6, 7, 12, 22]]))
+
+        res = data[5:].rechunk('balanced')
+        self.assertEqual(res._top_left_shape, (4, 3))
+        self.assertEqual(res._n_blocks, (5, 6))
+        self.assertTrue(np.array_equal(res.collect(), x[5:]))
+
+        x = sp.random(23, 17, density=0.2, format="csr", random_state=0)
+        data = ds.array(x, block_size=(4, 3))
+        res = data.rechunk((10, 10))
+        self.assertTrue(res._sparse)
+        self.assertTrue(equal(res.collect(), x))
+
+        self.assertRaises(ValueError, data.rechunk, (0, 3))
+        self.assertRaises(ValueError, data.rechunk, 'invalid')
+
+    def test_iter_collect(self):
+        """ Tests iterating over the contents of a ds-array """
+        x = np.random.rand(23, 17)
+        data = ds.array(x, block_size=(4, 3))
+
+        for prefetch in [1, 2, 6, 10]:
+            rows = list(data.iter_collect(prefetch=prefetch))
+            self.assertEqual(len(rows), 6)
+            self.assertEqual(rows[0].shape, (4, 17))
+            self.assertTrue(np.array_equal(np.vstack(rows), x))
+
+        cols = list(data.iter_collect(axis=1, prefetch=4))
+        self.assertEqual(len(cols), 6)
+        self.assertEqual(cols[-1].shape, (23, 2))
+        self.assertTrue(np.array_equal(np.hstack(cols), x))
+
+        x = sp.random(23, 17, density=0.2, format="csr", random_state=0)
+        data = ds.array(x, block_size=(4, 3))
+        rows = list(data.iter_collect(prefetch=4))
+        self.assertTrue(issparse(rows[0]))
+        self.assertTrue(equal(sp.vstack(rows), x))
+
+        self.assertRaises(ValueError, next, data.iter_collect(axis=2))
+        self.assertRaises(ValueError, next, data.iter_collect(prefetch=0))
+
+    def test_block_metadata(self):
+        """ Tests nnz, nbytes and dtype, and the metadata of the blocks """
+        x = np.random.rand(13, 7).astype(np.float32)
+        data = ds.array(x, block_size=(4, 3))
+
+        self.assertEqual(data.nnz, x.size)
+        self.assertEqual(data.nbytes, x.nbytes)
+        self.assertEqual(data.dtype, np.float32)
+        self.assertEqual(data._block_meta[3][2].rows, 1)
+        self.assertEqual(data._block_meta[3][2].cols, 1)
+
+        # metadata computed by tasks
+        res = data[1:, 2:] * 2
+        self.assertIsNone(res._block_meta)
+        self.assertEqual(res.nnz, 12 * 5)
+        self.assertEqual(res.dtype, np.float32)
+        self.assertEqual(res._block_meta[0][0].rows, 3)
+        self.assertEqual(res._block_meta[0][0].cols, 1)
+
+        data = ds.random_array((13, 7), (4, 3))
+        self.assertEqual(data.nbytes, 13 * 7 * 8)
+        self.assertEqual(data.dtype, np.float64)
+
+        x = sp.random(13, 7, density=0.2, format="csr", random_state=0)
+        data = ds.array(x, block_size=(4, 3))
+        self.assertEqual(data.nnz, x.nnz)
+        self.assertEqual((data * 2).nnz, x.nnz)
+        self.assertEqual(data.dtype, x.dtype)
+
+        # metadata returned alongside the blocks
+        res = data * 2
+        res._blocks
+        self.assertTrue(all(meta is not None for row in res._block_meta
+                            for meta in row))
+        self.assertEqual(res.nnz, x.nnz)
+
+        data = ds.random_sparse((13, 7), (4, 3), density=0.5, random_state=0)
+        self.assertEqual(data.nnz, data.collect().nnz)
+
+        # metadata computed by tasks after rechunking
+        res = res.rechunk((5, 5))
+        self.assertIsNone(res._block_meta)
+        self.assertEqual(res.nnz, x.nnz)
+        self.assertEqual(res._block_meta[2][1].rows, 3)
+
+    def test_reductions(self):
+        """ Tests tree reductions along an axis """
+        x_np = np.random.rand(23, 17) - 0.5
+        x = ds.array(x_np, block_size=(4, 3))[1:, 2:]
+        x_np = x_np[1:, 2:]
+
+        for axis in [0, 1]:
+            for arity in [2, 50]:
+                self.assertTrue(np.allclose(x.min(axis, arity).collect(),
+                                            x_np.min(axis)))
+                self.assertTrue(np.allclose(x.max(axis, arity).collect(),
+                                            x_np.max(axis)))
+                self.assertTrue(np.allclose(x.sum(axis, arity).collect(),
+                                            x_np.sum(axis)))
+                self.assertTrue(np.allclose(x.mean(axis, arity).collect(),
+                                            x_np.mean(axis)))
+
+        res = x.sum(axis=1)
+        self.assertEqual(res.shape, (22, 1))
+        self.assertEqual(res._top_left_shape, (x._top_left_shape[0], 1))
+        self.assertEqual(res._n_blocks, (x._n_blocks[0], 1))
+
+        x_sp = sp.random(23, 17, density=0.2, format="csr", random_state=0)
+        x = ds.array(x_sp, block_size=(4, 3))
+        x_sp = x_sp.toarray()
+
+        for axis in [0, 1]:
+            self.assertTrue(np.allclose(x.min(axis, 2).collect(),
+                                        x_sp.min(axis)))
+            self.assertTrue(np.allclose(x.max(axis, 2).collect(),
+                                        x_sp.max(axis)))
+            self.assertTrue(np.allclose(x.mean(axis, 2).collect(),
+                                        x_sp.mean(axis)))
+
+        self.assertRaises(ValueError, x.sum, 2)
+
+    def test_elementwise_operators(self):
+        """ Tests element-wise arithmetic operators """
+        x_np = np.random.rand(13, 7) + 1
+        y_np = np.random.rand(13, 7) + 1
+        x = ds.array(x_np, block_size=(4, 3))
+        y = ds.array(y_np, block_size=(4, 3))
+
+        self.assertTrue(np.allclose((x + y).collect(), x_np + y_np))
+        self.assertTrue(np.allclose((x - y).collect(), x_np - y_np))
+        self.assertTrue(np.allclose((x * y).collect(), x_np * y_np))
+        self.assertTrue(np.allclose((x / y).collect(), x_np / y_np))
+        self.assertTrue(np.allclose((x ** 2).collect(), x_np ** 2))
+        self.assertTrue(np.allclose((2 - x).collect(), 2 - x_np))
+        self.assertTrue(np.allclose((1 / x).collect(), 1 / x_np))
+        self.assertTrue(np.allclose((-x).collect(), -x_np))
+        self.assertTrue(np.allclose(abs(x - 1.5).collect(),
+                                    abs(x_np - 1.5)))
+        self.assertTrue(np.allclose(np.sqrt(x).collect(), np.sqrt(x_np)))
+        self.assertTrue(np.allclose(np.log(x).collect(), np.log(x_np)))
+
+        # irregular ds-arrays
+        x_np = x_np[1:, 2:]
+        x = x[1:, 2:]
+        res = x * 3 + x
+        self.assertTrue(np.allclose(res.collect(), x_np * 3 + x_np))
+        self.assertEqual(res._top_left_shape, x._top_left_shape)
+
+        self.assertRaises(ValueError, lambda: x + y)
+        self.assertRaises(TypeError, lambda: x + "a")
+
+    def test_elementwise_broadcast(self):
+        """ Tests element-wise operators with row and column vectors """
+        x_np = np.random.rand(13, 7)
+        x = ds.array(x_np, block_size=(4, 3))
+
+        mean = x.mean(axis=0)
+        var = ((x - mean) ** 2).mean(axis=0)
+        res = (x - mean) / np.sqrt(var)
+        expected = (x_np - x_np.mean(axis=0)) / x_np.std(axis=0)
+
+        self.assertEqual(res.shape, x.shape)
+        self.assertEqual(res._n_blocks, x._n_blocks)
+        self.assertTrue(np.allclose(res.collect(), expected))
+
+        row_sum = x.sum(axis=1)
+        res = x / row_sum
+        expected = x_np / x_np.sum(axis=1, keepdims=True)
+        self.assertTrue(np.allclose(res.collect(), expected))
+
+        vector = np.arange(7)
+        self.assertTrue(np.allclose((x * vector).collect(), x_np * vector))
+        self.assertTrue(np.allclose((vector + x).collect(), vector + x_np))
+
+        # one lazy operand used in several expressions
+        centered = x - mean
+        self.assertTrue(np.allclose((centered * centered).collect(),
+                                    (x_np - x_np.mean(axis=0)) ** 2))
+        self.assertTrue(np.allclose(centered.collect(),
+                                    x_np - x_np.mean(axis=0)))
+        self.assertIsNone(centered._expr)
+
+        self.assertRaises(ValueError, lambda: row_sum + mean)
+
+    def test_elementwise_sparse(self):
+        """ Tests element-wise operators with sparse data """
+        x_np = sp.random(13, 7, density=0.3, format="csr", random_state=0)
+        x = ds.array(x_np, block_size=(4, 3))
+        y = ds.array(x_np.toarray(), block_size=(4, 3))
+
+        res = x * 2 + x
+        self.assertTrue(res._sparse)
+        self.assertTrue(issparse(res.collect()))
+        self.assertTrue(np.allclose(res.collect().toarray(),
+                                    (x_np * 3).toarray()))
+
+        res = np.sqrt(x ** 2) / 2
+        self.assertTrue(res._sparse)
+        self.assertTrue(np.allclose(res.collect().toarray(),
+                                    x_np.toarray() / 2))
+
+        res = x * y
+        self.assertTrue(res._sparse)
+        self.assertTrue(np.allclose(res.collect().toarray(),
+                                    x_np.toarray() ** 2))
+
+        res = x + 1
+        self.assertFalse(res._sparse)
+        self.assertTrue(np.allclose(res.collect(), x_np.toarray() + 1))
+
+        res = x - x.mean(axis=0)
+        self.assertFalse(res._sparse)
+        self.assertTrue(np.allclose(res.collect(), x_np.toarray() -
+                                    x_np.toarray().mean(axis=0)))
+
+        # division by zero follows numpy
+        with np.errstate(divide="ignore", invalid="ignore"):
+            expected = x_np.toarray() / 0
+
+        res = x / 0
+        self.assertFalse(res._sparse)
+        self.assertTrue(np.array_equal(res.collect(), expected,
+                                       equal_nan=True))
+
+    def test_matmul(self):
+        """ Tests matrix multiplication """
+        a_np = np.random.rand(17, 11)
+        b_np = np.random.rand(11, 9)
+        a = ds.array(a_np, block_size=(5, 3))
+        b = ds.array(b_np, block_size=(3, 4))
+
+        res = ds.matmul(a, b)
+        self.assertEqual(res.shape, (17, 9))
+        self.assertEqual(res._reg_shape, (5, 4))
+        self.assertTrue(np.allclose(res.collect(), a_np @ b_np))
+        self.assertTrue(np.allclose((a @ b).collect(), a_np @ b_np))
+        self.assertTrue(np.allclose(ds.matmul(a, b, arity=2).collect(),
+                                    a_np @ b_np))
+
+        gram = ds.matmul(a, a, transpose_a=True)
+        self.assertEqual(gram.shape, (11, 11))
+        self.assertEqual(gram._reg_shape, (3, 3))
+        self.assertTrue(np.allclose(gram.collect(), a_np.T @ a_np))
+
+        res = ds.matmul(a, a, transpose_b=True, arity=2)
+        self.assertTrue(np.allclose(res.collect(), a_np @ a_np.T))
+
+        res = ds.matmul(b, a, transpose_a=True, transpose_b=True)
+        self.assertTrue(np.allclose(res.collect(), b_np.T @ a_np.T))
+
+        self.assertRaises(ValueError, ds.matmul, a, a)
+        self.assertRaises(ValueError, ds.matmul, a,
+                          ds.array(b_np, block_size=(4, 4)))
+
+    def test_matmul_sparse(self):
+        """ Tests matrix multiplication with sparse data """
+        a_np = sp.random(17, 11, density=0.3, format="csr", random_state=0)
+        b_np = np.random.rand(11, 9)
+        a = ds.array(a_np, block_size=(5, 3))
+        b = ds.array(b_np, block_size=(3, 4))
+        a_dense = a_np.toarray()
+
+        res = ds.matmul(a, a, transpose_a=True)
+        self.assertTrue(res._sparse)
+        self.assertTrue(np.allclose(res.collect().toarray(),
+                                    a_dense.T @ a_dense))
+
+        res = ds.matmul(a, b)
+        self.assertFalse(res._sparse)
+        self.assertTrue(np.allclose(res.collect(), a_dense @ b_np))
+
+        res = ds.matmul(b, a, transpose_a=True, transpose_b=True)
+        self.assertFalse(res._sparse)
+        self.assertTrue(np.allclose(res.collect(), b_np.T @ a_dense.T))
+
+    def test_merge_blocks(self):
+        """ Tests merging blocks with and without copies """
+        x = np.random.rand(7, 5)
+        block = x[:3, :2]
+        self.assertIs(Array._merge_blocks([[block]]), block)
+
+        blocks = [[x[:3, :2], x[:3, 2:].astype(np.float32)],
+                  [x[3:, :2], x[3:, 2:]]]
+        merged = Array._merge_blocks(blocks)
+        self.assertTrue(merged.flags["C_CONTIGUOUS"])
+        self.assertEqual(merged.dtype, np.float64)
+        self.assertTrue(np.allclose(merged, x))
+
+        with self.assertRaises(ValueError):
+            Array._merge_blocks([[x[:3, :2], x[:2, 2:]]])
+
+        sparse = csr_matrix(x)
+        merged = Array._merge_blocks([[sparse[:3, :2], sparse[:3, 2:]],
+                                      [sparse[3:, :2], sparse[3:, 2:]]])
+        self.assertTrue(issparse(merged))
+        self.assertTrue(np.array_equal(merged.toarray(), x))
+
+        arr = ds.array(x, block_size=(10, 10))
+        collected = arr.collect()
+        collected[0, 0] = -1
+        self.assertFalse(np.array_equal(collected, arr.collect()))
+
+    def test_virtual_hstack(self):
+        """ Tests lazy horizontal concatenation of blocks """
+        from dislib.data.array import _VirtualHStack
+
+        x = np.random.rand(7, 5)
+        w = np.random.rand(5, 3)
+
+        for data in (x, csr_matrix(x)):
+            blocks = [[data[:3, :2], data[:3, 2:4], data[:3, 4:]],
+                      [data[3:, :2], data[3:, 2:4], data[3:, 4:]]]
+
+            for stripe in (blocks, [blocks[0]]):
+                view = _VirtualHStack(stripe)
+                n_rows = 7 if len(stripe) == 2 else 3
+                expected = x[:n_rows]
+
+                self.assertEqual(view.shape, expected.shape)
+                self.assertEqual(len(view), n_rows)
+                self.assertEqual(view.sparse, issparse(data))
+                self.assertTrue(np.allclose(view.dot(w), expected @ w))
+                self.assertAlmostEqual(view.sum(), expected.sum())
+                self.assertTrue(np.allclose(view.sum(axis=0),
+                                            expected.sum(axis=0)))
+                self.assertTrue(np.allclose(view.sum(axis=1).ravel(),
+                                            expected.sum(axis=1)))
+                self.assertTrue(np.allclose(view.row_norms(),
+                                            np.linalg.norm(expected, axis=1)))
+
+                merged = view.merge()
+                merged = merged.toarray() if issparse(merged) else merged
+                self.assertTrue(np.allclose(merged, expected))
+
+                rows = view.take_rows([0, 2])
+                merged = rows.merge()
+                merged = merged.toarray() if issparse(merged) else merged
+                self.assertTrue(np.allclose(merged, expected[[0, 2]]))
+
+    def test_concatenate(self):
+        """ Tests joining ds-arrays """
+        x = np.random.rand(20, 13)
+        y = np.random.rand(7, 13)
+        a = ds.array(x, block_size=(5, 4))
+        b = ds.array(y, block_size=(5, 4))
+
+        # blocks that line up are reused
+        res = ds.vstack([a, b])
+        self.assertEqual(res._top_left_shape, (5, 4))
+        self.assertEqual(res._n_blocks, (6, 4))
+        self.assertIs(res._blocks[5][3], b._blocks[1][3])
+        self.assertTrue(np.array_equal(res.collect(), np.vstack([x, y])))
+
+        res = ds.vstack([a[3:], a])
+        self.assertEqual(res._top_left_shape, (2, 4))
+        self.assertIs(res._blocks[4][0], a._blocks[0][0])
+        self.assertTrue(np.array_equal(res.collect(), np.vstack([x[3:], x])))
+
+        right = a[:, 8:]
+        res = ds.hstack([a[:, :8], right])
+        self.assertIs(res._blocks[3][3], right._blocks[3][1])
+        self.assertTrue(np.array_equal(res.collect(), x))
+
+        # irregular seams and different blocks are re-blocked
+        res = ds.concatenate([b, a, ds.array(x, (3, 5))])
+        self.assertEqual(res._reg_shape, (5, 4))
+        self.assertIs(res._blocks[0][0], b._blocks[0][0])
+        self.assertTrue(np.array_equal(res.collect(), np.vstack([y, x, x])))
+
+        # a first block larger than the following ones is re-blocked
+        z = np.vstack([y, x])
+        res = ds.vstack([ds.array(y, (10, 4)), a])
+        self.assertLessEqual(res._top_left_shape[0], res._reg_shape[0])
+        self.assertTrue(np.array_equal(res.collect(), z))
+        self.assertTrue(np.array_equal(res[0:3].collect(), z[0:3]))
+        self.assertTrue(np.array_equal(res[5:18, 2:9].collect(), z[5:18, 2:9]))
+        self.assertTrue(np.array_equal(res[[0, 6, 7, 10]].collect(),
+                                       z[[0, 6, 7, 10]]))
+        self.assertEqual(res[1, 0].collect(), z[1, 0])
+
+        res = ds.hstack([b, ds.array(x[:7], (4, 3))])
+        self.assertEqual(res.shape, (7, 26))
+        self.assertTrue(np.array_equal(res.collect(), np.hstack([y, x[:7]])))
+
+        res = ds.vstack([a, b], block_size=(6, 6))
+        self.assertEqual(res._top_left_shape, (6, 6))
+        self.assertEqual(res._reg_shape, (6, 6))
+        self.assertTrue(np.array_equal(res.collect(), np.vstack([x, y])))
+
+        x = sp.random(9, 5, density=0.4, format="csr")
+        a = ds.array(x, block_size=(4, 2))
+        res = ds.concatenate([a, a, a], axis=1)
+        self.assertTrue(res._sparse)
+        self.assertTrue(equal(res.collect(), sp.hstack([x, x, x], "csr")))
+
+        self.assertRaises(ValueError, ds.concatenate, [])
+        self.assertRaises(ValueError, ds.vstack, [a, b])
+        self.assertRaises(ValueError, ds.hstack, [a, ds.array(x[1:], (4, 2))])
+        self.assertRaises(ValueError, ds.hstack,
+                          [a, ds.array(x.toarray(), (4, 2))])
+
+    def test_sort(self):
+        """ Tests sorting ds-arrays by a column """
+        x = np.random.randint(0, 20, (103, 7)).astype(float)
+        data = ds.array(x, block_size=(10, 3))
+
+        res = ds.sort(data, column=2)
+        self.assertEqual(res._n_blocks, data._n_blocks)
+        order = np.argsort(x[:, 2], kind="stable")
+        self.assertTrue(np.array_equal(res.collect(), x[order]))
+
+        res = ds.argsort(data, column=5)
+        self.assertEqual(res.shape, (103, 1))
+        self.assertTrue(np.array_equal(res.collect(),
+                                       np.argsort(x[:, 5], kind="stable")))
+
+        res = ds.sort(data, axis=1, column=4)
+        order = np.argsort(x[4], kind="stable")
+        self.assertTrue(np.array_equal(res.collect(), x[:, order]))
+
+        res = ds.sort(ds.array(x[:, :1], block_size=(7, 1)))
+        self.assertTrue(np.array_equal(res.collect(), np.sort(x[:, 0])))
+
+        # all keys equal
+        res = ds.argsort(ds.zeros((31, 2), (4, 2)), column=1)
+        self.assertTrue(np.array_equal(res.collect(), np.arange(31)))
+
+        # repeated keys
+        x_rep = np.zeros((80, 1))
+        x_rep[::10] = np.arange(8).reshape(-1, 1)
+        res = ds.argsort(ds.array(x_rep, block_size=(10, 1)))
+        self.assertTrue(np.array_equal(res.collect(),
+                                       np.argsort(x_rep[:, 0], kind="stable")))
+
+        x = sp.random(50, 6, density=0.5, format="csr")
+        res = ds.sort(ds.array(x, block_size=(7, 4)), column=1)
+        self.assertTrue(res._sparse)
+        order = np.argsort(x[:, 1].toarray().ravel(), kind="stable")
+        self.assertTrue(equal(res.collect(), x[order]))
+
+        self.assertRaises(ValueError, ds.sort, data)
+        self.assertRaises(ValueError, ds.sort, data, 0, 7)
+        self.assertRaises(ValueError, ds.sort, data, 2, 0)
+
+    def test_quantile(self):
+        """ Tests exact and approximate quantiles """
+        x = np.random.rand(1000, 5)
+        data = ds.array(x, block_size=(100, 2))
+        q = [0, 0.1, 0.5, 0.99, 1]
+
+        res = ds.quantile(data, q, method="exact")
+        self.assertEqual(res.shape, (5, 5))
+        self.assertTrue(np.allclose(res.collect(), np.quantile(x, q, axis=0)))
+
+        res = ds.quantile(data, q, axis=1, method="exact")
+        self.assertEqual(res.shape, (1000, 5))
+        self.assertTrue(np.allclose(res.collect(),
+                                    np.quantile(x, q, axis=1).T))
+
+        # sketches larger than the data are exact
+        res = ds.quantile(data, q, sketch_size=1000)
+        self.assertTrue(np.allclose(res.collect(), np.quantile(x, q, axis=0)))
+
+        res = ds.quantile(data, q, axis=1)
+        self.assertTrue(np.allclose(res.collect(),
+                                    np.quantile(x, q, axis=1).T))
+
+        res = ds.quantile(data, q, sketch_size=50, arity=3)
+        self.assertTrue(np.allclose(res.collect(), np.quantile(x, q, axis=0),
+                                    atol=0.05))
+
+        # repeated values
+        x = np.random.randint(0, 3, (301, 4)).astype(float)
+        res = ds.quantile(ds.array(x, block_size=(30, 3)), q, method="exact")
+        self.assertTrue(np.allclose(res.collect(), np.quantile(x, q, axis=0)))
+
+        x = sp.random(100, 5, density=0.5, format="csr")
+        res = ds.quantile(ds.array(x, block_size=(30, 2)), 0.7, method="exact")
+        self.assertTrue(np.allclose(res.collect(),
+                                    np.quantile(x.toarray(), 0.7, axis=0)))
+
+        res = ds.quantile(ds.array(x, block_size=(30, 2)), 0.7)
+        self.assertEqual(res.shape, (1, 5))
+        self.assertTrue(np.allclose(res.collect(),
+                                    np.quantile(x.toarray(), 0.7, axis=0)))
+
+        self.assertRaises(ValueError, ds.quantile, data, 1.5)
+        self.assertRaises(ValueError, ds.quantile, data, 0.5, 2)
+        self.assertRaises(ValueError, ds.quantile, data, 0.5, method="x")
+
+    def test_unique_bincount(self):
+        """ Tests counting the elements of ds-arrays """
+        y = np.random.randint(0, 7, (103, 1)).astype(float)
+        data = ds.array(y, block_size=(10, 1))
+
+        values, counts = ds.unique(data, return_counts=True, arity=3)
+        expected = np.unique(y, return_counts=True)
+        self.assertTrue(np.array_equal(values, expected[0]))
+        self.assertTrue(np.array_equal(counts, expected[1]))
+        self.assertTrue(np.array_equal(ds.unique(data), expected[0]))
+
+        counts = ds.bincount(data, minlength=10, arity=2)
+        expected = np.bincount(y.ravel().astype(int), minlength=10)
+        self.assertTrue(np.array_equal(counts, expected))
+
+        x = sp.random(30, 8, density=0.3, format="csr")
+        x.data = np.random.randint(1, 4, x.nnz).astype(float)
+        values, counts = ds.unique(ds.array(x, (7, 3)), return_counts=True)
+        expected = np.unique(x.toarray(), return_counts=True)
+        self.assertTrue(np.array_equal(values, expected[0]))
+        self.assertTrue(np.array_equal(counts, expected[1]))
+
+    def test_histogram(self):
+        """ Tests histograms of ds-arrays """
+        x = np.random.randn(200, 5)
+        data = ds.array(x, block_size=(30, 2))
+
+        hist, edges = ds.histogram(data, bins=7, arity=2)
+        self.assertEqual(hist.shape, (7, 5))
+        self.assertEqual(edges.shape, (8, 5))
+        hist, edges = hist.collect(), edges.collect()
+
+        for j in range(5):
+            expected = np.histogram(x[:, j], bins=7)
+            self.assertTrue(np.array_equal(hist[:, j], expected[0]))
+            self.assertTrue(np.allclose(edges[:, j], expected[1]))
+
+        hist, edges = ds.histogram(data, bins=4, axis=1)
+        self.assertEqual(hist.shape, (200, 4))
+        hist, edges = hist.collect(), edges.collect()
+
+        for i in range(200):
+            expected = np.histogram(x[i], bins=4)
+            self.assertTrue(np.array_equal(hist[i], expected[0]))
+            self.assertTrue(np.allclose(edges[i], expected[1]))
+
+        hist, _ = ds.histogram(data, bins=[-1, 0, 0.5, 3])
+        expected = np.histogram(x[:, 2], bins=[-1, 0, 0.5, 3])[0]
+        self.assertTrue(np.array_equal(hist.collect()[:, 2], expected))
+
+        hist, _ = ds.histogram(data, bins=3, range=(-1, 1), axis=1)
+        expected = np.histogram(x[5], bins=3, range=(-1, 1))[0]
+        self.assertTrue(np.array_equal(hist.collect()[5], expected))
+
+        hist, edges = ds.histogram(ds.ones((5, 3), (2, 2)), bins=2)
+        self.assertTrue(np.array_equal(hist.collect()[1], [5, 5, 5]))
+        self.assertTrue(np.allclose(edges.collect()[:, 0], [0.5, 1, 1.5]))
+
+        self.assertRaises(ValueError, ds.histogram, data, 0)
+        self.assertRaises(ValueError, ds.histogram, data, [1, 0])
+
+    def test_describe(self):
+        """ Tests computing several statistics in a single pass """
+        x = np.random.rand(103, 11) * 100 + 1e6
+        x[x < 1e6 + 20] = 0
+
+        for data in (ds.array(x, (10, 4)), ds.array(csr_matrix(x), (10, 4))):
+            for axis in (0, 1):
+                stats = ds.describe(data, axis=axis, arity=3)
+                expected = {"count": np.full(x.shape[1 - axis],
+                                             x.shape[axis]),
+                            "mean": x.mean(axis=axis),
+                            "var": x.var(axis=axis),
+                            "min": x.min(axis=axis),
+                            "max": x.max(axis=axis),
+                            "nnz": np.count_nonzero(x, axis=axis)}
+
+                for name, value in expected.items():
+                    self.assertTrue(np.allclose(stats[name].collect(), value))
+
+                self.assertEqual(stats["mean"]._n_blocks,
+                                 (1, 3) if axis == 0 else (11, 1))
+
+        self.assertRaises(ValueError, ds.describe, data, 2)
+
     def test_fancy_indexing_dense(self):
         """ Tests fancy indexing dense"""
         nparr = np.array([[1, 2, 3, 4],
@@ -500,6 +1372,14 @@ class ArrayTest(unittest.TestCase):
         arr = ds.array(np.random.rand(4, 5), (3, 3))
         self.assertEqual(arr[:, [0, 1, 3, 4]].collect().shape, (4, 4))
 
+        # non-square blocks, with rows carried over between merged blocks
+        x = np.random.rand(17, 23)
+        idx = [0, 3, 5, 6, 7, 12, 22]
+        arr = ds.array(x, (3, 4))
+        self.assertTrue(np.array_equal(arr[:, idx].collect(), x[:, idx]))
+        arr = ds.array(x.T, (4, 3))
+        self.assertTrue(np.array_equal(arr[idx].collect(), x.T[idx]))
+
     def test_fancy_indexing_sparse(self):
         """ Tests fancy indexing sparse"""
         csr = csr_matrix([[1, 2, 3, 4],
@@ -0,0 +1,146 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from dislib.benchmarks import make_dataset, run_benchmarks, compare, \
+    list_benchmarks, save_results, load_results
+from dislib.benchmarks.__main__ import main as benchmarks_main
+
+
+class BenchmarksTest(unittest.TestCase):
+    def test_make_dataset(self):
+        """ Tests generating synthetic datasets. """
+        x, y = make_dataset("dense", 100, n_blocks=3)
+        self.assertEqual(x.shape, (100, 100))
+        self.assertEqual(x._n_blocks, (3, 1))
+        self.assertIsNone(y)
+
+        x, y = make_dataset("sparse", 100)
+        self.assertTrue(x._sparse)
+        self.assertEqual(x.shape, (100, 1000))
+
+        x, y = make_dataset("clustered", "tiny")
+        self.assertEqual(x.shape, (1000, 10))
+        self.assertEqual(y.shape, (1000, 1))
+        self.assertEqual(len(set(y.collect().ravel())), 8)
+
+        x, _ = make_dataset("recommendation", 200)
+        ratings = x.collect()
+        self.assertEqual(ratings.shape, (200, 20))
+        self.assertTrue(set(ratings.data) <= {1, 2, 3, 4, 5})
+
+        self.assertRaises(ValueError, make_dataset, "invalid")
+        self.assertRaises(ValueError, make_dataset, "dense", "invalid")
+        self.assertRaises(ValueError, make_dataset, "dense", 0)
+
+    def test_run_benchmarks(self):
+        """ Tests running a subset of the benchmarks. """
+        results = run_benchmarks(["array.sum", "kmeans"], scale=200,
+                                 n_blocks=2)
+
+        self.assertEqual(results["n_samples"], 200)
+        self.assertEqual(results["n_blocks"], 2)
+        self.assertIn("executor", results)
+        self.assertEqual(list(results["results"]),
+                         ["array.sum", "kmeans.fit", "kmeans.predict"])
+
+        for result in results["results"].values():
+            self.assertGreater(result["time"], 0)
+            self.assertAlmostEqual(result["rows_per_s"] * result["time"], 200)
+            self.assertGreaterEqual(result["peak_memory"], 0)
+
+        results = run_benchmarks(["array.load"], scale=200, repeat=2,
+                                 memory=False)
+        self.assertIsNone(results["results"]["array.load"]["peak_memory"])
+
+        # loaders read the dataset from a temporary file
+        results = run_benchmarks(["io"], scale=200, n_blocks=3)
+        self.assertEqual(list(results["results"]),
+                         ["io.txt", "io.txt_parallel", "io.npy",
+                          "io.svmlight", "io.svmlight_parallel"])
+
+        for result in results["results"].values():
+            self.assertNotIn("error", result)
+
+        self.assertTrue("als.fit" in list_benchmarks())
+        self.assertRaises(ValueError, run_benchmarks, ["invalid"])
+
+    def test_compare(self):
+        """ Tests comparing results with a baseline. """
+        baseline = {"results": {"a": {"time": 1.0, "peak_memory": 100},
+                                "b": {"time": 1.0, "peak_memory": None},
+                                "c": {"error": "ValueError"}}}
+        results = {"results": {"a": {"time": 1.05, "peak_memory": 200},
+                               "b": {"time": 2.0, "peak_memory": 50},
+                               "c": {"time": 1.0, "peak_memory": 10},
+                               "d": {"time": 1.0, "peak_memory": 10}}}
+
+        regressions = compare(results, baseline, threshold=0.1)
+        self.assertEqual([(r["name"], r["metric"]) for r in regressions],
+                         [("a", "peak_memory"), ("b", "time")])
+        self.assertEqual(regressions[1]["ratio"], 2.0)
+        self.assertEqual(compare(results, baseline, threshold=1.5), [])
+
+        # benchmarks that fail or are missing now
+        results["results"]["a"] = {"error": "ValueError: a"}
+        del results["results"]["b"]
+        regressions = compare(results, baseline, threshold=1.5)
+        self.assertEqual([(r["name"], r["value"]) for r in regressions],
+                         [("a", "ValueError: a"), ("b", None)])
+        self.assertTrue(all(r["metric"] == "error" for r in regressions))
+
+        # results must be run in the same conditions as the baseline
+        for key in ["n_samples", "n_blocks", "executor"]:
+            self.assertRaises(ValueError, compare, dict(results, **{key: 1}),
+                              baseline)
+
+    def test_main(self):
+        """ Tests the command line interface. """
+        path = tempfile.mkdtemp()
+
+        try:
+            output = os.path.join(path, "results.json")
+            self.assertEqual(benchmarks_main(["array.sum", "-s", "200", "-o",
+                                              output]), 0)
+
+            results = load_results(output)
+            self.assertEqual(list(results["results"]), ["array.sum"])
+
+            # a baseline 100 times faster makes the comparison fail
+            results["results"]["array.sum"]["time"] /= 100
+            baseline = os.path.join(path, "baseline.json")
+            save_results(results, baseline)
+
+            self.assertEqual(benchmarks_main(["array.sum", "-s", "200",
+                                              "--baseline", baseline]), 1)
+
+            with open(baseline) as f:
+                self.assertIn("array.sum", json.load(f)["results"])
+
+            # a benchmark of the baseline that is missing now makes the
+            # comparison fail, unless it is not selected
+            results["results"]["array.sum"]["time"] *= 1000
+            results["results"]["array.removed"] = {"time": 1.0,
+                                                   "peak_memory": None}
+            save_results(results, baseline)
+            self.assertEqual(benchmarks_main(["array.sum", "-s", "200",
+                                              "--baseline", baseline]), 0)
+            self.assertEqual(benchmarks_main(["array.sum", "array.removed",
+                                              "-s", "200", "--baseline",
+                                              baseline]), 1)
+
+            # a baseline of a different scale cannot be compared
+            self.assertEqual(benchmarks_main(["array.sum", "-s", "300",
+                                              "--baseline", baseline]), 1)
+        finally:
+            shutil.rmtree(path)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,12 @@
+import shutil
+import tempfile
 import unittest
 
 import numpy as np
-from pycompss.api.api import compss_wait_on
 
 import dislib as ds
 from dislib.classification import CascadeSVM
+from dislib.runtime import compss_wait_on
 
 
 class CSVMTest(unittest.TestCase):
@@ -244,6 +246,52 @@ class CSVMTest(unittest.TestCase):
         csvm._collect_clf()
         self.assertEqual(csvm._clf.support_vectors_.shape[0], 6)
 
+    def test_convergence_lag(self):
+        """ Tests that checking convergence with a lag gives the same
+        results. """
+        x = ds.array(np.array([[0, 1], [1, 1], [0, 1], [1, 2], [0, 0],
+                               [2, 2], [2, 1], [1, 0]]), (2, 2))
+        y = ds.array(np.array([1, 0, 1, 0, 1, 0, 0, 1]).reshape(-1, 1), (2, 1))
+
+        csvm = CascadeSVM(kernel="linear", random_state=1, max_iter=20)
+        csvm.fit(x, y)
+        self.assertTrue(csvm.converged)
+
+        csvm_lag = CascadeSVM(kernel="linear", random_state=1, max_iter=20,
+                              convergence_lag=2)
+        csvm_lag.fit(x, y)
+
+        self.assertTrue(csvm_lag.converged)
+        self.assertEqual(csvm_lag.iterations, csvm.iterations)
+        self.assertTrue(np.array_equal(csvm_lag._clf.dual_coef_,
+                                       csvm._clf.dual_coef_))
+
+    def test_checkpoint(self):
+        """ Tests resuming a fit from a checkpoint. """
+        x = ds.array(np.array([[0, 1], [1, 1], [0, 1], [1, 2], [0, 0],
+                               [2, 2], [2, 1], [1, 0]]), (2, 2))
+        y = ds.array(np.array([1, 0, 1, 0, 1, 0, 0, 1]).reshape(-1, 1), (2, 1))
+        path = tempfile.mkdtemp()
+
+        try:
+            csvm = CascadeSVM(kernel="linear", random_state=1, max_iter=20)
+            csvm.fit(x, y)
+
+            csvm_part = CascadeSVM(kernel="linear", random_state=1,
+                                   max_iter=1)
+            csvm_part.fit(x, y, checkpoint_dir=path)
+
+            csvm_res = CascadeSVM(kernel="linear", random_state=1,
+                                  max_iter=20)
+            csvm_res.fit(x, y, checkpoint_dir=path, resume=True)
+
+            self.assertTrue(csvm_res.converged)
+            self.assertEqual(csvm_res.iterations, csvm.iterations)
+            self.assertTrue(np.array_equal(csvm_res._clf.dual_coef_,
+                                           csvm._clf.dual_coef_))
+        finally:
+            shutil.rmtree(path)
+
 
 def main():
     unittest.main()
@@ -1,7 +1,6 @@
 import unittest
 
 import numpy as np
-from pycompss.api.api import compss_wait_on
 from scipy.sparse import csr_matrix, issparse
 from sklearn.datasets import make_blobs
 from sklearn.datasets import make_circles
@@ -11,6 +10,7 @@ from sklearn.preprocessing import StandardScaler
 import dislib as ds
 from dislib.cluster import DBSCAN
 from dislib.cluster.dbscan.base import _arrange_samples, _rearrange_labels
+from dislib.runtime import compss_wait_on
 
 
 class ArrangeTest(unittest.TestCase):
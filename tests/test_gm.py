@@ -1,16 +1,18 @@
 import io
+import shutil
 import sys
+import tempfile
 import unittest
 import warnings
 
 import numpy as np
 from numpy.random.mtrand import RandomState
-from pycompss.api.api import compss_wait_on
 from sklearn.datasets import make_blobs, load_iris
 from sklearn.exceptions import ConvergenceWarning
 
 import dislib as ds
 from dislib.cluster import GaussianMixture
+from dislib.runtime import compss_wait_on
 
 
 class GaussianMixtureTest(unittest.TestCase):
@@ -472,6 +474,91 @@ class GaussianMixtureTest(unittest.TestCase):
         gm.fit(x_ds)
         self.assertTrue(gm.converged_)
 
+    def test_convergence_lag(self):
+        """ Tests that checking convergence with a lag gives the same
+        results. """
+        x, _ = load_iris(return_X_y=True)
+        x_ds = ds.array(x, (50, 4))
+
+        gm = GaussianMixture(n_components=3, random_state=0)
+        gm.fit(x_ds)
+        self.assertTrue(gm.converged_)
+
+        gm_lag = GaussianMixture(n_components=3, random_state=0,
+                                 convergence_lag=2)
+        gm_lag.fit(x_ds)
+
+        self.assertTrue(gm_lag.converged_)
+        self.assertEqual(gm_lag.n_iter, gm.n_iter)
+        self.assertEqual(gm_lag.lower_bound_, gm.lower_bound_)
+        self.assertTrue(np.array_equal(compss_wait_on(gm_lag.means_),
+                                       compss_wait_on(gm.means_)))
+
+    def test_checkpoint(self):
+        """ Tests resuming a fit from a checkpoint. """
+        x, _ = load_iris(return_X_y=True)
+        x_ds = ds.array(x, (50, 4))
+        path = tempfile.mkdtemp()
+
+        try:
+            gm = GaussianMixture(n_components=3, random_state=0)
+            gm.fit(x_ds)
+
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", ConvergenceWarning)
+                gm_part = GaussianMixture(n_components=3, random_state=0,
+                                          max_iter=1)
+                gm_part.fit(x_ds, checkpoint_dir=path)
+
+            gm_res = GaussianMixture(n_components=3)
+            gm_res.fit(x_ds, checkpoint_dir=path, resume=True)
+
+            self.assertTrue(gm_res.converged_)
+            self.assertEqual(gm_res.n_iter, gm.n_iter)
+            self.assertEqual(gm_res.lower_bound_, gm.lower_bound_)
+            self.assertTrue(np.array_equal(compss_wait_on(gm_res.means_),
+                                           compss_wait_on(gm.means_)))
+        finally:
+            shutil.rmtree(path)
+
+    def test_checkpoint_precisions_init(self):
+        """ Tests checkpoints of a fit with precisions_init. """
+        x, _ = load_iris(return_X_y=True)
+        x_ds = ds.array(x, (50, 4))
+        np.random.seed(0)
+        rand_matrices = [np.random.rand(4, 4) for _ in range(3)]
+        precisions_init = {
+            'full': [np.matmul(r, r.T) for r in rand_matrices],
+            'tied': np.matmul(rand_matrices[0], rand_matrices[0].T),
+            'diag': np.random.rand(3, 4) + 0.5,
+            'spherical': np.random.rand(3) + 0.5}
+
+        for cov_type, prec_init in precisions_init.items():
+            path = tempfile.mkdtemp()
+
+            try:
+                params = dict(n_components=3, covariance_type=cov_type,
+                              precisions_init=prec_init, random_state=0)
+                gm = GaussianMixture(**params)
+                gm.fit(x_ds)
+
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", ConvergenceWarning)
+                    gm_part = GaussianMixture(max_iter=1, **params)
+                    gm_part.fit(x_ds, checkpoint_dir=path)
+
+                gm_res = GaussianMixture(**params)
+                gm_res.fit(x_ds, checkpoint_dir=path, resume=True)
+
+                self.assertEqual(gm_res.n_iter, gm.n_iter)
+                self.assertTrue(np.allclose(compss_wait_on(gm_res.means_),
+                                            compss_wait_on(gm.means_)))
+                self.assertTrue(np.allclose(
+                    compss_wait_on(gm_res.covariances_),
+                    compss_wait_on(gm.covariances_)))
+            finally:
+                shutil.rmtree(path)
+
 
 def main():
     unittest.main()
@@ -6,7 +6,6 @@ import numpy as np
 
 os.environ["CONTACT_NAMES"] = "cassandra_container"
 from hecuba import config
-from pycompss.api.api import compss_wait_on
 from sklearn.datasets import make_blobs
 
 import dislib as ds
@@ -14,6 +13,7 @@ from dislib.cluster import KMeans
 from dislib.decomposition import PCA
 from dislib.neighbors import NearestNeighbors
 from dislib.regression import LinearRegression
+from dislib.runtime import compss_wait_on
 
 
 def equal(arr1, arr2):
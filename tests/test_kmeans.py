@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import unittest
 
 import numpy as np
@@ -127,6 +130,69 @@ class KMeansTest(unittest.TestCase):
         self.assertTrue(np.array_equal(km.init.toarray(), init.toarray()))
         self.assertFalse(np.array_equal(km.centers.toarray(), init.toarray()))
 
+    def test_convergence_lag(self):
+        """ Tests that checking convergence with a lag gives the same
+        results. """
+        x, _ = make_blobs(n_samples=600, random_state=170)
+        x_train = ds.array(x, block_size=(100, 2))
+
+        km = KMeans(n_clusters=3, max_iter=50, random_state=170)
+        km.fit(x_train)
+        self.assertLess(km.n_iter, 50)
+
+        for lag in [1, 3, 100]:
+            km_lag = KMeans(n_clusters=3, max_iter=50, random_state=170,
+                            convergence_lag=lag)
+            km_lag.fit(x_train)
+
+            self.assertEqual(km_lag.n_iter, km.n_iter)
+            self.assertTrue(np.array_equal(km_lag.centers, km.centers))
+
+        # all the iterations are checked if the model does not converge
+        km = KMeans(n_clusters=3, max_iter=2, random_state=170,
+                    convergence_lag=5)
+        km.fit(x_train)
+        self.assertEqual(km.n_iter, 2)
+
+    def test_checkpoint(self):
+        """ Tests resuming a fit from a checkpoint. """
+        x, _ = make_blobs(n_samples=600, random_state=170)
+        x_train = ds.array(x, block_size=(100, 2))
+        path = tempfile.mkdtemp()
+
+        try:
+            km = KMeans(n_clusters=3, max_iter=50, random_state=170)
+            km.fit(x_train)
+
+            # a fit interrupted after 2 iterations
+            km_part = KMeans(n_clusters=3, max_iter=2, random_state=170)
+            km_part.fit(x_train, checkpoint_dir=path)
+            self.assertEqual(sorted(os.listdir(path)),
+                             ["final.pkl", "iteration_1.pkl",
+                              "iteration_2.pkl"])
+
+            for lag in [0, 2]:
+                km_res = KMeans(n_clusters=3, max_iter=50, random_state=0,
+                                convergence_lag=lag)
+                km_res.fit(x_train, checkpoint_dir=path, checkpoint_every=3,
+                           resume=True)
+
+                self.assertEqual(km_res.n_iter, km.n_iter)
+                self.assertTrue(np.array_equal(km_res.centers, km.centers))
+
+            # a converged fit is not resumed
+            km_res = KMeans(n_clusters=3, max_iter=50)
+            km_res.fit(x_train, checkpoint_dir=path, resume=True)
+            self.assertEqual(km_res.n_iter, km.n_iter)
+            self.assertTrue(np.array_equal(km_res.centers, km.centers))
+
+            # checkpoints are removed if the fit is not resumed
+            km_part.fit(x_train, checkpoint_dir=path, checkpoint_every=2)
+            self.assertEqual(sorted(os.listdir(path)),
+                             ["final.pkl", "iteration_2.pkl"])
+        finally:
+            shutil.rmtree(path)
+
 
 def main():
     unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+import dislib as ds
+from dislib.linalg import qr, svd
+
+
+class QRTest(unittest.TestCase):
+    def test_qr(self):
+        """ Tests TSQR with different blocks and arities """
+        x = np.random.rand(203, 17)
+
+        for block_size, arity in (((20, 5), 2), ((20, 5), 3), ((203, 17), 2),
+                                  ((4, 5), 50)):
+            q, r = qr(ds.array(x, block_size=block_size), arity=arity)
+            q, r = q.collect(), r.collect()
+
+            self.assertEqual(q.shape, (203, 17))
+            self.assertEqual(r.shape, (17, 17))
+            self.assertTrue(np.allclose(q @ r, x))
+            self.assertTrue(np.allclose(q.T @ q, np.eye(17)))
+            self.assertTrue(np.allclose(np.triu(r), r))
+
+    def test_qr_blocks(self):
+        """ Tests the blocks of the QR factors """
+        x_ds = ds.array(np.random.rand(30, 17), block_size=(7, 5))
+        q, r = qr(x_ds)
+
+        self.assertEqual(q._n_blocks, (5, 4))
+        self.assertEqual(q._reg_shape, (7, 5))
+        self.assertEqual(r._n_blocks, (1, 4))
+        self.assertEqual(r._reg_shape, (17, 5))
+
+    def test_qr_sparse(self):
+        """ Tests TSQR with sparse data """
+        x = np.random.rand(40, 6)
+        x[x < 0.5] = 0
+        q, r = qr(ds.array(csr_matrix(x), block_size=(10, 4)))
+        self.assertTrue(np.allclose(q.collect() @ r.collect(), x))
+
+
+class SVDTest(unittest.TestCase):
+    def test_svd(self):
+        """ Tests the thin SVD """
+        x = np.random.rand(203, 17)
+        x_ds = ds.array(x, block_size=(20, 5))
+
+        u, s, vt = svd(x_ds, arity=3)
+        u, s, vt = u.collect(), s.collect(), vt.collect()
+
+        self.assertTrue(np.allclose((u * s) @ vt, x))
+        self.assertTrue(np.allclose(s, np.linalg.svd(x, compute_uv=False)))
+        self.assertTrue(np.allclose(u.T @ u, np.eye(17)))
+
+        u, s, vt = svd(x_ds, k=3)
+        self.assertEqual(u.shape, (203, 3))
+        self.assertEqual(s.shape, (1, 3))
+        self.assertEqual(vt.shape, (3, 17))
+
+        _, s_np, vt_np = np.linalg.svd(x, full_matrices=False)
+        self.assertTrue(np.allclose(s.collect(), s_np[:3]))
+        self.assertTrue(np.allclose(np.abs(vt.collect()), np.abs(vt_np[:3])))
+
+        self.assertRaises(ValueError, svd, x_ds, k=0)
+        self.assertRaises(ValueError, svd, x_ds, k=18)
+        self.assertRaises(ValueError, svd, x_ds, arity=1)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
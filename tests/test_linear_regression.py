@@ -2,11 +2,11 @@ import unittest
 
 import numpy as np
 from scipy.sparse import random as sp_random
-from pycompss.api.api import compss_wait_on
 
 import dislib as ds
 from dislib.regression import LinearRegression
 from dislib.data import random_array
+from dislib.runtime import compss_wait_on
 
 
 class LinearRegressionTest(unittest.TestCase):
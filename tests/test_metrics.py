@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.metrics import pairwise
+
+import dislib as ds
+from dislib.metrics import pairwise_distances, pairwise_kernels
+
+
+class PairwiseTest(unittest.TestCase):
+    def test_pairwise_distances(self):
+        """ Tests pairwise distances against scikit-learn """
+        x = np.random.rand(53, 11)
+        y = np.random.rand(17, 11)
+        x_ds = ds.array(x, block_size=(10, 4))
+        y_ds = ds.array(y, block_size=(5, 4))
+
+        for metric in ("euclidean", "sqeuclidean", "cosine", "manhattan"):
+            dist = pairwise_distances(x_ds, y_ds, metric=metric)
+            expected = pairwise.pairwise_distances(x, y, metric=metric)
+
+            self.assertEqual(dist.shape, (53, 17))
+            self.assertEqual(dist._reg_shape, (10, 5))
+            self.assertTrue(np.allclose(dist.collect(), expected))
+
+        dist = pairwise_distances(x_ds).collect()
+        self.assertTrue(np.allclose(dist, pairwise.euclidean_distances(x)))
+        self.assertTrue(np.all(np.diag(dist) == 0))
+
+    def test_pairwise_kernels(self):
+        """ Tests pairwise kernels against scikit-learn """
+        x = np.random.rand(53, 11)
+        y = np.random.rand(17, 11)
+        x_ds = ds.array(x, block_size=(10, 4))
+        y_ds = ds.array(y, block_size=(5, 4))
+
+        for kernel in ("linear", "rbf", "polynomial", "sigmoid", "cosine"):
+            params = {} if kernel in ("linear", "cosine") else {"gamma": 0.5}
+            kernel_matrix = pairwise_kernels(x_ds, y_ds, kernel=kernel,
+                                             **params)
+            expected = pairwise.pairwise_kernels(x, y, metric=kernel,
+                                                 **params)
+            self.assertTrue(np.allclose(kernel_matrix.collect(), expected))
+
+        kernel_matrix = pairwise_kernels(x_ds, kernel="rbf").collect()
+        expected = pairwise.rbf_kernel(x, gamma=1 / 11)
+        self.assertTrue(np.allclose(kernel_matrix, expected))
+
+    def test_sparse_float32(self):
+        """ Tests pairwise distances with sparse and float32 data """
+        x = np.random.rand(31, 7)
+        x_sp = ds.array(csr_matrix(x), block_size=(10, 3))
+        x_ds = ds.array(x, block_size=(10, 3))
+
+        dist = pairwise_distances(x_sp, x_ds).collect()
+        self.assertTrue(np.allclose(dist, pairwise.euclidean_distances(x),
+                                    atol=1e-6))
+
+        dist = pairwise_distances(x_sp, metric="manhattan").collect()
+        self.assertTrue(np.allclose(dist, pairwise.manhattan_distances(x)))
+
+        x_32 = ds.array(x.astype(np.float32), block_size=(10, 3))
+        dist = pairwise_distances(x_32).collect()
+        self.assertEqual(dist.dtype, np.float32)
+        self.assertTrue(np.allclose(dist, pairwise.euclidean_distances(x),
+                                    atol=1e-5))
+
+    def test_errors(self):
+        """ Tests invalid arguments """
+        x_ds = ds.array(np.random.rand(10, 4), block_size=(5, 2))
+
+        self.assertRaises(ValueError, pairwise_distances, x_ds, metric="a")
+        self.assertRaises(ValueError, pairwise_kernels, x_ds, kernel="a")
+        self.assertRaises(ValueError, pairwise_distances, x_ds,
+                          ds.array(np.random.rand(10, 3), (5, 2)))
+        self.assertRaises(ValueError, pairwise_distances, x_ds,
+                          ds.array(np.random.rand(10, 4), (5, 3)))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,13 @@
 import unittest
 
 import numpy as np
-from pycompss.api.api import compss_wait_on
 from scipy.sparse import csr_matrix, issparse
 from sklearn.datasets import make_blobs
 from sklearn.preprocessing import StandardScaler as SKScaler
 
 import dislib as ds
 from dislib.preprocessing import StandardScaler
+from dislib.runtime import compss_wait_on
 
 
 class StandardScalerTest(unittest.TestCase):
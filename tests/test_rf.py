@@ -1,12 +1,12 @@
 import unittest
 
 import numpy as np
-from pycompss.api.api import compss_wait_on
 from sklearn import datasets
 from sklearn.datasets import make_classification
 
 import dislib as ds
 from dislib.classification import RandomForestClassifier
+from dislib.runtime import compss_wait_on
 
 
 class RFTest(unittest.TestCase):
@@ -0,0 +1,342 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+from pycompss.api.parameter import COLLECTION_IN, COLLECTION_INOUT, Depth, \
+    FILE_IN, FILE_INOUT, Type
+
+import dislib as ds
+from dislib.cluster import KMeans
+from dislib.runtime import task, compss_wait_on, compss_barrier, \
+    set_executor, get_executor, Future, phase, ConvergenceController, \
+    Checkpointer
+
+
+@task(returns=1)
+def _add(a, b):
+    time.sleep(0.01)
+    return a + b
+
+
+@task(returns=2)
+def _div_mod(a, b):
+    return a // b, a % b
+
+
+@task(values={Type: COLLECTION_IN, Depth: 2}, returns=1)
+def _sum_nested(values):
+    return sum(sum(row) for row in values)
+
+
+@task(out={Type: COLLECTION_INOUT, Depth: 2})
+def _fill(value, out):
+    for i, row in enumerate(out):
+        for j in range(len(row)):
+            out[i][j] = value * (i + j)
+
+
+@task(path=FILE_INOUT)
+def _append(path, text):
+    time.sleep(0.01)
+
+    with open(path, "a") as f:
+        f.write(text)
+
+
+@task(path=FILE_IN, returns=1)
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+
+@task(returns=1)
+def _fail(a):
+    raise ValueError("task failed")
+
+
+class RuntimeTest(unittest.TestCase):
+    def tearDown(self):
+        set_executor(None)
+
+    def test_set_executor(self):
+        """ Tests selecting the executor. """
+        self.assertIsNone(get_executor())
+        self.assertEqual(_add(1, 2), 3)
+
+        set_executor("threads", max_workers=2)
+        self.assertIsNotNone(get_executor())
+        self.assertIsInstance(_add(1, 2), Future)
+
+        set_executor(None)
+        self.assertIsNone(get_executor())
+        self.assertRaises(ValueError, set_executor, "invalid")
+
+    def test_dependencies(self):
+        """ Tests dependencies between tasks in local executors. """
+        for executor in ["threads", "processes"]:
+            set_executor(executor, max_workers=4)
+
+            # chain and tree of dependencies
+            res = 0
+            for i in range(10):
+                res = _add(res, i)
+
+            partials = [_add(i, i) for i in range(8)]
+            while len(partials) > 1:
+                partials = [_add(partials[i], partials[i + 1])
+                            for i in range(0, len(partials), 2)]
+
+            quot, rem = _div_mod(res, 7)
+            total = _sum_nested([[res, quot], [rem, partials[0]]])
+
+            self.assertEqual(compss_wait_on(res), 45)
+            self.assertEqual(compss_wait_on([quot, rem]), [6, 3])
+            self.assertEqual(compss_wait_on(quot, [rem]), [6, [3]])
+            self.assertEqual(compss_wait_on(total), 45 + 6 + 3 + 56)
+
+            # collections are updated with the values set by the task
+            out = [[object() for _ in range(3)] for _ in range(2)]
+            _fill(_add(1, 1), out)
+            self.assertIsInstance(out[1][2], Future)
+            self.assertEqual(compss_wait_on(_sum_nested(out)), 18)
+            self.assertEqual(compss_wait_on(out), [[0, 2, 4], [2, 4, 6]])
+
+            self.assertRaises(ValueError, compss_wait_on, _fail(_add(1, 1)))
+            self.assertRaises(ValueError, compss_wait_on,
+                              _add(_fail(1), 1))
+
+    def test_files(self):
+        """ Tests dependencies between tasks accessing the same file. """
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+
+        try:
+            set_executor("threads", max_workers=4)
+            contents = []
+
+            for i in range(5):
+                _append(path, str(i))
+                contents.append(_read(path))
+
+            compss_barrier()
+
+            self.assertEqual(compss_wait_on(contents),
+                             ["0", "01", "012", "0123", "01234"])
+        finally:
+            os.remove(path)
+
+    def test_arrays(self):
+        """ Tests ds-array operations in local executors. """
+        x = np.random.rand(53, 21)
+
+        for executor in ["threads", "processes"]:
+            set_executor(executor, max_workers=4)
+
+            data = ds.array(x, block_size=(10, 4))
+            res = ds.matmul(data.transpose(), data) + data.sum(axis=0)
+
+            self.assertTrue(np.allclose(res.collect(),
+                                        x.T @ x + x.sum(axis=0)))
+            self.assertTrue(np.allclose(ds.sort(data, column=3).collect(),
+                                        x[np.argsort(x[:, 3])]))
+            self.assertTrue(np.allclose(data[5:40, 2:19].collect(),
+                                        x[5:40, 2:19]))
+            self.assertTrue(np.allclose(ds.describe(data)["var"].collect(),
+                                        x.var(axis=0)))
+
+
+class ProfileTest(unittest.TestCase):
+    def tearDown(self):
+        set_executor(None)
+
+    def test_profile(self):
+        """ Tests recording tasks and phases. """
+        x = np.random.RandomState(0).rand(50, 4)
+
+        for executor in [None, "threads", "processes"]:
+            set_executor(executor, max_workers=2)
+            data = ds.array(x, block_size=(10, 4))
+
+            with ds.profile() as prof:
+                km = KMeans(n_clusters=3, max_iter=2, random_state=0)
+                km.fit(data)
+
+                with phase(km, "sum"):
+                    res = data.sum(axis=0).collect()
+
+            compss_barrier()
+            self.assertTrue(np.allclose(res, x.sum(axis=0)))
+
+            summary = prof.summary()
+            partial_sum = summary["tasks"]["_partial_sum"]
+            self.assertEqual(partial_sum["count"], 10)
+            self.assertGreater(partial_sum["merge_time"], 0)
+            self.assertGreaterEqual(partial_sum["input_bytes"], x.nbytes * 2)
+            self.assertGreater(partial_sum["output_bytes"], 0)
+
+            phases = summary["phases"]["KMeans"]
+            self.assertEqual(phases["partial sums"]["count"], 2)
+            self.assertEqual(phases["partial sums"]["tasks"], 10)
+            self.assertEqual(phases["convergence sync"]["count"], 2)
+            self.assertGreater(phases["sum"]["tasks"], 0)
+            self.assertEqual(len(prof.phases), 6)
+
+            for record in prof.tasks:
+                self.assertLessEqual(prof.start, record["start"])
+                self.assertLessEqual(record["start"], record["end"])
+
+            # tasks run outside the profile are not recorded
+            n_tasks = len(prof.tasks)
+            data.sum(axis=0).collect()
+            self.assertEqual(len(prof.tasks), n_tasks)
+
+    def test_profile_compss(self):
+        """ Tests that tasks run by the COMPSs runtime are not recorded. """
+        data = ds.array(np.random.rand(50, 4), block_size=(10, 4))
+
+        with mock.patch("dislib.runtime.base._in_pycompss",
+                        return_value=True):
+            with ds.profile() as prof:
+                with phase(data, "sum"):
+                    data.sum(axis=0).collect()
+
+        self.assertEqual(prof.tasks, [])
+        self.assertEqual(len(prof.phases), 1)
+
+    def test_export(self):
+        """ Tests exporting a profile. """
+        path = tempfile.mkdtemp()
+
+        try:
+            set_executor("threads", max_workers=2)
+
+            with ds.profile() as prof:
+                ds.random_array((20, 20), (5, 5)).sum(axis=1).collect()
+
+            prof.export_chrome_trace(os.path.join(path, "trace.json"))
+            prof.save_summary(os.path.join(path, "summary.json"))
+
+            with open(os.path.join(path, "trace.json")) as f:
+                events = json.load(f)["traceEvents"]
+
+            tasks = [e for e in events if e.get("cat") == "task"]
+            self.assertEqual(len(tasks), len(prof.tasks))
+            self.assertTrue(all(e["dur"] >= 0 for e in tasks))
+            self.assertTrue(any(e["ph"] == "M" and e["name"] == "thread_name"
+                                for e in events))
+
+            with open(os.path.join(path, "summary.json")) as f:
+                self.assertEqual(json.load(f)["tasks"].keys(),
+                                 prof.summary()["tasks"].keys())
+        finally:
+            shutil.rmtree(path)
+
+
+class ConvergenceControllerTest(unittest.TestCase):
+    def tearDown(self):
+        set_executor(None)
+
+    def test_lag(self):
+        """ Tests checking the convergence criterion with a lag. """
+        criteria = [5, 4, 3, 0.5, 0.2, 0.1, 2]
+
+        for executor in [None, "threads"]:
+            set_executor(executor, max_workers=2)
+
+            for lag in [0, 1, 3, 10]:
+                checked = []
+
+                def check(value, iteration):
+                    checked.append((iteration, value))
+                    return value < 1
+
+                controller = ConvergenceController(lag, check)
+                submitted = 0
+
+                for value in criteria:
+                    submitted += 1
+
+                    if controller.add(_add(value, 0), value * 10):
+                        break
+
+                self.assertEqual(controller.finish(), 5)
+                self.assertTrue(controller.converged)
+                self.assertEqual(controller.iteration, 4)
+                self.assertEqual(checked, [(1, 5), (2, 4), (3, 3), (4, 0.5)])
+                self.assertEqual(submitted, min(4 + lag, len(criteria)))
+
+    def test_not_converged(self):
+        """ Tests that all the iterations are checked if the criterion is
+        not met. """
+        controller = ConvergenceController(2, lambda value, i: False)
+
+        for value in range(5):
+            self.assertFalse(controller.add(value, value))
+
+        self.assertEqual(controller.iteration, 3)
+        self.assertEqual(controller.finish(), 4)
+        self.assertEqual(controller.iteration, 5)
+        self.assertFalse(controller.converged)
+
+        self.assertRaises(ValueError, ConvergenceController, -1)
+
+
+class CheckpointerTest(unittest.TestCase):
+    def tearDown(self):
+        set_executor(None)
+
+    def test_checkpoints(self):
+        """ Tests saving and loading checkpoints. """
+        path = tempfile.mkdtemp()
+
+        try:
+            set_executor("threads", max_workers=2)
+
+            self.assertIsNone(Checkpointer().load())
+            self.assertIsNone(Checkpointer(path, resume=True).load())
+            self.assertRaises(ValueError, Checkpointer, path, 0)
+
+            checkpointer = Checkpointer(path, every=2)
+
+            for i in range(1, 6):
+                checkpointer.save(i, value=_add(i, 0), array=np.ones(i))
+
+            compss_barrier()
+            self.assertEqual(sorted(os.listdir(path)),
+                             ["iteration_2.pkl", "iteration_4.pkl"])
+
+            checkpoint = Checkpointer(path, resume=True).load()
+            self.assertEqual(checkpoint["iteration"], 4)
+            self.assertEqual(checkpoint["value"], 4)
+            self.assertFalse(checkpoint["converged"])
+            self.assertTrue(np.array_equal(checkpoint["array"], np.ones(4)))
+
+            checkpointer.save_final(5, True, value=_add(5, 0))
+            checkpointer = Checkpointer(path, resume=True)
+            checkpoint = checkpointer.load()
+            self.assertEqual(checkpoint["iteration"], 5)
+            self.assertTrue(checkpoint["converged"])
+
+            # new iterations outdate the final checkpoint
+            checkpointer.save(6, value=6)
+            compss_barrier()
+            self.assertEqual(Checkpointer(path, resume=True).load()["value"],
+                             6)
+
+            Checkpointer(path)
+            self.assertEqual(os.listdir(path), [])
+        finally:
+            shutil.rmtree(path)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()